@@ -4,31 +4,134 @@ NBA Matchup Analysis Script - Optimized Version
 Analyzes NBA games for today and upcoming week with enhanced readability
 """
 
-from nba_api.stats.endpoints import leaguegamefinder, scoreboardv2, leaguestandingsv3
-from nba_api.stats.static import teams
-import pandas as pd
-from datetime import datetime, timedelta
-import numpy as np
 import time
+_IMPORT_START = time.perf_counter()
+
+import functools
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
-# Configure NBA API to work with GitHub Actions and cloud IPs
-# The NBA API blocks requests without proper headers
-from nba_api.stats.library.http import NBAStatsHTTP
-NBAStatsHTTP.timeout = 60  # Increase timeout for GitHub Actions
-# Set headers to mimic browser requests
-import requests
-requests.Session.headers = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-    'Accept': 'application/json, text/plain, */*',
-    'Accept-Language': 'en-US,en;q=0.9',
-    'Accept-Encoding': 'gzip, deflate, br',
-    'Origin': 'https://www.nba.com',
-    'Referer': 'https://www.nba.com/',
-    'Connection': 'keep-alive',
+# pandas, numpy and nba_api (which loads all of its endpoints and pandas
+# together) are imported on first use, so --help and --dry-run start instantly
+from lazy_imports import lazy_import
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+leaguegamefinder = lazy_import('nba_api.stats.endpoints.leaguegamefinder')
+playergamelogs = lazy_import('nba_api.stats.endpoints.playergamelogs')
+commonallplayers = lazy_import('nba_api.stats.endpoints.commonallplayers')
+scoreboardv2 = lazy_import('nba_api.stats.endpoints.scoreboardv2')
+leaguestandingsv3 = lazy_import('nba_api.stats.endpoints.leaguestandingsv3')
+scheduleleaguev2 = lazy_import('nba_api.stats.endpoints.scheduleleaguev2')
+teams = lazy_import('nba_api.stats.static.teams')
+nba_http = lazy_import('nba_api.stats.library.http')
+
+from api_cache import CacheMiss, ResponseCache
+from availability import adjust_power, team_availability
+from backfill import backfill, write_backfill_files
+from elo import EloRatings, elo_to_power
+from frames import from_result_set
+from ranking_state import RankingState, read_watermark
+from request_executor import RequestExecutor, UpstreamError
+from matchup_matrix import RATING_COLUMNS, get_matchup_matrix
+from report_writer import REPORT_FORMATS, report_paths, write_report_files
+from run_metrics import RunMetrics, profiled
+from season_sim import simulate_season, write_odds_file
+from srs import SRSRatings, srs_to_power
+from warehouse import Warehouse
+
+# Live requests: workers overlap but the shared request executor keeps the
+# average rate under the NBA stats throttle, backing off when throttled
+NBA_STATS_RATE = 1.5   # requests per second
+NBA_STATS_BURST = 3    # requests allowed back-to-back before throttling
+FETCH_WORKERS = 4
+REQUEST_TIMEOUT = (10, 30)  # (connect, read) seconds; retries cover slow responses
+
+# Local copies of downloaded data live here between runs
+CACHE_DIR = '.cache'
+SCHEDULE_MAX_AGE_HOURS = 24  # re-download the season schedule once a day
+
+# ScheduleLeagueV2 gameStatus codes
+GAME_STATUS_SCHEDULED = 1
+GAME_STATUS_LIVE = 2
+GAME_STATUS_FINAL = 3
+
+_season_schedules = {}  # season -> schedule DataFrame, shared within a process
+
+# The LeagueGameFinder columns the rankings read, and how they are stored
+# (see frames.py); the other ~20 columns are never built
+GAME_FINDER_DTYPES = {
+    'GAME_ID': None,
+    'GAME_DATE': 'datetime',
+    'TEAM_ABBREVIATION': None,
+    'MATCHUP': 'category',
+    'WL': 'category',
+    'PTS': 'Int16',
+    'PLUS_MINUS': 'Int16',
 }
 
+# The PlayerGameLogs columns the availability factor reads (see availability.py)
+PLAYER_LOG_DTYPES = {
+    'PLAYER_ID': 'int32',
+    'PLAYER_NAME': 'category',
+    'TEAM_ABBREVIATION': None,
+    'GAME_ID': None,
+    'GAME_DATE': 'datetime',
+    'MIN': 'float32',
+    'PTS': 'Int16',
+    'REB': 'Int16',
+    'AST': 'Int16',
+    'STL': 'Int16',
+    'BLK': 'Int16',
+    'TOV': 'Int16',
+}
+
+# The CommonAllPlayers columns used to tell signed players from waived ones
+ROSTER_DTYPES = {
+    'PERSON_ID': 'int32',
+    'ROSTERSTATUS': 'Int8',
+    'TEAM_ABBREVIATION': None,
+}
+
+# Raw endpoint responses, see call_endpoint()
+RESPONSE_CACHE = ResponseCache(os.path.join(CACHE_DIR, 'responses'))
+TTL_TODAY = 5 * 60         # scores and statuses change during the day
+TTL_UPCOMING = 60 * 60     # schedules for future dates rarely change
+TTL_SEASON_STATS = 60 * 60 # current-season aggregates grow after every game day
+
+# Game dates, "today" and the live cut-off are on the league's clock, see nba_now()
+NBA_TIMEZONE = ZoneInfo('America/New_York')
+
+# Live mode, see live_refresh(): poll every minute while a game is on, and
+# back off up to LIVE_IDLE_POLL_SECONDS while today's games have not started
+LIVE_POLL_SECONDS = 60
+LIVE_IDLE_POLL_SECONDS = 15 * 60
+LIVE_CUTOFF_HOURS = 30     # give up on today's slate at 6am Eastern the next day
+LIVE_COLUMNS = ['game_status', 'away_score', 'home_score']
+
+# Per-stage timings, HTTP traffic and errors for the current run
+RUN_METRICS = RunMetrics('NBA')
+RUN_METRICS_FILE = 'NBA_run_metrics.json'
+
+REQUEST_EXECUTOR = RequestExecutor(NBA_STATS_RATE, burst=NBA_STATS_BURST, metrics=RUN_METRICS)
+
+# Running per-team sums behind the power rankings, see RankingState
+RANKING_STATE_FILE = os.path.join(CACHE_DIR, 'nba_ranking_state.json')
+
+# Elo ratings, kept alongside the power score and carried across seasons
+ELO_STATE_FILE = os.path.join(CACHE_DIR, 'nba_elo_state.json')
+ELO_PARAMS = {'k': 20, 'home_advantage': 100, 'regression': 0.25}
+
+# Strength-of-schedule adjusted (SRS) ratings and the games they are solved from
+SRS_STATE_FILE = os.path.join(CACHE_DIR, 'nba_srs_state.json')
+
+# Games, team-game lines and ranking snapshots from every run, see warehouse.py
+WAREHOUSE = Warehouse(os.path.join(CACHE_DIR, 'matchrank.sqlite'))
+
 
 def get_current_season():
     """Determine the current NBA season based on date"""
@@ -44,222 +147,678 @@ def get_current_season():
         return f"{year - 1}-{str(year)[-2:]}"
 
 
-def get_games_by_date_range(days_ahead=7):
+@functools.lru_cache(maxsize=None)
+def get_team_index():
+    """
+    Static NBA team metadata, loaded once per process
+    Returns (abbreviations in nba_api's order, {team_id: abbreviation})
+    """
+    nba_teams = teams.get_teams()
+    abbrs = tuple(team['abbreviation'] for team in nba_teams)
+    return abbrs, {team['id']: team['abbreviation'] for team in nba_teams}
+
+
+def _endpoint_from_payload(endpoint_cls, params, payload, parse):
+    """Rebuild an endpoint object from a raw response payload"""
+    endpoint = endpoint_cls(**params, get_request=False)
+    endpoint.nba_response = nba_http.NBAStatsResponse(response=payload, status_code=200, url=None)
+    if parse:
+        endpoint.load_response()
+    return endpoint
+
+
+def _request_endpoint(endpoint_cls, params):
+    """
+    Send one live request and return the raw response
+    Raises UpstreamError on a non-200 status or a body that is not JSON
+    (error pages), so the executor can tell throttling from real data
+    """
+    endpoint = endpoint_cls(**params, get_request=False)
+    response = nba_http.NBAStatsHTTP().send_api_request(
+        endpoint=endpoint.endpoint,
+        parameters=endpoint.parameters,
+        # None keeps nba_api's own browser headers, which it keeps up to date
+        headers=endpoint.headers,
+        timeout=REQUEST_TIMEOUT,
+    )
+    status = response._status_code  # nba_api only keeps the status privately
+    if status != 200:
+        raise UpstreamError(f"{endpoint.endpoint} returned HTTP {status}", status=status)
+    if not response.valid_json():
+        raise UpstreamError(f"{endpoint.endpoint} returned a non-JSON response")
+    return response.get_response()
+
+
+def call_endpoint(endpoint_cls, ttl=None, parse=True, refresh=False, **params):
+    """
+    Call an nba_api endpoint through the on-disk response cache
+    `ttl` is either seconds, None (never expires) or a function of the
+    loaded endpoint returning one of those, so the expiry can depend on the
+    response itself. parse=False skips nba_api's own parsing and leaves only
+    the raw response (endpoint.nba_response.get_dict()). refresh=True skips
+    a fresh cached copy and always asks upstream (the response is still
+    cached). Raises CacheMiss on a miss in offline mode.
+    Live requests go through REQUEST_EXECUTOR (retries, backoff, circuit
+    breaker); if they still fail, an expired cached copy is served if any.
+    """
+    key = ResponseCache.make_key(endpoint_cls.endpoint, params)
+    payload = None if refresh and not RESPONSE_CACHE.offline else RESPONSE_CACHE.get(key)
+    
+    if payload is not None:
+        RUN_METRICS.record_request(cached=True)
+        return _endpoint_from_payload(endpoint_cls, params, payload, parse)
+    
+    if RESPONSE_CACHE.offline:
+        raise CacheMiss(f"{endpoint_cls.endpoint} {params} is not cached (offline mode)")
+    
+    try:
+        payload = REQUEST_EXECUTOR.call(lambda: _request_endpoint(endpoint_cls, params),
+                                        description=endpoint_cls.endpoint)
+    except Exception as e:
+        stale = RESPONSE_CACHE.get(key, allow_expired=True)
+        if stale is None:
+            raise
+        print(f"  Using expired cached {endpoint_cls.endpoint} response ({type(e).__name__})")
+        RUN_METRICS.record_error(e, f"{endpoint_cls.endpoint} (served expired cache)")
+        return _endpoint_from_payload(endpoint_cls, params, stale, parse)
+    
+    RUN_METRICS.record_request(len(payload.encode('utf-8')))
+    endpoint = _endpoint_from_payload(endpoint_cls, params, payload, parse)
+    if callable(ttl):
+        ttl = ttl(endpoint)
+    RESPONSE_CACHE.put(key, payload, ttl)
+    return endpoint
+
+
+def nba_now():
+    """
+    Current US/Eastern wall-clock time as a naive datetime
+    Game dates are Eastern, so "today" follows the league's calendar rather
+    than the runner's clock (UTC on GitHub Actions, where evening games end
+    after midnight).
+    """
+    return datetime.now(NBA_TIMEZONE).replace(tzinfo=None)
+
+
+def _scoreboard_ttl(check_date):
+    """Cache lifetime for a day's scoreboard: completed dates never change"""
+    def ttl(scoreboard):
+        if check_date.date() > nba_now().date():
+            return TTL_UPCOMING
+        if check_date.date() == nba_now().date():
+            return TTL_TODAY
+        statuses = scoreboard.get_data_frames()[0].get('GAME_STATUS_TEXT', pd.Series(dtype=str))
+        if statuses.astype(str).str.contains('Final').all():
+            return None
+        return TTL_TODAY  # postponed or suspended games may still be updated
+    return ttl
+
+
+def _season_ttl(season):
+    """Cache lifetime for whole-season endpoints: past seasons never change"""
+    return TTL_SEASON_STATS if season == get_current_season() else None
+
+
+# Season simulation: conferences for seeding; seeds 1-6 go straight to the
+# playoffs and 7-10 enter the play-in tournament
+NBA_CONFERENCES = {
+    'East': ['ATL', 'BOS', 'BKN', 'CHA', 'CHI', 'CLE', 'DET', 'IND',
+             'MIA', 'MIL', 'NYK', 'ORL', 'PHI', 'TOR', 'WAS'],
+    'West': ['DAL', 'DEN', 'GSW', 'HOU', 'LAC', 'LAL', 'MEM', 'MIN',
+             'NOP', 'OKC', 'PHX', 'POR', 'SAC', 'SAS', 'UTA'],
+}
+PLAYOFF_CUTOFFS = {'playoff_odds': 6, 'play_in_odds': 10}
+SIMULATION_WORKERS = 4
+
+
+GAME_COLUMNS = ['game_id', 'game_date', 'away_team', 'home_team', 'game_status',
+                'away_score', 'home_score', 'is_today']
+
+
+def _scoreboard_to_games(header_df, line_score_df, check_date, today, team_map, live_scores=False):
+    """
+    Turn one day's GameHeader and LineScore frames into game rows
+    Scores are looked up in LineScore pivoted on (GAME_ID, TEAM_ID) and are
+    only filled in for final games, or also for games in progress with
+    live_scores=True
+    """
+    if header_df.empty:
+        return pd.DataFrame(columns=GAME_COLUMNS)
+    
+    if 'GAME_STATUS_TEXT' in header_df:
+        game_status = header_df['GAME_STATUS_TEXT'].fillna('Scheduled').astype(str)
+    else:
+        game_status = pd.Series('Scheduled', index=header_df.index)
+    
+    if 'PTS' in line_score_df and not line_score_df.empty:
+        points = line_score_df.drop_duplicates(['GAME_ID', 'TEAM_ID']).set_index(['GAME_ID', 'TEAM_ID'])['PTS']
+    else:
+        points = pd.Series(0, index=pd.MultiIndex.from_arrays([[], []], names=['GAME_ID', 'TEAM_ID']))
+    
+    def team_points(team_ids):
+        keys = pd.MultiIndex.from_arrays([header_df['GAME_ID'], team_ids])
+        return pd.Series(points.reindex(keys).values, index=header_df.index, dtype=float)
+    
+    is_final = game_status.str.contains('Final') | live_scores
+    
+    def team_abbr(team_ids):
+        return team_ids.map(team_map).fillna(team_ids.astype(str))
+    
+    return pd.DataFrame({
+        'game_id': header_df['GAME_ID'],
+        'game_date': check_date,
+        'away_team': team_abbr(header_df['VISITOR_TEAM_ID']),
+        'home_team': team_abbr(header_df['HOME_TEAM_ID']),
+        'game_status': game_status,
+        'away_score': team_points(header_df['VISITOR_TEAM_ID']).where(is_final),
+        'home_score': team_points(header_df['HOME_TEAM_ID']).where(is_final),
+        'is_today': check_date.date() == today.date(),
+    }).reset_index(drop=True)
+
+
+def _fetch_scoreboard_day(check_date, today, team_map):
+    """
+    Fetch one day's ScoreboardV2 and return its games as a DataFrame
+    Raises on request errors so the caller can decide how to report them
+    """
+    date_str = check_date.strftime('%Y-%m-%d')
+    
+    scoreboard = call_endpoint(
+        scoreboardv2.ScoreboardV2,
+        ttl=_scoreboard_ttl(check_date),
+        game_date=date_str,
+        day_offset=0,
+    )
+    games_df = scoreboard.get_data_frames()[0]  # GameHeader
+    line_score_df = scoreboard.get_data_frames()[1]  # LineScore
+    
+    return _scoreboard_to_games(games_df, line_score_df, check_date, today, team_map)
+
+
+def _download_season_schedule(season):
+    """Download the full league schedule for a season in one ScheduleLeagueV2 call"""
+    schedule = call_endpoint(
+        scheduleleaguev2.ScheduleLeagueV2,
+        ttl=SCHEDULE_MAX_AGE_HOURS * 3600 if season == get_current_season() else None,
+        parse=False,
+        season=season,
+    )
+    
+    # Flatten the raw payload directly: nba_api's ScheduleLeagueV2 parser
+    # rescans every game for each game, which is quadratic in season length
+    game_dates = schedule.nba_response.get_dict()['leagueSchedule']['gameDates']
+    raw = pd.DataFrame.from_records(
+        [(game['gameId'], game['gameDateEst'], game['gameStatus'], game['gameStatusText'],
+          game['homeTeam']['teamId'], game['homeTeam']['teamTricode'], game['homeTeam']['score'],
+          game['awayTeam']['teamId'], game['awayTeam']['teamTricode'], game['awayTeam']['score'])
+         for game_date in game_dates for game in game_date['games']],
+        columns=['gameId', 'gameDateEst', 'gameStatus', 'gameStatusText',
+                 'homeTeam_teamId', 'homeTeam_teamTricode', 'homeTeam_score',
+                 'awayTeam_teamId', 'awayTeam_teamTricode', 'awayTeam_score'],
+    )
+    
+    # Drop placeholder games (e.g. undetermined playoff matchups)
+    raw = raw[(raw['homeTeam_teamId'] > 0) & (raw['awayTeam_teamId'] > 0)]
+    
+    status = raw['gameStatus'].astype(int)
+    is_final = status == GAME_STATUS_FINAL
+    game_date = pd.to_datetime(raw['gameDateEst'], utc=True).dt.tz_localize(None).dt.normalize()
+    
+    return pd.DataFrame({
+        'game_id': raw['gameId'].astype(str),
+        'game_date': game_date,
+        'away_team': raw['awayTeam_teamTricode'],
+        'home_team': raw['homeTeam_teamTricode'],
+        'game_status': raw['gameStatusText'].str.strip(),
+        'status_code': status,
+        'away_score': raw['awayTeam_score'].where(is_final),
+        'home_score': raw['homeTeam_score'].where(is_final),
+    }).sort_values(['game_date', 'game_id']).reset_index(drop=True)
+
+
+def _schedule_cache_file(season):
+    return os.path.join(CACHE_DIR, f"nba_schedule_{season}.csv")
+
+
+def get_season_schedule(season=None, refresh=False):
+    """
+    Return the full league schedule for a season
+    The schedule is downloaded once, then served from memory for the rest of
+    the process and from a CSV copy on disk for up to SCHEDULE_MAX_AGE_HOURS
+    """
+    season = season or get_current_season()
+    
+    if not refresh and season in _season_schedules:
+        return _season_schedules[season]
+    
+    cache_file = _schedule_cache_file(season)
+    schedule = None
+    
+    if not refresh and os.path.exists(cache_file):
+        age_hours = (time.time() - os.path.getmtime(cache_file)) / 3600
+        if age_hours < SCHEDULE_MAX_AGE_HOURS or RESPONSE_CACHE.offline:
+            schedule = pd.read_csv(cache_file, dtype={'game_id': str}, parse_dates=['game_date'])
+    
+    if schedule is None:
+        print(f"Downloading {season} season schedule...")
+        schedule = _download_season_schedule(season)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        schedule.to_csv(cache_file, index=False)
+    
+    _season_schedules[season] = schedule
+    return schedule
+
+
+def _get_games_from_schedule(today, days_ahead, team_map):
+    """
+    Answer a date-range query from the cached season schedule
+    Only dates up to today that still have unfinished games are re-fetched
+    from ScoreboardV2, to pick up live statuses and final scores
+    """
+    schedule = get_season_schedule()
+    
+    start = pd.Timestamp(today.date())
+    end = start + pd.Timedelta(days=days_ahead)
+    window = schedule[(schedule['game_date'] >= start) & (schedule['game_date'] <= end)].copy()
+    
+    stale = window[(window['game_date'] <= pd.Timestamp(today)) &
+                   (window['status_code'] != GAME_STATUS_FINAL)]
+    for refresh_date in stale['game_date'].drop_duplicates():
+        try:
+            fresh = _fetch_scoreboard_day(refresh_date.to_pydatetime(), today, team_map)
+        except Exception as e:
+            print(f"  Error refreshing {refresh_date.strftime('%Y-%m-%d')}: {str(e)}")
+            RUN_METRICS.record_error(e, f"scoreboard {refresh_date.strftime('%Y-%m-%d')}")
+            continue
+        if fresh.empty:
+            continue
+        window = window.set_index('game_id')
+        fresh = fresh.set_index('game_id')
+        window.update(fresh[['game_status', 'away_score', 'home_score']])
+        window = window.reset_index()
+    
+    window['is_today'] = window['game_date'].dt.date == today.date()
+    return window[GAME_COLUMNS]
+
+
+def get_games_by_date_range(days_ahead=7, fetch_mode='schedule', max_workers=FETCH_WORKERS):
     """
     Fetch games from today through the next N days
     Returns a DataFrame with game information including status
+    
+    fetch_mode='schedule' filters the cached season schedule locally and only
+    calls ScoreboardV2 for dates with unfinished games, falling back to the
+    per-day scoreboards if the schedule cannot be downloaded.
+    fetch_mode='concurrent' sends the per-day scoreboard requests through a
+    bounded worker pool; fetch_mode='serial' fetches one day at a time.
+    Either way, live requests are paced by the shared request executor.
     """
-    print(f"Fetching NBA games for the next {days_ahead + 1} days...")
+    print(f"Fetching NBA games for the next {days_ahead + 1} days ({fetch_mode})...")
     
-    today = datetime.now()
+    today = nba_now()
     season = get_current_season()
-    all_games = []
+    day_frames = []  # one DataFrame per day (or one for the whole window)
     
-    # Build team ID to abbreviation map
-    nba_teams = teams.get_teams()
-    team_map = {team['id']: team['abbreviation'] for team in nba_teams}
+    _, team_map = get_team_index()
     
-    for i in range(days_ahead + 1):
-        check_date = today + timedelta(days=i)
-        date_str = check_date.strftime('%Y-%m-%d')
-        
+    check_dates = [today + timedelta(days=i) for i in range(days_ahead + 1)]
+    
+    if fetch_mode == 'schedule':
         try:
-            # Add headers to avoid being blocked by NBA API
-            scoreboard = scoreboardv2.ScoreboardV2(
-                game_date=date_str, 
-                day_offset=0,
-                timeout=60  # Increase timeout for slower connections
-            )
-            games_df = scoreboard.get_data_frames()[0]  # GameHeader
-            line_score_df = scoreboard.get_data_frames()[1]  # LineScore
-            
-            if len(games_df) > 0:
-                for _, game in games_df.iterrows():
-                    home_team_id = game['HOME_TEAM_ID']
-                    visitor_team_id = game['VISITOR_TEAM_ID']
-                    game_status = game.get('GAME_STATUS_TEXT', 'Scheduled')
-                    
-                    # Extract scores from line_score_df if game is final
-                    home_score = None
-                    away_score = None
-                    if 'Final' in game_status:
-                        game_lines = line_score_df[line_score_df['GAME_ID'] == game['GAME_ID']]
-                        for _, line in game_lines.iterrows():
-                            if line['TEAM_ID'] == home_team_id:
-                                home_score = line.get('PTS', 0)
-                            elif line['TEAM_ID'] == visitor_team_id:
-                                away_score = line.get('PTS', 0)
-                    
-                    all_games.append({
-                        'game_id': game['GAME_ID'],
-                        'game_date': check_date,
-                        'away_team': team_map.get(visitor_team_id, str(visitor_team_id)),
-                        'home_team': team_map.get(home_team_id, str(home_team_id)),
-                        'game_status': game_status,
-                        'away_score': away_score,
-                        'home_score': home_score,
-                        'is_today': check_date.date() == today.date()
-                    })
-            
-            time.sleep(1.0)  # Increased rate limiting for GitHub Actions (was 0.6)
-            
+            day_frames = [_get_games_from_schedule(today, days_ahead, team_map)]
         except Exception as e:
-            print(f"  Error for {date_str}: {str(e)}")
-            continue
+            print(f"  Error loading season schedule: {str(e)}")
+            RUN_METRICS.record_error(e, 'season schedule')
+            print("  Falling back to per-day scoreboards...")
+            fetch_mode = 'concurrent'
     
-    if len(all_games) == 0:
+    if fetch_mode == 'serial':
+        for check_date in check_dates:
+            try:
+                day_frames.append(_fetch_scoreboard_day(check_date, today, team_map))
+            except Exception as e:
+                print(f"  Error for {check_date.strftime('%Y-%m-%d')}: {str(e)}")
+                RUN_METRICS.record_error(e, f"scoreboard {check_date.strftime('%Y-%m-%d')}")
+                continue
+    elif fetch_mode == 'concurrent':
+        def fetch_day(check_date):
+            try:
+                return _fetch_scoreboard_day(check_date, today, team_map)
+            except Exception as e:
+                print(f"  Error for {check_date.strftime('%Y-%m-%d')}: {str(e)}")
+                RUN_METRICS.record_error(e, f"scoreboard {check_date.strftime('%Y-%m-%d')}")
+                return None
+        
+        # Workers print the way this thread does, e.g. with the league prefix
+        # when matchrank runs several leagues at once
+        initializer = getattr(sys.stdout, 'thread_initializer', lambda: None)()
+        
+        # executor.map yields results in submission order, i.e. by date
+        with ThreadPoolExecutor(max_workers=max_workers, initializer=initializer) as executor:
+            day_frames = [day for day in executor.map(fetch_day, check_dates) if day is not None]
+    
+    day_frames = [day for day in day_frames if not day.empty]
+    if len(day_frames) == 0:
         print("No games found in the specified date range.")
         return pd.DataFrame()
     
-    games_df = pd.DataFrame(all_games)
+    games_df = pd.concat(day_frames, ignore_index=True)
     games_df = games_df.sort_values('game_date')
     
     print(f"Found {len(games_df)} total games")
     return games_df
 
 
-def calculate_power_rankings():
-    """Calculate team power rankings using win%, net rating, and efficiency"""
+def get_season_games(season, **params):
+    """
+    A season's LeagueGameFinder rows (one per team per game) as a compact frame
+    The raw response is read directly, keeping only GAME_FINDER_DTYPES
+    """
+    game_finder = call_endpoint(
+        leaguegamefinder.LeagueGameFinder,
+        ttl=_season_ttl(season),
+        parse=False,
+        season_nullable=season,
+        season_type_nullable='Regular Season',
+        league_id_nullable='00',
+        **params
+    )
+    result_set = game_finder.nba_response.get_dict()['resultSets'][0]
+    return from_result_set(result_set, GAME_FINDER_DTYPES, teams=['TEAM_ABBREVIATION'])
+
+
+def get_player_game_logs(season):
+    """
+    Every player's game logs for a season, in one PlayerGameLogs request
+    One row per player per game, compact like get_season_games()
+    """
+    player_logs = call_endpoint(
+        playergamelogs.PlayerGameLogs,
+        ttl=_season_ttl(season),
+        parse=False,
+        season_nullable=season,
+        season_type_nullable='Regular Season',
+        league_id_nullable='00',
+    )
+    result_set = player_logs.nba_response.get_dict()['resultSets'][0]
+    return from_result_set(result_set, PLAYER_LOG_DTYPES, teams=['TEAM_ABBREVIATION'])
+
+
+def get_active_rosters(season):
+    """
+    Players currently signed by a team, in one CommonAllPlayers request
+    Returns a DataFrame with team and player_id columns
+    """
+    all_players = call_endpoint(
+        commonallplayers.CommonAllPlayers,
+        ttl=TTL_SEASON_STATS,
+        parse=False,
+        is_only_current_season=1,
+        league_id='00',
+        season=season,
+    )
+    result_set = all_players.nba_response.get_dict()['resultSets'][0]
+    players = from_result_set(result_set, ROSTER_DTYPES)
+    signed = players[(players['ROSTERSTATUS'] == 1) & (players['TEAM_ABBREVIATION'].fillna('') != '')]
+    return pd.DataFrame({'team': signed['TEAM_ABBREVIATION'].astype(str), 'player_id': signed['PERSON_ID']})
+
+
+def get_team_availability(season=None):
+    """
+    Share of each team's rotation expected to play (see availability.py)
+    Returns a DataFrame indexed by team with strength and out columns, or
+    None if the player logs could not be fetched
+    """
+    print("\nChecking player availability...")
+    
+    season = season or get_current_season()
+    team_abbrs, _ = get_team_index()
+    
+    try:
+        logs = get_player_game_logs(season)
+        RUN_METRICS.record_frame('players', logs)
+        availability = team_availability(logs[logs['TEAM_ABBREVIATION'].isin(team_abbrs)],
+                                         roster=get_active_rosters(season))
+    except Exception as e:
+        print(f"Error fetching player availability: {str(e)}")
+        RUN_METRICS.record_error(e, 'player availability')
+        return None
+    
+    short = availability[availability['out'] != ''].sort_values('strength')
+    for team, row in short.iterrows():
+        print(f"  {team} at {row['strength']:.0%} (out: {row['out']})")
+    print(f"Availability computed for {len(availability)} teams from {len(logs):,} player games "
+          f"({len(short)} short-handed)")
+    return availability
+
+
+def _team_game_lines(all_games, team_abbrs):
+    """
+    Turn LeagueGameFinder rows (one per team per game) into the team-game
+    lines RankingState folds in. Points against come from each row's
+    PTS - PLUS_MINUS, which is the opponent's score for that GAME_ID.
+    """
+    # NBA franchises only, and only games that have been decided
+    decided = all_games[all_games['TEAM_ABBREVIATION'].isin(team_abbrs) & all_games['WL'].isin(['W', 'L'])]
+    
+    # Scores are stored as Int16; the running sums need the full width
+    points = decided['PTS'].astype('int64')
+    plus_minus = decided['PLUS_MINUS'].astype('int64')
+    
+    return pd.DataFrame({
+        'team': decided['TEAM_ABBREVIATION'],
+        'game_id': decided['GAME_ID'].astype(str),
+        'game_date': pd.to_datetime(decided['GAME_DATE']).dt.strftime('%Y-%m-%d'),
+        'games': 1,
+        'wins': (decided['WL'] == 'W').astype(int),
+        'losses': (decided['WL'] == 'L').astype(int),
+        'points_for': points,
+        'points_against': points - plus_minus,
+        'plus_minus': plus_minus,
+    })
+
+
+def _elo_games(all_games, team_abbrs):
+    """
+    One row per decided game for the Elo update, from the away side's
+    LeagueGameFinder row; the home score is PTS - PLUS_MINUS
+    """
+    decided = all_games[all_games['TEAM_ABBREVIATION'].isin(team_abbrs) & all_games['WL'].isin(['W', 'L'])]
+    games = _games_from_game_finder(decided)
+    away_rows = decided.loc[games.index]
+    points = away_rows['PTS'].astype('int64')
+    
+    return games.assign(
+        game_date=games['game_date'].dt.strftime('%Y-%m-%d'),
+        away_score=points,
+        home_score=points - away_rows['PLUS_MINUS'].astype('int64'),
+    )
+
+
+def score_team_totals(totals):
+    """
+    Compute power score columns from per-team running sums
+    Works on any index, e.g. one row per team or one per (date, team)
+    """
+    scores = pd.DataFrame(index=totals.index)
+    scores['wins'] = totals['wins'].astype(int)
+    scores['losses'] = totals['losses'].astype(int)
+    
+    scores['win_pct'] = scores['wins'] / (scores['wins'] + scores['losses'])
+    scores['avg_pts'] = totals['points_for'] / totals['games']
+    scores['avg_pts_allowed'] = totals['points_against'] / totals['games']
+    scores['net_rating'] = scores['avg_pts'] - scores['avg_pts_allowed']
+    scores['off_efficiency'] = scores['avg_pts']
+    scores['def_efficiency'] = scores['avg_pts_allowed']
+    
+    # Power score calculation (0-100 scale)
+    scores['power_score'] = (
+        scores['win_pct'] * 35 +
+        ((scores['net_rating'] + 15) / 30) * 30 +
+        (scores['off_efficiency'] / 120) * 20 +
+        ((120 - scores['def_efficiency']) / 120) * 15
+    ) * 100 / 100
+    
+    return scores
+
+
+def _rank_teams(totals, team_order):
+    """Compute power scores from per-team running sums and rank the teams"""
+    # Static team order first, so tied power scores keep their usual ordering
+    totals = totals.reindex([abbr for abbr in team_order if abbr in totals.index])
+    totals = totals[totals['games'] > 0]
+    
+    rankings_df = score_team_totals(totals).rename_axis('team').reset_index()
+    rankings_df = rankings_df.sort_values('power_score', ascending=False).reset_index(drop=True)
+    rankings_df['rank'] = rankings_df.index + 1
+    return rankings_df
+
+
+def _store(description, write):
+    """Run a warehouse write; failures are reported but never fail the run"""
+    try:
+        return write()
+    except Exception as e:
+        print(f"  Could not store {description}: {str(e)}")
+        RUN_METRICS.record_error(e, f"warehouse {description}")
+        return 0
+
+
+def calculate_power_rankings(full_rebuild=False):
+    """
+    Calculate team power rankings using win%, net rating, and efficiency
+    Only games after the saved state's watermark are downloaded and folded
+    in; full_rebuild=True recomputes the state from the whole season
+    """
     print("\nCalculating team power rankings...")
     
     season = get_current_season()
-    nba_teams = teams.get_teams()
+    team_abbrs, _ = get_team_index()
     
     try:
-        game_finder = leaguegamefinder.LeagueGameFinder(
-            season_nullable=season,
-            season_type_nullable='Regular Season',
-            league_id_nullable='00'
-        )
+        if full_rebuild:
+            state = RankingState(season)
+            elo = EloRatings(season, **ELO_PARAMS)
+            srs = SRSRatings(season)
+        else:
+            state = RankingState.load(RANKING_STATE_FILE, season)
+            elo = EloRatings.load(ELO_STATE_FILE, season, **ELO_PARAMS)
+            srs = SRSRatings.load(SRS_STATE_FILE, season)
         
-        all_games = game_finder.get_data_frames()[0]
+        # Resume from the earliest of the watermarks; games already folded
+        # in are skipped by each state itself
+        params = {}
+        watermarks = [state.last_date, elo.last_date, srs.last_date]
+        if None not in watermarks:
+            params['date_from_nullable'] = min(watermarks)
         
-        team_stats = []
+        all_games = get_season_games(season, **params)
+        RUN_METRICS.record_frame('games', all_games)
         
-        for team in nba_teams:
-            team_abbr = team['abbreviation']
-            team_games = all_games[all_games['TEAM_ABBREVIATION'] == team_abbr].copy()
-            
-            if len(team_games) == 0:
-                continue
-            
-            # Calculate statistics
-            wins = team_games['WL'].value_counts().get('W', 0)
-            losses = team_games['WL'].value_counts().get('L', 0)
-            total_games = wins + losses
-            
-            if total_games == 0:
-                continue
-            
-            win_pct = wins / total_games
-            avg_pts = team_games['PTS'].mean()
-            avg_pts_allowed = team_games['PTS'].apply(
-                lambda x: all_games[
-                    (all_games['GAME_ID'] == team_games[team_games['PTS'] == x].iloc[0]['GAME_ID']) &
-                    (all_games['TEAM_ABBREVIATION'] != team_abbr)
-                ]['PTS'].iloc[0] if len(all_games[
-                    (all_games['GAME_ID'] == team_games[team_games['PTS'] == x].iloc[0]['GAME_ID']) &
-                    (all_games['TEAM_ABBREVIATION'] != team_abbr)
-                ]) > 0 else 0
-            ).mean() if len(team_games) > 0 else 0
-            
-            # Simplified calculation for allowed points
-            avg_pts_allowed = team_games['PLUS_MINUS'].apply(lambda pm: avg_pts - pm).mean()
-            
-            net_rating = avg_pts - avg_pts_allowed
-            off_efficiency = avg_pts
-            def_efficiency = avg_pts_allowed
-            
-            # Power score calculation (0-100 scale)
-            power_score = (
-                win_pct * 35 +
-                ((net_rating + 15) / 30) * 30 +
-                (off_efficiency / 120) * 20 +
-                ((120 - def_efficiency) / 120) * 15
-            ) * 100 / 100
-            
-            team_stats.append({
-                'team': team_abbr,
-                'wins': wins,
-                'losses': losses,
-                'win_pct': win_pct,
-                'avg_pts': avg_pts,
-                'avg_pts_allowed': avg_pts_allowed,
-                'net_rating': net_rating,
-                'off_efficiency': off_efficiency,
-                'def_efficiency': def_efficiency,
-                'power_score': power_score
-            })
+        lines = _team_game_lines(all_games, team_abbrs)
+        new_games = state.fold(lines)
+        state.save(RANKING_STATE_FILE)
+        print(f"Folded in {new_games} new games (through {state.last_date})")
         
-        rankings_df = pd.DataFrame(team_stats)
-        rankings_df = rankings_df.sort_values('power_score', ascending=False).reset_index(drop=True)
-        rankings_df['rank'] = rankings_df.index + 1
+        results = _elo_games(all_games, team_abbrs)
+        elo.update(results)
+        elo.save(ELO_STATE_FILE)
+        
+        srs.update(results)
+        srs.solve()
+        srs.save(SRS_STATE_FILE)
+        print(f"SRS solved in {srs.iterations} iterations (home advantage {srs.home_advantage:+.1f})")
+        
+        rankings_df = _rank_teams(state.totals(), team_abbrs)
+        rankings_df['elo'] = rankings_df['team'].map(elo.to_series())
+        rankings_df['elo_power'] = elo_to_power(rankings_df['elo'])
+        rankings_df['srs'] = rankings_df['team'].map(srs.to_series())
+        rankings_df['srs_power'] = srs_to_power(rankings_df['srs'])
+        
+        _store('team games', lambda: WAREHOUSE.upsert_team_games('NBA', season, lines))
+        _store('rankings', lambda: WAREHOUSE.upsert_rankings('NBA', season, state.last_date, rankings_df))
         
         print(f"Power rankings calculated for {len(rankings_df)} teams")
         return rankings_df
         
     except Exception as e:
         print(f"Error calculating rankings: {str(e)}")
+        RUN_METRICS.record_error(e, 'power rankings')
         return pd.DataFrame()
 
 
-def analyze_matchups(games_df, rankings_df):
+def _games_from_game_finder(all_games):
+    """One row per game, taken from the away side's LeagueGameFinder row ("AWY @ HOM")"""
+    away_rows = all_games[all_games['MATCHUP'].str.contains(' @ ', regex=False)]
+    return pd.DataFrame({
+        'game_id': away_rows['GAME_ID'].astype(str),
+        'game_date': pd.to_datetime(away_rows['GAME_DATE']),
+        'away_team': away_rows['TEAM_ABBREVIATION'],
+        'home_team': away_rows['MATCHUP'].str.split(' @ ', regex=False).str[1].str.strip(),
+    })
+
+
+def backfill_rankings(seasons, max_workers=None):
+    """
+    Point-in-time power rankings after every game day of the given seasons,
+    plus each game's matchup score as it would have been rated beforehand
+    Each season is one (cached) LeagueGameFinder call; the snapshots are
+    computed in parallel worker processes.
+    """
+    print(f"\nBackfilling rankings for {len(seasons)} season(s)...")
+    
+    team_abbrs, _ = get_team_index()
+    season_inputs = {}
+    
+    for season in seasons:
+        all_games = get_season_games(season)
+        RUN_METRICS.record_frame(f"games {season}", all_games)
+        season_inputs[season] = (_team_game_lines(all_games, team_abbrs), _games_from_game_finder(all_games))
+    
+    snapshots, matchups = backfill(season_inputs, score_team_totals, max_workers)
+    print(f"Computed {snapshots['as_of'].nunique()} game-day snapshots and {len(matchups)} matchups")
+    return snapshots, matchups
+
+
+def analyze_matchups(games_df, rankings_df, rating_col='power_score', availability=None):
     """
     Analyze each game and determine watchability
+    rating_col picks the team rating to score with: 'power_score', or
+    'elo_power' / 'srs_power' for Elo or SRS ratings mapped onto the same scale
+    availability (from get_team_availability()) lowers the rating of teams
+    missing rotation players and adds away_out / home_out columns
     Returns games_df with added analysis columns
     """
     if rankings_df.empty or games_df.empty:
         return games_df
     
+    if availability is not None:
+        strength = rankings_df['team'].map(availability['strength'])
+        rankings_df = rankings_df.assign(**{rating_col: adjust_power(rankings_df[rating_col], strength)})
+    
     # IMPORTANT: Deduplicate games by game_id to prevent duplicates in output
     # This fixes the issue where same game appears multiple times
     games_df = games_df.drop_duplicates(subset=['game_id'], keep='first').reset_index(drop=True)
     
-    # Create lookup dictionaries
-    rank_dict = rankings_df.set_index('team')['power_score'].to_dict()
+    # Every pairing is precomputed once per ranking update; each game is a lookup
+    matrix = get_matchup_matrix(rankings_df, rating_col=rating_col)
+    scores = matrix.lookup(games_df['away_team'], games_df['home_team'])
     team_rank_dict = rankings_df.set_index('team')['rank'].to_dict()
     
     # Add analysis for each game
-    games_df['away_power'] = games_df['away_team'].map(rank_dict).fillna(50)
-    games_df['home_power'] = games_df['home_team'].map(rank_dict).fillna(50)
+    games_df['away_power'] = scores['away_power'].to_numpy()
+    games_df['home_power'] = scores['home_power'].to_numpy()
     games_df['away_rank'] = games_df['away_team'].map(team_rank_dict).fillna(15)
     games_df['home_rank'] = games_df['home_team'].map(team_rank_dict).fillna(15)
     
-    # Calculate matchup quality scores
-    # Keep this as simple average - it naturally centers around 50 with good spread (30-70 range)
-    games_df['quality_score'] = (games_df['away_power'] + games_df['home_power']) / 2
-    
-    # IMPROVED: Calculate competitiveness with better distribution
-    # Old formula: (1 - diff/100) * 100 gave 60-100 range (too compressed)
-    # New formula: Use squared difference to amplify spread, then scale
-    # This gives us a 0-100 range with better discrimination between matchups
-    score_diff = abs(games_df['away_power'] - games_df['home_power'])
-    
-    # Use exponential decay for competitive score: more sensitive to differences
-    # Perfect match (diff=0) = 100, Large diff (40+) approaches 0
-    # Formula: 100 * e^(-diff/15) gives good spread across 0-100 range
-    games_df['competitive_score'] = 100 * np.exp(-score_diff / 15)
-    
-    # Alternative simpler formula if you prefer: quadratic penalty
-    # games_df['competitive_score'] = 100 * (1 - (score_diff / 50) ** 2).clip(0, 100)
-    
-    # Overall matchup score: Rebalanced to 60% quality, 40% competitiveness
-    # Since competitive score now has better spread, we give it more weight
-    games_df['matchup_score'] = (0.60 * games_df['quality_score'] + 
-                                   0.40 * games_df['competitive_score'])
-    
-    # Determine watchability tier (adjusted thresholds for new scoring)
-    def get_tier(score):
-        if score >= 70:
-            return "🔥 MUST WATCH"
-        elif score >= 60:
-            return "⭐ HIGHLY RECOMMENDED"
-        elif score >= 50:
-            return "👍 WORTH WATCHING"
-        else:
-            return "📺 Optional"
+    # Quality (average power), competitiveness (100 * e^(-diff/15)),
+    # overall matchup score (60/40 blend) and watchability tier
+    for column in ['quality_score', 'competitive_score', 'matchup_score', 'tier']:
+        games_df[column] = scores[column].to_numpy()
     
-    games_df['tier'] = games_df['matchup_score'].apply(get_tier)
+    if availability is not None:
+        games_df['away_out'] = games_df['away_team'].map(availability['out']).fillna('')
+        games_df['home_out'] = games_df['home_team'].map(availability['out']).fillna('')
     
     # Sort by matchup score
     games_df = games_df.sort_values(['game_date', 'matchup_score'], 
@@ -268,167 +827,396 @@ def analyze_matchups(games_df, rankings_df):
     return games_df
 
 
-def format_game_markdown(row, rank_num=None, total_games=None):
-    """Format a single game as markdown"""
-    lines = []
+def simulate_remaining_season(rankings_df, n_sims=50000, max_workers=SIMULATION_WORKERS):
+    """
+    Playoff, play-in and seeding odds from simulating the rest of the regular
+    season with the current power scores
+    Remaining games come from the cached season schedule; regular-season
+    game IDs start with 002. The cache can be up to a day old, so games it
+    still lists as unfinished but that the saved ranking state has already
+    counted in the current wins are left out.
+    """
+    print(f"\nSimulating the rest of the season {n_sims:,} times...")
+    sim_start = time.perf_counter()
+    
+    season = get_current_season()
+    schedule = get_season_schedule(season)
+    remaining = schedule[schedule['game_id'].str.startswith('002') &
+                         (schedule['status_code'] != GAME_STATUS_FINAL)]
+    state = RankingState.load(RANKING_STATE_FILE, season)
+    counted = state.folded(remaining.assign(game_date=remaining['game_date'].dt.strftime('%Y-%m-%d')))
+    remaining = remaining[~counted]
+    
+    nba_teams = list(get_team_index()[0])
+    current_wins = rankings_df.set_index('team')['wins'].reindex(nba_teams, fill_value=0)
+    power = rankings_df.set_index('team')['power_score'].to_dict()
+    
+    odds_df, win_distribution = simulate_season(
+        nba_teams, current_wins.to_numpy(), remaining, power, NBA_CONFERENCES,
+        PLAYOFF_CUTOFFS, n_sims=n_sims, max_workers=max_workers,
+    )
+    print(f"⏱️  Simulated {len(remaining)} remaining games in {time.perf_counter() - sim_start:.1f}s")
+    return odds_df, win_distribution
+
+
+def format_games_markdown(games, numbered=False):
+    """
+    Format every game in `games` as a markdown block, column-wise
+    numbered=True prefixes each header with its position, e.g. "#3/16"
+    Returns a Series of blocks aligned with `games`
+    """
+    away = games['away_team'].astype(str)
+    home = games['home_team'].astype(str)
+    status = games['game_status'].astype(str)
     
     # Header with tier and matchup
-    if rank_num and total_games:
-        lines.append(f"### #{rank_num}/{total_games} - {row['tier']}")
+    if numbered:
+        position = pd.Series(np.arange(1, len(games) + 1), index=games.index).astype(str)
+        header = "### #" + position + f"/{len(games)} - " + games['tier']
     else:
-        lines.append(f"### {row['tier']}")
-    
-    # Game matchup - check for NaN using pd.notna() or manual check
-    has_scores = (row['away_score'] is not None and 
-                  row['home_score'] is not None and 
-                  not pd.isna(row['away_score']) and 
-                  not pd.isna(row['home_score']))
-    
-    if has_scores:
-        # Completed game with scores
-        lines.append(f"**{row['away_team']} {int(row['away_score'])} @ "
-                    f"{row['home_team']} {int(row['home_score'])}** - {row['game_status']}")
-    else:
-        # Upcoming game without scores
-        lines.append(f"**{row['away_team']} @ {row['home_team']}** - {row['game_status']}")
+        header = "### " + games['tier']
+    
+    # Completed games show their scores
+    has_scores = games['away_score'].notna() & games['home_score'].notna()
+    away_score = games['away_score'].fillna(0).astype(int).astype(str)
+    home_score = games['home_score'].fillna(0).astype(int).astype(str)
+    matchup = ("**" + away + " " + away_score + " @ " + home + " " + home_score + "** - " + status).where(
+        has_scores, "**" + away + " @ " + home + "** - " + status)
     
     # Rankings and scores
-    lines.append(f"- **Team Rankings:** #{int(row['away_rank'])} {row['away_team']} vs "
-                f"#{int(row['home_rank'])} {row['home_team']}")
-    lines.append(f"- **Matchup Score:** {row['matchup_score']:.1f}/100 "
-                f"(Quality: {row['quality_score']:.1f}, Competitive: {row['competitive_score']:.1f})")
+    rankings = ("- **Team Rankings:** #" + games['away_rank'].astype(int).astype(str) + " " + away +
+                " vs #" + games['home_rank'].astype(int).astype(str) + " " + home)
+    scores = ("- **Matchup Score:** " + games['matchup_score'].map('{:.1f}'.format) +
+              "/100 (Quality: " + games['quality_score'].map('{:.1f}'.format) +
+              ", Competitive: " + games['competitive_score'].map('{:.1f}'.format) + ")")
+    
+    block = header + "\n" + matchup + "\n" + rankings + "\n" + scores
     
-    return "\n".join(lines)
+    # Missing rotation players, when availability was checked
+    if 'away_out' in games:
+        away_out = (away + ": " + games['away_out']).where(games['away_out'] != '', '')
+        home_out = (home + ": " + games['home_out']).where(games['home_out'] != '', '')
+        separator = pd.Series("; ", index=games.index).where((away_out != '') & (home_out != ''), '')
+        missing = away_out + separator + home_out
+        block = block + ("\n- **Missing:** " + missing).where(missing != '', '')
+    
+    return block
 
 
-def write_markdown_report(games_df, rankings_df, output_file='NBA_Weekly_Report.md'):
-    """Write comprehensive markdown report"""
-    
-    today = datetime.now()
+def format_game_markdown(row, rank_num=None, total_games=None):
+    """Format a single game as markdown"""
+    block = format_games_markdown(pd.DataFrame([row])).iloc[0]
+    if rank_num and total_games:
+        block = block.replace("### ", f"### #{rank_num}/{total_games} - ", 1)
+    return block
+
+
+def render_markdown_report(games_df, rankings_df, today=None, days_ahead=7):
+    """
+    Render the full markdown report in memory
+    Each section is built from whole columns and joined once at the end;
+    the coverage lines describe today plus `days_ahead` days
+    """
+    today = today or nba_now()
     season = get_current_season()
     
     # Separate today's games from upcoming
     todays_games = games_df[games_df['is_today'] == True]
     upcoming_games = games_df[games_df['is_today'] == False]
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        # Header
-        f.write(f"# 🏀 NBA Weekly Matchup Report\n\n")
-        f.write(f"**Season:** {season}  \n")
-        f.write(f"**Generated:** {today.strftime('%A, %B %d, %Y at %I:%M %p')}  \n")
-        f.write(f"**Coverage:** Next 7 days\n\n")
+    parts = []
+    
+    # Header
+    parts.append(f"# 🏀 NBA Weekly Matchup Report\n\n")
+    parts.append(f"**Season:** {season}  \n")
+    parts.append(f"**Generated:** {today.strftime('%A, %B %d, %Y at %I:%M %p')}  \n")
+    parts.append(f"**Coverage:** Next {days_ahead} days\n\n")
+    
+    parts.append("---\n\n")
+    
+    # TODAY'S GAMES SECTION
+    parts.append(render_todays_games(todays_games, today))
+    
+    parts.append("---\n\n")
+    
+    # UPCOMING GAMES SECTION
+    parts.append(f"## 📆 UPCOMING GAMES (Next {days_ahead} Days)\n\n")
+    
+    if len(upcoming_games) == 0:
+        parts.append(f"*No upcoming games found in the next {days_ahead} days.*\n\n")
+    else:
+        # Date header before the first game of each day
+        game_dates = upcoming_games['game_date'].dt.normalize()
+        new_date = game_dates.ne(game_dates.shift())
+        date_headers = ("\n### 🗓️ " + upcoming_games['game_date'].dt.strftime('%A, %B %d, %Y') + "\n\n").where(new_date, "")
+        blocks = format_games_markdown(upcoming_games, numbered=True)
+        parts.append("".join(date_headers + blocks + "\n\n"))
+    
+    parts.append("---\n\n")
+    
+    # TOP MATCHUPS SUMMARY
+    parts.append("## 🌟 Top 5 Matchups This Week\n\n")
+    top_5 = games_df.nlargest(5, 'matchup_score')
+    
+    if len(top_5) > 0:
+        position = pd.Series(np.arange(1, len(top_5) + 1), index=top_5.index).astype(str)
+        parts.append("".join(
+            position + ". **" + top_5['away_team'] + " @ " + top_5['home_team'] + "** (" +
+            top_5['game_date'].dt.strftime('%a %m/%d') + ") - Score: " +
+            top_5['matchup_score'].map('{:.1f}'.format) + "/100\n"
+        ))
+    
+    parts.append("\n---\n\n")
+    
+    # POWER RANKINGS
+    parts.append("## 📊 Current Power Rankings (Top 10)\n\n")
+    parts.append("| Rank | Team | Power Score | Record | Net Rating |\n")
+    parts.append("|------|------|-------------|--------|------------|\n")
+    
+    top_10 = rankings_df.head(10)
+    if len(top_10) > 0:
+        parts.append("".join(
+            "| " + top_10['rank'].astype(int).astype(str) + " | " + top_10['team'] + " | " +
+            top_10['power_score'].map('{:.1f}'.format) + " | " +
+            top_10['wins'].astype(int).astype(str) + "-" + top_10['losses'].astype(int).astype(str) + " | " +
+            top_10['net_rating'].map('{:+.1f}'.format) + " |\n"
+        ))
+    
+    parts.append("\n---\n\n")
+    
+    # Methodology
+    parts.append(METHODOLOGY_MARKDOWN)
+    
+    return "".join(parts)
+
+
+def render_todays_games(todays_games, today):
+    """Render the "Today's games" section"""
+    parts = [f"## 📅 TODAY'S GAMES - {today.strftime('%A, %B %d')}\n\n"]
+    
+    if len(todays_games) == 0:
+        parts.append("*No games scheduled for today.*\n\n")
+    else:
+        parts.append(f"**{len(todays_games)} game(s) today**\n\n")
+        parts.append("".join(format_games_markdown(todays_games) + "\n\n"))
+    
+    return "".join(parts)
+
+
+METHODOLOGY_MARKDOWN = (
+    "## 📈 Methodology\n\n"
+    "### Power Rankings\n"
+    "- **Win Percentage:** 35%\n"
+    "- **Net Rating:** 30%\n"
+    "- **Offensive Efficiency:** 20%\n"
+    "- **Defensive Efficiency:** 15%\n\n"
+    
+    "### Matchup Scores\n"
+    "- **Quality Score:** Average power rating of both teams (0-100)\n"
+    "  - Higher scores indicate stronger teams overall\n"
+    "  - Typical range: 30-70 based on current team strengths\n\n"
+    "- **Competitive Score:** How evenly matched teams are (0-100)\n"
+    "  - Calculated using exponential decay: 100 × e^(-difference/15)\n"
+    "  - Perfect matchup (0 point difference) = 100\n"
+    "  - 10 point difference ≈ 51 (close game)\n"
+    "  - 20 point difference ≈ 26 (moderate mismatch)\n"
+    "  - 30+ point difference ≈ <15 (blowout likely)\n\n"
+    "- **Overall Matchup Score:** 60% quality + 40% competitiveness\n"
+    "  - Balances team strength with game competitiveness\n"
+    "  - Best games: strong teams that are evenly matched\n\n"
+    
+    "### Watchability Tiers\n"
+    "- 🔥 **MUST WATCH** (70+): Elite matchups between top teams\n"
+    "- ⭐ **HIGHLY RECOMMENDED** (60-69): High-quality, competitive games\n"
+    "- 👍 **WORTH WATCHING** (50-59): Solid matchups\n"
+    "- 📺 **Optional** (<50): Lower-tier or lopsided games\n"
+)
+
+
+def write_markdown_report(games_df, rankings_df, output_file='NBA_Weekly_Report.md', formats=REPORT_FORMATS,
+                          days_ahead=7):
+    """
+    Write comprehensive markdown report
+    The report is rendered in memory and swapped into place atomically,
+    alongside JSON and CSV copies of the games and rankings
+    """
+    today = nba_now()
+    markdown = render_markdown_report(games_df, rankings_df, today, days_ahead)
+    _write_report(markdown, games_df, rankings_df, today, output_file, formats)
+
+
+def _write_report(markdown, games_df, rankings_df, today, output_file, formats):
+    metadata = {
+        'league': 'NBA',
+        'season': get_current_season(),
+        'generated': today.isoformat(timespec='seconds'),
+    }
+    
+    for path in write_report_files(output_file, markdown, games_df, rankings_df, metadata, formats):
+        print(f"\n✅ Report written to: {path}")
+
+
+def _poll_scoreboard(check_date, today, team_map):
+    """
+    Fetch one day's scoreboard from upstream, bypassing the cache
+    Returns (games with live scores indexed by game_id, whether any game is in progress)
+    """
+    scoreboard = call_endpoint(
+        scoreboardv2.ScoreboardV2,
+        ttl=TTL_TODAY,
+        refresh=True,
+        game_date=check_date.strftime('%Y-%m-%d'),
+        day_offset=0,
+    )
+    header_df, line_score_df = scoreboard.get_data_frames()[:2]
+    games = _scoreboard_to_games(header_df, line_score_df, check_date, today, team_map, live_scores=True)
+    in_progress = (pd.to_numeric(header_df.get('GAME_STATUS_ID', pd.Series(dtype=int)))
+                   == GAME_STATUS_LIVE).any()
+    return games.set_index('game_id'), in_progress
+
+
+def live_refresh(games_df, rankings_df, output_file='NBA_Weekly_Report.md', formats=REPORT_FORMATS,
+                 poll_seconds=LIVE_POLL_SECONDS, idle_poll_seconds=LIVE_IDLE_POLL_SECONDS, sleep=time.sleep,
+                 days_ahead=7):
+    """
+    Keep today's scores in the report current until today's games are final
+    Each poll is one ScoreboardV2 request per date that still has unfinished
+    games (normally just today). Only when a status or score changed is the
+    "Today's games" section re-rendered and spliced into the report; the
+    rest of the report is left as the full run wrote it. Postponed games
+    never go final, so polling stops LIVE_CUTOFF_HOURS after the start of
+    today (Eastern) regardless.
+    """
+    today = nba_now()
+    cutoff = datetime.combine(today.date(), datetime.min.time()) + timedelta(hours=LIVE_CUTOFF_HOURS)
+    _, team_map = get_team_index()
+    markdown = render_markdown_report(games_df, rankings_df, today, days_ahead)
+    section = render_todays_games(games_df[games_df['is_today'] == True], today)
+    delay = poll_seconds
+    polls = 0
+    
+    while True:
+        todays = games_df[games_df['is_today'] == True]
+        pending = todays[~todays['game_status'].astype(str).str.contains('Final')]
+        if pending.empty:
+            print(f"\n✅ All of today's games are final after {polls} poll(s)")
+            return games_df
         
-        f.write("---\n\n")
+        print(f"\n⏱️  {len(pending)} game(s) not final, next poll in {delay:.0f}s")
+        sleep(delay)
+        if nba_now() >= cutoff:
+            print("Slate is over, leaving the rest to the next full run")
+            return games_df
         
-        # TODAY'S GAMES SECTION
-        f.write(f"## 📅 TODAY'S GAMES - {today.strftime('%A, %B %d')}\n\n")
+        polled, in_progress = [], False
+        for check_date in pd.to_datetime(pending['game_date']).dt.normalize().unique():
+            try:
+                day, live = _poll_scoreboard(check_date.to_pydatetime(), today, team_map)
+            except Exception as e:
+                print(f"  Error polling {check_date:%Y-%m-%d}: {str(e)}")
+                RUN_METRICS.record_error(e, f"live scoreboard {check_date:%Y-%m-%d}")
+                continue
+            polled.append(day)
+            in_progress = in_progress or live
+        polls += 1
         
-        if len(todays_games) == 0:
-            f.write("*No games scheduled for today.*\n\n")
+        if polled:
+            update = pd.concat(polled)
+            rows = games_df['game_id'].isin(update.index)
+            before = games_df.loc[rows, LIVE_COLUMNS]
+            after = pd.DataFrame({column: games_df.loc[rows, 'game_id'].map(update[column])
+                                  for column in LIVE_COLUMNS})
+            changed = ~(before.eq(after) | (before.isna() & after.isna())).all(axis=1)
         else:
-            f.write(f"**{len(todays_games)} game(s) today**\n\n")
-            
-            for idx, game in todays_games.iterrows():
-                f.write(format_game_markdown(game))
-                f.write("\n\n")
-        
-        f.write("---\n\n")
-        
-        # UPCOMING GAMES SECTION
-        f.write("## 📆 UPCOMING GAMES (Next 7 Days)\n\n")
+            changed = pd.Series(dtype=bool)
         
-        if len(upcoming_games) == 0:
-            f.write("*No upcoming games found in the next 7 days.*\n\n")
-        else:
-            # Group by date
-            current_date = None
-            rank_counter = 1
-            total_upcoming = len(upcoming_games)
+        if changed.any():
+            games_df = games_df.copy()
+            games_df.loc[after.index, LIVE_COLUMNS] = after
+            for _, game in games_df.loc[changed[changed].index].iterrows():
+                score = (f" {game['away_score']:.0f}-{game['home_score']:.0f}"
+                         if pd.notna(game['away_score']) and pd.notna(game['home_score']) else "")
+                print(f"  {game['away_team']} @ {game['home_team']}{score} - {game['game_status']}")
             
-            for idx, game in upcoming_games.iterrows():
-                game_date = game['game_date'].date()
-                
-                # New date header
-                if current_date != game_date:
-                    current_date = game_date
-                    f.write(f"\n### 🗓️ {game['game_date'].strftime('%A, %B %d, %Y')}\n\n")
-                
-                f.write(format_game_markdown(game, rank_counter, total_upcoming))
-                f.write("\n\n")
-                rank_counter += 1
-        
-        f.write("---\n\n")
-        
-        # TOP MATCHUPS SUMMARY
-        f.write("## 🌟 Top 5 Matchups This Week\n\n")
-        top_5 = games_df.nlargest(5, 'matchup_score')
-        
-        for i, (idx, game) in enumerate(top_5.iterrows(), 1):
-            date_str = game['game_date'].strftime('%a %m/%d')
-            f.write(f"{i}. **{game['away_team']} @ {game['home_team']}** "
-                   f"({date_str}) - Score: {game['matchup_score']:.1f}/100\n")
-        
-        f.write("\n---\n\n")
-        
-        # POWER RANKINGS
-        f.write("## 📊 Current Power Rankings (Top 10)\n\n")
-        f.write("| Rank | Team | Power Score | Record | Net Rating |\n")
-        f.write("|------|------|-------------|--------|------------|\n")
+            new_section = render_todays_games(games_df[games_df['is_today'] == True], today)
+            markdown = markdown.replace(section, new_section, 1)
+            section = new_section
+            _write_report(markdown, games_df, rankings_df, today, output_file, formats)
         
-        for idx, team in rankings_df.head(10).iterrows():
-            f.write(f"| {int(team['rank'])} | {team['team']} | "
-                   f"{team['power_score']:.1f} | "
-                   f"{int(team['wins'])}-{int(team['losses'])} | "
-                   f"{team['net_rating']:+.1f} |\n")
-        
-        f.write("\n---\n\n")
-        
-        # Methodology
-        f.write("## 📈 Methodology\n\n")
-        f.write("### Power Rankings\n")
-        f.write("- **Win Percentage:** 35%\n")
-        f.write("- **Net Rating:** 30%\n")
-        f.write("- **Offensive Efficiency:** 20%\n")
-        f.write("- **Defensive Efficiency:** 15%\n\n")
-        
-        f.write("### Matchup Scores\n")
-        f.write("- **Quality Score:** Average power rating of both teams (0-100)\n")
-        f.write("  - Higher scores indicate stronger teams overall\n")
-        f.write("  - Typical range: 30-70 based on current team strengths\n\n")
-        f.write("- **Competitive Score:** How evenly matched teams are (0-100)\n")
-        f.write("  - Calculated using exponential decay: 100 × e^(-difference/15)\n")
-        f.write("  - Perfect matchup (0 point difference) = 100\n")
-        f.write("  - 10 point difference ≈ 51 (close game)\n")
-        f.write("  - 20 point difference ≈ 26 (moderate mismatch)\n")
-        f.write("  - 30+ point difference ≈ <15 (blowout likely)\n\n")
-        f.write("- **Overall Matchup Score:** 60% quality + 40% competitiveness\n")
-        f.write("  - Balances team strength with game competitiveness\n")
-        f.write("  - Best games: strong teams that are evenly matched\n\n")
-        
-        f.write("### Watchability Tiers\n")
-        f.write("- 🔥 **MUST WATCH** (70+): Elite matchups between top teams\n")
-        f.write("- ⭐ **HIGHLY RECOMMENDED** (60-69): High-quality, competitive games\n")
-        f.write("- 👍 **WORTH WATCHING** (50-59): Solid matchups\n")
-        f.write("- 📺 **Optional** (<50): Lower-tier or lopsided games\n")
+        # Poll at the base rate while games are on, otherwise back off
+        delay = poll_seconds if in_progress or changed.any() else min(delay * 2, idle_poll_seconds)
+
+
+def dry_run(fetch_mode='schedule', offline=False, full_rebuild=False, n_sims=0, days_ahead=7, output_dir='.',
+            formats=REPORT_FORMATS, availability=False):
+    """
+    Print what a run would fetch, recompute and write, then stop
+    Only reads local state files: no network, and pandas and nba_api are
+    never imported
+    """
+    today = nba_now()
+    season = get_current_season()
     
-    print(f"\n✅ Report written to: {output_file}")
+    print(f"NBA dry run ({IMPORT_SECONDS:.2f}s startup)")
+    print(f"  Season:         {season}")
+    print(f"  Games:          {today:%Y-%m-%d} to {today + timedelta(days=days_ahead):%Y-%m-%d}, "
+          f"fetch mode {fetch_mode}{' (offline)' if offline else ''}")
+    
+    cache_file = _schedule_cache_file(season)
+    if os.path.exists(cache_file):
+        age_hours = (time.time() - os.path.getmtime(cache_file)) / 3600
+        fresh = age_hours < SCHEDULE_MAX_AGE_HOURS or offline
+        print(f"  Schedule cache: {cache_file}, {age_hours:.1f}h old ({'reused' if fresh else 'refreshed'})")
+    else:
+        print("  Schedule cache: none, would download")
+    
+    for label, path in [('Rankings', RANKING_STATE_FILE), ('Elo', ELO_STATE_FILE), ('SRS', SRS_STATE_FILE)]:
+        watermark = None if full_rebuild else read_watermark(path, season)
+        plan = f"games after {watermark}" if watermark else "whole season"
+        print(f"  {label + ':':<15} {plan}")
+    
+    if availability:
+        print(f"  Availability:   PlayerGameLogs and CommonAllPlayers requests for {season} (cached for "
+              f"{TTL_SEASON_STATS // 60} minutes)")
+    
+    outputs = report_paths(os.path.join(output_dir, 'NBA_Weekly_Report.md'), formats)
+    outputs.append(os.path.join(output_dir, RUN_METRICS_FILE))
+    if n_sims:
+        outputs.append(f"{os.path.join(output_dir, 'NBA_Season_Odds.csv')} ({n_sims:,} simulations)")
+    print(f"  Outputs:        {', '.join(outputs)}")
 
 
-def main():
-    """Main execution function"""
+def main(fetch_mode='schedule', offline=False, full_rebuild=False, n_sims=0, rating_col='power_score',
+         days_ahead=7, output_dir='.', formats=REPORT_FORMATS, live=False, availability=False):
+    """
+    Main execution function
+    Each stage is timed and its HTTP traffic and errors are counted; the run
+    summary is written to NBA_run_metrics.json even when the run fails.
+    The report covers today plus `days_ahead` days and is written to
+    `output_dir` in each of `formats`. live=True then keeps today's scores
+    in the report current, see live_refresh(). availability=True also
+    lowers the ratings of teams missing rotation players, from bulk
+    PlayerGameLogs and roster requests (see get_team_availability())
+    """
+    RESPONSE_CACHE.offline = offline
+    RUN_METRICS.reset()
+    report_file = os.path.join(output_dir, 'NBA_Weekly_Report.md')
+
     print("\n" + "=" * 60)
     print("NBA MATCHUP ANALYSIS - OPTIMIZED VERSION")
     print("=" * 60 + "\n")
     
     try:
         # Step 1: Get games
-        games_df = get_games_by_date_range(days_ahead=7)
+        with RUN_METRICS.stage('fetch'):
+            games_df = get_games_by_date_range(days_ahead=days_ahead, fetch_mode=fetch_mode)
         
         if games_df.empty:
+            RUN_METRICS.status = 'no_games'
             print("\n" + "=" * 60)
             print("NO GAMES FOUND")
             print("=" * 60)
-            print("\nNo NBA games scheduled in the next 7 days.")
+            print(f"\nNo NBA games scheduled in the next {days_ahead} days.")
             print("This is likely due to:")
             print("  - NBA offseason (July - September)")
             print("  - All-Star break (mid-February)")
@@ -438,33 +1226,119 @@ def main():
             return
         
         # Step 2: Calculate power rankings
-        rankings_df = calculate_power_rankings()
+        with RUN_METRICS.stage('rank'):
+            rankings_df = calculate_power_rankings(full_rebuild=full_rebuild)
         
         if rankings_df.empty:
+            RUN_METRICS.status = 'no_rankings'
             print("Could not calculate rankings. Exiting.")
             return
         
+        # Optional: who is missing from each team's rotation
+        team_availability_df = None
+        if availability:
+            with RUN_METRICS.stage('players'):
+                team_availability_df = get_team_availability()
+        
         # Step 3: Analyze matchups
-        games_df = analyze_matchups(games_df, rankings_df)
+        with RUN_METRICS.stage('analyze'):
+            games_df = analyze_matchups(games_df, rankings_df, rating_col=rating_col,
+                                        availability=team_availability_df)
         
         # Step 4: Write markdown report
-        write_markdown_report(games_df, rankings_df)
+        with RUN_METRICS.stage('render'):
+            write_markdown_report(games_df, rankings_df, output_file=report_file, formats=formats,
+                                  days_ahead=days_ahead)
         
+        # Keep this window's games in the local warehouse
+        with RUN_METRICS.stage('store'):
+            _store('games', lambda: WAREHOUSE.upsert_games('NBA', get_current_season(), games_df))
+        
+        # Step 5 (optional): Simulate the rest of the season
+        if n_sims:
+            with RUN_METRICS.stage('simulate'):
+                odds_df, _ = simulate_remaining_season(rankings_df, n_sims=n_sims)
+                odds_file = write_odds_file(odds_df, os.path.join(output_dir, 'NBA_Season_Odds.csv'))
+                print(f"\n✅ Season odds written to: {odds_file}")
+        
+        RUN_METRICS.status = 'ok'
         print("\n" + "=" * 60)
         print("ANALYSIS COMPLETE")
         print("=" * 60)
-        print("\n📄 Generated File: NBA_Weekly_Report.md")
+        print(f"\n📄 Generated File: {report_file}")
         print("   - Today's games with scores (if completed)")
         print("   - Upcoming games ranked by watchability")
         print("   - Top 5 matchups summary")
         print("   - Current power rankings")
+        print()
+        RUN_METRICS.print_summary()
         print("\n" + "=" * 60)
         
+        if live:
+            with RUN_METRICS.stage('live'):
+                live_refresh(games_df, rankings_df, output_file=report_file, formats=formats,
+                             days_ahead=days_ahead)
+        
     except Exception as e:
+        RUN_METRICS.status = 'failed'
+        RUN_METRICS.record_error(e, 'main')
         print(f"\n❌ Error occurred: {str(e)}")
         import traceback
         traceback.print_exc()
+    
+    finally:
+        metrics_file = RUN_METRICS.write(os.path.join(output_dir, RUN_METRICS_FILE))
+        print(f"\n✅ Run metrics written to: {metrics_file}")
+
+
+# Time spent importing this module; the heavy libraries load later, inside
+# whichever stage first needs them
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+RUN_METRICS.import_seconds = IMPORT_SECONDS
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="NBA matchup analysis")
+    parser.add_argument('--fetch-mode', choices=['schedule', 'concurrent', 'serial'], default='schedule',
+                        help="Where to get the games: the cached season schedule, or per-day "
+                             "scoreboards fetched concurrently or serially (the old fallback)")
+    parser.add_argument('--offline', action='store_true',
+                        help="Serve every NBA stats request from the local response cache")
+    parser.add_argument('--full-rebuild', action='store_true',
+                        help="Recompute the power rankings from the whole season instead of "
+                             "folding new games into the saved state")
+    parser.add_argument('--backfill', nargs='+', metavar='SEASON',
+                        help="Write daily ranking and matchup history for past seasons "
+                             "(e.g. 2023-24 2024-25) instead of the weekly report")
+    parser.add_argument('--rating', choices=list(RATING_COLUMNS), default='power',
+                        help="Score matchups from the power score, Elo or SRS ratings")
+    parser.add_argument('--simulate', type=int, default=0, metavar='N',
+                        help="Also simulate the rest of the season N times (e.g. 50000) and "
+                             "write playoff and seeding odds to NBA_Season_Odds.csv")
+    parser.add_argument('--profile', nargs='?', const='NBA_profile.prof', metavar='PATH',
+                        help="Capture a cProfile dump of the run (default: NBA_profile.prof)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Print what would be fetched and written, without network access")
+    parser.add_argument('--live', action='store_true',
+                        help="After the report, keep polling today's unfinished games and update "
+                             "their scores in the report until they are final")
+    parser.add_argument('--availability', action='store_true',
+                        help="Lower the ratings of teams missing rotation players, from bulk "
+                             "requests for the season's player game logs and rosters")
+    args = parser.parse_args()
+    
+    if args.dry_run:
+        dry_run(fetch_mode=args.fetch_mode, offline=args.offline, full_rebuild=args.full_rebuild,
+                n_sims=args.simulate, availability=args.availability)
+    elif args.backfill:
+        RESPONSE_CACHE.offline = args.offline
+        snapshots, matchups = backfill_rankings(args.backfill)
+        for path in write_backfill_files(snapshots, matchups, 'NBA'):
+            print(f"✅ History written to: {path}")
+    else:
+        with profiled(args.profile):
+            main(fetch_mode=args.fetch_mode, offline=args.offline, full_rebuild=args.full_rebuild,
+                 n_sims=args.simulate, rating_col=RATING_COLUMNS[args.rating],
+                 live=args.live, availability=args.availability)
\ No newline at end of file
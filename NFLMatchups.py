@@ -4,13 +4,154 @@ NFL Matchup Analysis Script - Optimized Version
 Analyzes NFL games for today and upcoming week with enhanced readability
 """
 
-import nfl_data_py as nfl
-import pandas as pd
+import time
+_IMPORT_START = time.perf_counter()
+
 from datetime import datetime, timedelta
-import numpy as np
+import os
 import warnings
 warnings.filterwarnings('ignore')
 
+# pandas, numpy and nfl_data_py are imported on first use, so --help and
+# --dry-run start instantly
+from lazy_imports import lazy_import
+nfl = lazy_import('nfl_data_py')
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+from backfill import backfill, write_backfill_files
+from elo import EloRatings, elo_to_power
+from frames import compact, concat
+from ranking_state import RankingState, read_watermark
+from matchup_matrix import DEFAULT_POWER, RATING_COLUMNS, get_matchup_matrix
+from report_writer import REPORT_FORMATS, report_paths, write_report_files
+from run_metrics import RunMetrics, profiled
+from season_sim import simulate_season, write_odds_file
+from srs import SRSRatings, srs_to_power
+from warehouse import Warehouse
+
+# Local state kept between runs
+CACHE_DIR = '.cache'
+RANKING_STATE_FILE = os.path.join(CACHE_DIR, 'nfl_ranking_state.json')
+SCHEDULE_MAX_AGE_HOURS = 6  # scores in the current season's schedule change on game days
+
+# Elo ratings, kept alongside the power score and carried across seasons
+ELO_STATE_FILE = os.path.join(CACHE_DIR, 'nfl_elo_state.json')
+ELO_PARAMS = {'k': 20, 'home_advantage': 48, 'regression': 1 / 3}
+
+# Strength-of-schedule adjusted (SRS) ratings and the games they are solved from
+SRS_STATE_FILE = os.path.join(CACHE_DIR, 'nfl_srs_state.json')
+
+# Blended rankings (blend=True): several seasons loaded together, each game
+# weighted by its age, so early-season rankings lean on last season and
+# hand over to this one gradually instead of switching all at once
+BLEND_SEASONS = 3
+BLEND_HALF_LIFE_DAYS = 120  # a game this old counts half as much as today's
+BLEND_SEASON_GAMES = 17     # weighted sums are rescaled to one regular season
+
+# Games, team-game lines and ranking snapshots from every run, see warehouse.py
+WAREHOUSE = Warehouse(os.path.join(CACHE_DIR, 'matchrank.sqlite'))
+
+_schedules = {}  # season -> schedule DataFrame, shared by every stage of a run
+
+# The schedule columns the scripts read, and how they are stored (see
+# frames.py); nfl_data_py's other ~40 columns are dropped on load
+SCHEDULE_DTYPES = {
+    'game_id': None,
+    'season': 'int16',
+    'game_type': 'category',
+    'week': 'int8',
+    'gameday': 'datetime',
+    'gametime': None,
+    'away_team': None,
+    'away_score': 'Int16',
+    'home_team': None,
+    'home_score': 'Int16',
+}
+SCHEDULE_TEAM_COLUMNS = ['away_team', 'home_team']
+
+# Per-stage timings, downloads and errors for the current run
+RUN_METRICS = RunMetrics('NFL')
+RUN_METRICS_FILE = 'NFL_run_metrics.json'
+
+# Season simulation: seven playoff seeds per conference. Seeds are assigned
+# by wins alone; division titles and tiebreakers are not modelled.
+NFL_CONFERENCES = {
+    'AFC': ['BAL', 'BUF', 'CIN', 'CLE', 'DEN', 'HOU', 'IND', 'JAX',
+            'KC', 'LAC', 'LV', 'MIA', 'NE', 'NYJ', 'PIT', 'TEN'],
+    'NFC': ['ARI', 'ATL', 'CAR', 'CHI', 'DAL', 'DET', 'GB', 'LA',
+            'MIN', 'NO', 'NYG', 'PHI', 'SEA', 'SF', 'TB', 'WAS'],
+}
+PLAYOFF_CUTOFFS = {'playoff_odds': 7}
+SIMULATION_WORKERS = 4
+
+
+def _schedule_file(season):
+    return os.path.join(CACHE_DIR, f"nfl_schedule_{season}.parquet")
+
+
+def _season_is_complete(season):
+    """A season's schedule stops changing once its Super Bowl (February) is played"""
+    now = datetime.now()
+    return season < now.year - 1 or (season == now.year - 1 and now.month >= 3)
+
+
+def _load_cached_schedule(season):
+    """Read a season's local Parquet copy if it exists and is still fresh"""
+    path = _schedule_file(season)
+    if not os.path.exists(path):
+        return None
+    
+    age_hours = (time.time() - os.path.getmtime(path)) / 3600
+    if age_hours >= SCHEDULE_MAX_AGE_HOURS and not _season_is_complete(season):
+        return None
+    
+    try:
+        schedule = pd.read_parquet(path, columns=list(SCHEDULE_DTYPES))
+        return compact(schedule, SCHEDULE_DTYPES, teams=SCHEDULE_TEAM_COLUMNS)
+    except Exception as e:
+        print(f"  Could not read {path}: {str(e)}")
+        RUN_METRICS.record_error(e, f"read {path}")
+        return None
+
+
+def load_schedules(seasons, refresh=False):
+    """
+    Return the schedules for the given seasons as one DataFrame
+    Each season is loaded at most once per process. Seasons that are not in
+    memory come from the local Parquet copy while it is fresh, and all
+    remaining seasons are downloaded together in one import_schedules call.
+    """
+    seasons = [int(season) for season in seasons]
+    
+    missing = [season for season in seasons if refresh or season not in _schedules]
+    to_download = []
+    for season in missing:
+        cached = None if refresh else _load_cached_schedule(season)
+        if cached is None:
+            to_download.append(season)
+        else:
+            _schedules[season] = cached
+            RUN_METRICS.record_request(cached=True)
+    
+    if to_download:
+        # nfl_data_py does not expose response sizes; count the call only
+        downloaded = compact(nfl.import_schedules(to_download), SCHEDULE_DTYPES, teams=SCHEDULE_TEAM_COLUMNS)
+        RUN_METRICS.record_request()
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        for season in to_download:
+            season_df = downloaded[downloaded['season'] == season].reset_index(drop=True)
+            _schedules[season] = season_df
+            try:
+                season_df.to_parquet(_schedule_file(season), index=False)
+            except Exception as e:  # no Parquet engine installed, read-only disk, ...
+                print(f"  Could not cache {season} schedule: {str(e)}")
+                RUN_METRICS.record_error(e, f"cache {season} schedule")
+    
+    schedules = concat([_schedules[season] for season in seasons], teams=SCHEDULE_TEAM_COLUMNS)
+    RUN_METRICS.record_frame('schedules', schedules)
+    return schedules
+
 
 def get_games_by_date_range(days_ahead=7):
     """
@@ -20,7 +161,7 @@ def get_games_by_date_range(days_ahead=7):
     print(f"Fetching NFL games for the next {days_ahead + 1} days...")
     
     current_year = datetime.now().year
-    schedules = nfl.import_schedules([current_year])
+    schedules = load_schedules([current_year])
     
     # Filter for games in date range
     today = datetime.now().date()
@@ -48,6 +189,10 @@ def get_games_by_date_range(days_ahead=7):
         'away_score', 'home_score', 'week'
     ]].copy()
     
+    # A week of games is small: back to plain dtypes for the report
+    games_df = games_df.astype({'away_team': str, 'home_team': str,
+                                'away_score': 'float64', 'home_score': 'float64'})
+    
     # Add is_today flag
     games_df['is_today'] = games_df['gameday'].dt.date == today
     
@@ -58,141 +203,292 @@ def get_games_by_date_range(days_ahead=7):
     return games_df
 
 
-def calculate_power_rankings():
-    """Calculate team power rankings using modified Pythagorean expectation"""
+def _completed_games(schedules):
+    """Games with a final score, scores widened from Int16 for arithmetic"""
+    completed = schedules[schedules['home_score'].notna()]
+    return completed.astype({'away_score': 'float64', 'home_score': 'float64'})
+
+
+def build_team_games(schedules):
+    """
+    Reshape a schedule into a long team-game table
+    One row per team per game, seen from that team's side: points for,
+    points against and a win flag. Ties count as non-wins.
+    """
+    shared = ['game_id', 'season', 'week', 'gameday']
+    shared = [col for col in shared if col in schedules.columns]
+    
+    home = schedules[shared].assign(
+        team=schedules['home_team'],
+        opponent=schedules['away_team'],
+        is_home=True,
+        points_for=schedules['home_score'],
+        points_against=schedules['away_score'],
+    )
+    away = schedules[shared].assign(
+        team=schedules['away_team'],
+        opponent=schedules['home_team'],
+        is_home=False,
+        points_for=schedules['away_score'],
+        points_against=schedules['home_score'],
+    )
+    
+    team_games = pd.concat([home, away], ignore_index=True)
+    team_games['win'] = team_games['points_for'] > team_games['points_against']
+    return team_games
+
+
+def _team_game_lines(team_games):
+    """Add the running-sum columns RankingState folds in to a team-game table"""
+    # Ties count as losses, as in the original win/loss split
+    return team_games.assign(
+        game_date=pd.to_datetime(team_games['gameday']).dt.strftime('%Y-%m-%d'),
+        games=1,
+        wins=team_games['win'].astype(int),
+        losses=(~team_games['win']).astype(int),
+        plus_minus=team_games['points_for'] - team_games['points_against'],
+    )
+
+
+def score_team_totals(totals):
+    """
+    Compute power score columns from per-team running sums
+    Works on any index, e.g. one row per team or one per (date, team)
+    """
+    scores = pd.DataFrame(index=totals.index)
+    scores['games_played'] = totals['games'].astype(int)
+    scores['wins'] = totals['wins'].astype(int)
+    scores['losses'] = scores['games_played'] - scores['wins']
+    
+    points_scored = totals['points_for']
+    points_allowed = totals['points_against']
+    games_played = scores['games_played']
+    
+    # Win percentage (from the unrounded sums, which may be weighted)
+    scores['win_pct'] = (totals['wins'] / games_played).where(games_played > 0, 0)
+    scores['points_scored'] = points_scored
+    scores['points_allowed'] = points_allowed
+    
+    # Point differential
+    scores['point_diff'] = points_scored - points_allowed
+    
+    # Modified Pythagorean Expectation (exponent = 2.37 for NFL)
+    scores['pyth_expectation'] = np.where(
+        points_allowed > 0,
+        points_scored ** 2.37 / (points_scored ** 2.37 + points_allowed ** 2.37),
+        1.0
+    )
+    
+    # Combined ranking score (weighted average)
+    # 40% Pythagorean, 30% Win%, 30% Point Differential (normalized)
+    max_point_diff = 300  # Normalization factor
+    norm_point_diff = ((scores['point_diff'] + max_point_diff) / (2 * max_point_diff)).clip(0, 1)
+    
+    scores['power_score'] = (
+        0.40 * scores['pyth_expectation'] + 
+        0.30 * scores['win_pct'] + 
+        0.30 * norm_point_diff
+    ) * 100
+    
+    return scores
+
+
+def _rank_teams(totals):
+    """Compute power scores from per-team running sums and rank the teams"""
+    # RankingState keeps teams in order of first appearance, as before
+    rankings_df = score_team_totals(totals).rename_axis('team').reset_index()
+    
+    # Sort by power score
+    rankings_df = rankings_df.sort_values('power_score', ascending=False).reset_index(drop=True)
+    rankings_df['rank'] = range(1, len(rankings_df) + 1)
+    return rankings_df
+
+
+def blended_team_totals(team_games, as_of, half_life_days=BLEND_HALF_LIFE_DAYS):
+    """
+    Per-team sums over several seasons with each game weighted by recency
+    A game played `half_life_days` before `as_of` counts half as much as one
+    played on `as_of`. The weighted sums are rescaled to BLEND_SEASON_GAMES
+    games per team, so score_team_totals() reads them on its usual scale.
+    """
+    age_days = (pd.Timestamp(as_of) - pd.to_datetime(team_games['gameday'])).dt.days.clip(lower=0)
+    weight = np.exp2(-age_days.to_numpy() / half_life_days)
+    
+    weighted = pd.DataFrame({
+        'weight': weight,
+        'wins': weight * team_games['win'].to_numpy(),
+        'points_for': weight * team_games['points_for'].to_numpy(),
+        'points_against': weight * team_games['points_against'].to_numpy(),
+    }, index=team_games.index)
+    sums = weighted.groupby(team_games['team'], sort=False, observed=True).sum()
+    
+    totals = sums[['wins', 'points_for', 'points_against']].mul(BLEND_SEASON_GAMES / sums['weight'], axis=0)
+    totals.insert(0, 'games', BLEND_SEASON_GAMES)
+    totals.index = totals.index.astype(str).rename('team')
+    return totals
+
+
+def _blend_rankings(rankings_df, schedules, as_of):
+    """
+    Re-rank every team of the latest season in `schedules` on power scores
+    from all of its seasons, decayed by age
+    The record columns stay those of the season being ranked (zero for
+    teams that have not played yet); only power_score and rank change
+    """
+    totals = blended_team_totals(build_team_games(_completed_games(schedules)), as_of)
+    blended = score_team_totals(totals)['power_score']
+    
+    latest = schedules[schedules['season'] == schedules['season'].max()]
+    teams = pd.unique(pd.concat([latest['home_team'], latest['away_team']]).astype(str))
+    
+    record = {'games_played': int, 'wins': int, 'losses': int,
+              'points_scored': float, 'points_allowed': float, 'point_diff': float}
+    rankings_df = rankings_df.set_index('team').reindex(teams)
+    rankings_df[list(record)] = rankings_df[list(record)].fillna(0).astype(record)
+    rankings_df['win_pct'] = rankings_df['win_pct'].fillna(0)
+    rankings_df['power_score'] = blended.reindex(teams).fillna(DEFAULT_POWER)
+    
+    rankings_df = rankings_df.rename_axis('team').reset_index()
+    rankings_df = rankings_df.sort_values('power_score', ascending=False).reset_index(drop=True)
+    rankings_df['rank'] = range(1, len(rankings_df) + 1)
+    return rankings_df
+
+
+def _store(description, write):
+    """Run a warehouse write; failures are reported but never fail the run"""
+    try:
+        return write()
+    except Exception as e:
+        print(f"  Could not store {description}: {str(e)}")
+        RUN_METRICS.record_error(e, f"warehouse {description}")
+        return 0
+
+
+def calculate_power_rankings(full_rebuild=False, blend=False):
+    """
+    Calculate team power rankings using modified Pythagorean expectation
+    Only games after the saved state's watermark are folded in;
+    full_rebuild=True recomputes the state from the whole season.
+    blend=True ranks on the last BLEND_SEASONS seasons, weighting each game
+    by its age (see blended_team_totals); the records shown stay this season's
+    """
     print("\nCalculating team power rankings...")
     
     current_year = datetime.now().year
-    schedules = nfl.import_schedules([current_year])
+    season = current_year
+    if blend:
+        # One import_schedules call covers every season not cached yet
+        blend_schedules = load_schedules(range(current_year - BLEND_SEASONS + 1, current_year + 1))
+        schedules = blend_schedules[blend_schedules['season'] == current_year]
+    else:
+        schedules = load_schedules([current_year])
     
     # Filter for completed games only
-    completed = schedules[schedules['home_score'].notna()].copy()
+    completed = _completed_games(schedules)
     
-    if len(completed) == 0:
+    # Blended power already leans on earlier seasons, so before week 1 the
+    # records stay this season's 0-0 rather than last season's
+    if len(completed) == 0 and not blend:
         print("\nWarning: No completed games found. Using previous season data.")
-        schedules = nfl.import_schedules([current_year - 1])
-        completed = schedules[schedules['home_score'].notna()].copy()
-    
-    print(f"Analyzing {len(completed)} completed games from {current_year} season")
-    
-    # Get all unique teams
-    teams = pd.concat([completed['home_team'], completed['away_team']]).unique()
+        season = current_year - 1
+        schedules = load_schedules([season])
+        completed = _completed_games(schedules)
     
-    # Calculate statistics for each team
-    team_stats = {}
+    print(f"Analyzing {len(completed)} completed games from {season} season")
     
-    for team in teams:
-        # Home and away games
-        home_games = completed[completed['home_team'] == team]
-        away_games = completed[completed['away_team'] == team]
-        
-        # Points scored and allowed
-        points_scored = (
-            home_games['home_score'].sum() + 
-            away_games['away_score'].sum()
-        )
-        points_allowed = (
-            home_games['away_score'].sum() + 
-            away_games['home_score'].sum()
-        )
-        
-        # Wins and losses
-        home_wins = (home_games['home_score'] > home_games['away_score']).sum()
-        away_wins = (away_games['away_score'] > away_games['home_score']).sum()
-        wins = home_wins + away_wins
-        
-        games_played = len(home_games) + len(away_games)
-        losses = games_played - wins
-        
-        # Modified Pythagorean Expectation (exponent = 2.37 for NFL)
-        if points_allowed > 0:
-            pyth_exp = (points_scored ** 2.37) / (
-                points_scored ** 2.37 + points_allowed ** 2.37
-            )
-        else:
-            pyth_exp = 1.0
-        
-        # Point differential
-        point_diff = points_scored - points_allowed
-        
-        # Win percentage
-        win_pct = wins / games_played if games_played > 0 else 0
-        
-        # Combined ranking score (weighted average)
-        # 40% Pythagorean, 30% Win%, 30% Point Differential (normalized)
-        max_point_diff = 300  # Normalization factor
-        norm_point_diff = max(0, min(1, (point_diff + max_point_diff) / (2 * max_point_diff)))
-        
-        power_score = (
-            0.40 * pyth_exp + 
-            0.30 * win_pct + 
-            0.30 * norm_point_diff
-        ) * 100
-        
-        team_stats[team] = {
-            'team': team,
-            'games_played': games_played,
-            'wins': wins,
-            'losses': losses,
-            'win_pct': win_pct,
-            'points_scored': points_scored,
-            'points_allowed': points_allowed,
-            'point_diff': point_diff,
-            'pyth_expectation': pyth_exp,
-            'power_score': power_score
-        }
-    
-    # Create DataFrame and sort by power score
-    rankings_df = pd.DataFrame(team_stats.values())
-    rankings_df = rankings_df.sort_values('power_score', ascending=False).reset_index(drop=True)
-    rankings_df['rank'] = range(1, len(rankings_df) + 1)
+    if full_rebuild:
+        state = RankingState(season)
+        elo = EloRatings(season, **ELO_PARAMS)
+        srs = SRSRatings(season)
+    else:
+        state = RankingState.load(RANKING_STATE_FILE, season)
+        elo = EloRatings.load(ELO_STATE_FILE, season, **ELO_PARAMS)
+        srs = SRSRatings.load(SRS_STATE_FILE, season)
+    
+    # Elo applies every completed game past its own watermark, SRS every
+    # game it has not seen
+    results = completed.assign(game_date=pd.to_datetime(completed['gameday']).dt.strftime('%Y-%m-%d'))
+    elo.update(results)
+    elo.save(ELO_STATE_FILE)
+    
+    srs.update(results)
+    srs.solve()
+    srs.save(SRS_STATE_FILE)
+    print(f"SRS solved in {srs.iterations} iterations (home advantage {srs.home_advantage:+.1f})")
+    
+    # The schedule always arrives whole, but only lines past the watermark
+    # are reshaped and aggregated
+    if state.last_date is not None:
+        completed = completed[pd.to_datetime(completed['gameday']) >= pd.Timestamp(state.last_date)]
+    
+    lines = _team_game_lines(build_team_games(completed))
+    new_games = state.fold(lines)
+    state.save(RANKING_STATE_FILE)
+    print(f"Folded in {new_games} new games (through {state.last_date})")
+    
+    rankings_df = _rank_teams(state.totals())
+    if blend:
+        rankings_df = _blend_rankings(rankings_df, blend_schedules, datetime.now())
+        print(f"Blended {BLEND_SEASONS} seasons (half-life {BLEND_HALF_LIFE_DAYS} days)")
+    rankings_df['elo'] = rankings_df['team'].map(elo.to_series())
+    rankings_df['elo_power'] = elo_to_power(rankings_df['elo'])
+    rankings_df['srs'] = rankings_df['team'].map(srs.to_series())
+    rankings_df['srs_power'] = srs_to_power(rankings_df['srs'])
+    
+    _store('team games', lambda: WAREHOUSE.upsert_team_games('NFL', season, lines))
+    _store('rankings', lambda: WAREHOUSE.upsert_rankings('NFL', season, state.last_date, rankings_df))
     
     print(f"Power rankings calculated for {len(rankings_df)} teams")
     return rankings_df
 
 
-def analyze_matchups(games_df, rankings_df):
+def backfill_rankings(seasons, max_workers=None):
+    """
+    Point-in-time power rankings after every game day of the given seasons,
+    plus each game's matchup score as it would have been rated beforehand
+    All seasons come from one schedule load; the snapshots are computed in
+    parallel worker processes.
+    """
+    print(f"\nBackfilling rankings for {len(seasons)} season(s)...")
+    
+    schedules = load_schedules(seasons)
+    completed = _completed_games(schedules)
+    
+    season_inputs = {}
+    for season, season_games in completed.groupby('season'):
+        games = season_games[['game_id', 'gameday', 'away_team', 'home_team']].rename(columns={'gameday': 'game_date'})
+        season_inputs[season] = (_team_game_lines(build_team_games(season_games)), games)
+    
+    snapshots, matchups = backfill(season_inputs, score_team_totals, max_workers)
+    print(f"Computed {snapshots['as_of'].nunique()} game-day snapshots and {len(matchups)} matchups")
+    return snapshots, matchups
+
+
+def analyze_matchups(games_df, rankings_df, rating_col='power_score'):
     """
     Analyze each game and determine watchability
+    rating_col picks the team rating to score with: 'power_score', or
+    'elo_power' / 'srs_power' for Elo or SRS ratings mapped onto the same scale
     Returns games_df with added analysis columns
     """
     if rankings_df.empty or games_df.empty:
         return games_df
     
-    # Create lookup dictionaries
-    rank_dict = rankings_df.set_index('team')['power_score'].to_dict()
+    # Every pairing is precomputed once per ranking update; each game is a lookup
+    matrix = get_matchup_matrix(rankings_df, rating_col=rating_col)
+    scores = matrix.lookup(games_df['away_team'], games_df['home_team'])
     team_rank_dict = rankings_df.set_index('team')['rank'].to_dict()
     
     # Add analysis for each game
-    games_df['away_power'] = games_df['away_team'].map(rank_dict).fillna(50)
-    games_df['home_power'] = games_df['home_team'].map(rank_dict).fillna(50)
+    games_df['away_power'] = scores['away_power'].to_numpy()
+    games_df['home_power'] = scores['home_power'].to_numpy()
     games_df['away_rank'] = games_df['away_team'].map(team_rank_dict).fillna(16)
     games_df['home_rank'] = games_df['home_team'].map(team_rank_dict).fillna(16)
     
-    # Calculate matchup quality scores
-    games_df['quality_score'] = (games_df['away_power'] + games_df['home_power']) / 2
-    
-    # IMPROVED: Calculate competitiveness with exponential decay
-    # Better spread across 0-100 range compared to linear formula
-    score_diff = abs(games_df['away_power'] - games_df['home_power'])
-    games_df['competitive_score'] = 100 * np.exp(-score_diff / 15)
-    
-    # Overall matchup score: 60% quality, 40% competitiveness
-    games_df['matchup_score'] = (0.60 * games_df['quality_score'] + 
-                                   0.40 * games_df['competitive_score'])
-    
-    # Determine watchability tier
-    def get_tier(score):
-        if score >= 70:
-            return "🔥 MUST WATCH"
-        elif score >= 60:
-            return "⭐ HIGHLY RECOMMENDED"
-        elif score >= 50:
-            return "👍 WORTH WATCHING"
-        else:
-            return "📺 Optional"
-    
-    games_df['tier'] = games_df['matchup_score'].apply(get_tier)
+    # Quality (average power), competitiveness (100 * e^(-diff/15)),
+    # overall matchup score (60/40 blend) and watchability tier
+    for column in ['quality_score', 'competitive_score', 'matchup_score', 'tier']:
+        games_df[column] = scores[column].to_numpy()
     
     # Sort by matchup score
     games_df = games_df.sort_values(['gameday', 'matchup_score'], 
@@ -201,167 +497,277 @@ def analyze_matchups(games_df, rankings_df):
     return games_df
 
 
-def format_game_markdown(row, rank_num=None, total_games=None):
-    """Format a single game as markdown"""
-    lines = []
+def simulate_remaining_season(rankings_df, n_sims=50000, max_workers=SIMULATION_WORKERS):
+    """
+    Playoff and seeding odds from simulating the rest of the regular season
+    with the current power scores
+    Current wins and remaining games both come from this season's schedule,
+    so early-season runs ranked on last season's data start everyone at 0
+    """
+    print(f"\nSimulating the rest of the season {n_sims:,} times...")
+    sim_start = time.perf_counter()
+    
+    schedules = load_schedules([datetime.now().year])
+    regular = schedules[schedules['game_type'] == 'REG']
+    remaining = regular[regular['home_score'].isna()]
+    
+    nfl_teams = [team for members in NFL_CONFERENCES.values() for team in members]
+    team_games = build_team_games(_completed_games(regular))
+    current_wins = team_games.groupby('team', observed=True)['win'].sum().reindex(nfl_teams, fill_value=0)
+    power = rankings_df.set_index('team')['power_score'].to_dict()
+    
+    odds_df, win_distribution = simulate_season(
+        nfl_teams, current_wins.to_numpy(), remaining, power, NFL_CONFERENCES,
+        PLAYOFF_CUTOFFS, n_sims=n_sims, max_workers=max_workers,
+    )
+    print(f"⏱️  Simulated {len(remaining)} remaining games in {time.perf_counter() - sim_start:.1f}s")
+    return odds_df, win_distribution
+
+
+def format_games_markdown(games, numbered=False):
+    """
+    Format every game in `games` as a markdown block, column-wise
+    numbered=True prefixes each header with its position, e.g. "#3/16"
+    Returns a Series of blocks aligned with `games`
+    """
+    away = games['away_team'].astype(str)
+    home = games['home_team'].astype(str)
+    game_time = games['gametime'].fillna('TBD').astype(str)
     
     # Header with tier and matchup
-    if rank_num and total_games:
-        lines.append(f"### #{rank_num}/{total_games} - {row['tier']}")
+    if numbered:
+        position = pd.Series(np.arange(1, len(games) + 1), index=games.index).astype(str)
+        header = "### #" + position + f"/{len(games)} - " + games['tier']
     else:
-        lines.append(f"### {row['tier']}")
+        header = "### " + games['tier']
     
-    # Game matchup - check for completed games
-    has_scores = (pd.notna(row['away_score']) and pd.notna(row['home_score']))
-    
-    game_time = row['gametime'] if pd.notna(row['gametime']) else 'TBD'
-    
-    if has_scores:
-        # Completed game with scores
-        lines.append(f"**{row['away_team']} {int(row['away_score'])} @ "
-                    f"{row['home_team']} {int(row['home_score'])}** - Final")
-    else:
-        # Upcoming game
-        lines.append(f"**{row['away_team']} @ {row['home_team']}** - {game_time}")
+    # Completed games show their scores, upcoming games their kickoff time
+    has_scores = games['away_score'].notna() & games['home_score'].notna()
+    away_score = games['away_score'].fillna(0).astype(int).astype(str)
+    home_score = games['home_score'].fillna(0).astype(int).astype(str)
+    matchup = ("**" + away + " " + away_score + " @ " + home + " " + home_score + "** - Final").where(
+        has_scores, "**" + away + " @ " + home + "** - " + game_time)
     
     # Week and rankings
-    lines.append(f"- **Week {int(row['week'])}**")
-    lines.append(f"- **Team Rankings:** #{int(row['away_rank'])} {row['away_team']} vs "
-                f"#{int(row['home_rank'])} {row['home_team']}")
-    lines.append(f"- **Matchup Score:** {row['matchup_score']:.1f}/100 "
-                f"(Quality: {row['quality_score']:.1f}, Competitive: {row['competitive_score']:.1f})")
-    
-    return "\n".join(lines)
+    week = "- **Week " + games['week'].astype(int).astype(str) + "**"
+    rankings = ("- **Team Rankings:** #" + games['away_rank'].astype(int).astype(str) + " " + away +
+                " vs #" + games['home_rank'].astype(int).astype(str) + " " + home)
+    scores = ("- **Matchup Score:** " + games['matchup_score'].map('{:.1f}'.format) +
+              "/100 (Quality: " + games['quality_score'].map('{:.1f}'.format) +
+              ", Competitive: " + games['competitive_score'].map('{:.1f}'.format) + ")")
+    
+    return header + "\n" + matchup + "\n" + week + "\n" + rankings + "\n" + scores
 
 
-def write_markdown_report(games_df, rankings_df, output_file='NFL_Weekly_Report.md'):
-    """Write comprehensive markdown report"""
-    
-    today = datetime.now()
+def format_game_markdown(row, rank_num=None, total_games=None):
+    """Format a single game as markdown"""
+    block = format_games_markdown(pd.DataFrame([row])).iloc[0]
+    if rank_num and total_games:
+        block = block.replace("### ", f"### #{rank_num}/{total_games} - ", 1)
+    return block
+
+
+def render_markdown_report(games_df, rankings_df, today=None, days_ahead=7):
+    """
+    Render the full markdown report in memory
+    Each section is built from whole columns and joined once at the end;
+    the coverage lines describe today plus `days_ahead` days
+    """
+    today = today or datetime.now()
     current_year = today.year
     
     # Separate today's games from upcoming
     todays_games = games_df[games_df['is_today'] == True]
     upcoming_games = games_df[games_df['is_today'] == False]
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        # Header
-        f.write(f"# 🏈 NFL Weekly Matchup Report\n\n")
-        f.write(f"**Season:** {current_year}  \n")
-        f.write(f"**Generated:** {today.strftime('%A, %B %d, %Y at %I:%M %p')}  \n")
-        f.write(f"**Coverage:** Next 7 days\n\n")
-        
-        f.write("---\n\n")
-        
-        # TODAY'S GAMES SECTION
-        f.write(f"## 📅 TODAY'S GAMES - {today.strftime('%A, %B %d')}\n\n")
-        
-        if len(todays_games) == 0:
-            f.write("*No games scheduled for today.*\n\n")
-        else:
-            f.write(f"**{len(todays_games)} game(s) today**\n\n")
-            
-            for idx, game in todays_games.iterrows():
-                f.write(format_game_markdown(game))
-                f.write("\n\n")
-        
-        f.write("---\n\n")
-        
-        # UPCOMING GAMES SECTION
-        f.write("## 📆 UPCOMING GAMES (Next 7 Days)\n\n")
-        
-        if len(upcoming_games) == 0:
-            f.write("*No upcoming games found in the next 7 days.*\n\n")
-        else:
-            # Group by date
-            current_date = None
-            rank_counter = 1
-            total_upcoming = len(upcoming_games)
-            
-            for idx, game in upcoming_games.iterrows():
-                game_date = game['gameday'].date()
-                
-                # New date header
-                if current_date != game_date:
-                    current_date = game_date
-                    f.write(f"\n### 🗓️ {game['gameday'].strftime('%A, %B %d, %Y')}\n\n")
-                
-                f.write(format_game_markdown(game, rank_counter, total_upcoming))
-                f.write("\n\n")
-                rank_counter += 1
-        
-        f.write("---\n\n")
-        
-        # TOP MATCHUPS SUMMARY
-        f.write("## 🌟 Top 5 Matchups This Week\n\n")
-        top_5 = games_df.nlargest(5, 'matchup_score')
-        
-        for i, (idx, game) in enumerate(top_5.iterrows(), 1):
-            date_str = game['gameday'].strftime('%a %m/%d')
-            game_time = game['gametime'] if pd.notna(game['gametime']) else 'TBD'
-            f.write(f"{i}. **{game['away_team']} @ {game['home_team']}** "
-                   f"({date_str} {game_time}) - Score: {game['matchup_score']:.1f}/100\n")
-        
-        f.write("\n---\n\n")
-        
-        # POWER RANKINGS
-        f.write("## 📊 Current Power Rankings (Top 10)\n\n")
-        f.write("| Rank | Team | Power Score | Record | Pt Diff |\n")
-        f.write("|------|------|-------------|--------|----------|\n")
-        
-        for idx, team in rankings_df.head(10).iterrows():
-            f.write(f"| {int(team['rank'])} | {team['team']} | "
-                   f"{team['power_score']:.1f} | "
-                   f"{int(team['wins'])}-{int(team['losses'])} | "
-                   f"{team['point_diff']:+.0f} |\n")
-        
-        f.write("\n---\n\n")
-        
-        # Methodology
-        f.write("## 📈 Methodology\n\n")
-        f.write("### Power Rankings\n")
-        f.write("- **Modified Pythagorean Expectation:** 40% (exponent 2.37 for NFL)\n")
-        f.write("- **Win Percentage:** 30%\n")
-        f.write("- **Point Differential:** 30% (normalized)\n\n")
-        
-        f.write("### Matchup Scores\n")
-        f.write("- **Quality Score:** Average power rating of both teams (0-100)\n")
-        f.write("  - Higher scores indicate stronger teams overall\n")
-        f.write("  - Typical range: 30-70 based on current team strengths\n\n")
-        f.write("- **Competitive Score:** How evenly matched teams are (0-100)\n")
-        f.write("  - Calculated using exponential decay: 100 × e^(-difference/15)\n")
-        f.write("  - Perfect matchup (0 point difference) = 100\n")
-        f.write("  - 10 point difference ≈ 51 (close game)\n")
-        f.write("  - 20 point difference ≈ 26 (moderate mismatch)\n")
-        f.write("  - 30+ point difference ≈ <15 (blowout likely)\n\n")
-        f.write("- **Overall Matchup Score:** 60% quality + 40% competitiveness\n")
-        f.write("  - Balances team strength with game competitiveness\n")
-        f.write("  - Best games: strong teams that are evenly matched\n\n")
-        
-        f.write("### Watchability Tiers\n")
-        f.write("- 🔥 **MUST WATCH** (70+): Elite matchups between top teams\n")
-        f.write("- ⭐ **HIGHLY RECOMMENDED** (60-69): High-quality, competitive games\n")
-        f.write("- 👍 **WORTH WATCHING** (50-59): Solid matchups\n")
-        f.write("- 📺 **Optional** (<50): Lower-tier or lopsided games\n")
+    parts = []
+    
+    # Header
+    parts.append(f"# 🏈 NFL Weekly Matchup Report\n\n")
+    parts.append(f"**Season:** {current_year}  \n")
+    parts.append(f"**Generated:** {today.strftime('%A, %B %d, %Y at %I:%M %p')}  \n")
+    parts.append(f"**Coverage:** Next {days_ahead} days\n\n")
+    
+    parts.append("---\n\n")
+    
+    # TODAY'S GAMES SECTION
+    parts.append(f"## 📅 TODAY'S GAMES - {today.strftime('%A, %B %d')}\n\n")
+    
+    if len(todays_games) == 0:
+        parts.append("*No games scheduled for today.*\n\n")
+    else:
+        parts.append(f"**{len(todays_games)} game(s) today**\n\n")
+        parts.append("".join(format_games_markdown(todays_games) + "\n\n"))
+    
+    parts.append("---\n\n")
+    
+    # UPCOMING GAMES SECTION
+    parts.append(f"## 📆 UPCOMING GAMES (Next {days_ahead} Days)\n\n")
+    
+    if len(upcoming_games) == 0:
+        parts.append(f"*No upcoming games found in the next {days_ahead} days.*\n\n")
+    else:
+        # Date header before the first game of each day
+        game_dates = upcoming_games['gameday'].dt.normalize()
+        new_date = game_dates.ne(game_dates.shift())
+        date_headers = ("\n### 🗓️ " + upcoming_games['gameday'].dt.strftime('%A, %B %d, %Y') + "\n\n").where(new_date, "")
+        blocks = format_games_markdown(upcoming_games, numbered=True)
+        parts.append("".join(date_headers + blocks + "\n\n"))
+    
+    parts.append("---\n\n")
+    
+    # TOP MATCHUPS SUMMARY
+    parts.append("## 🌟 Top 5 Matchups This Week\n\n")
+    top_5 = games_df.nlargest(5, 'matchup_score')
+    
+    if len(top_5) > 0:
+        position = pd.Series(np.arange(1, len(top_5) + 1), index=top_5.index).astype(str)
+        parts.append("".join(
+            position + ". **" + top_5['away_team'] + " @ " + top_5['home_team'] + "** (" +
+            top_5['gameday'].dt.strftime('%a %m/%d') + " " + top_5['gametime'].fillna('TBD').astype(str) +
+            ") - Score: " + top_5['matchup_score'].map('{:.1f}'.format) + "/100\n"
+        ))
+    
+    parts.append("\n---\n\n")
+    
+    # POWER RANKINGS
+    parts.append("## 📊 Current Power Rankings (Top 10)\n\n")
+    parts.append("| Rank | Team | Power Score | Record | Pt Diff |\n")
+    parts.append("|------|------|-------------|--------|----------|\n")
+    
+    top_10 = rankings_df.head(10)
+    if len(top_10) > 0:
+        parts.append("".join(
+            "| " + top_10['rank'].astype(int).astype(str) + " | " + top_10['team'] + " | " +
+            top_10['power_score'].map('{:.1f}'.format) + " | " +
+            top_10['wins'].astype(int).astype(str) + "-" + top_10['losses'].astype(int).astype(str) + " | " +
+            top_10['point_diff'].map('{:+.0f}'.format) + " |\n"
+        ))
+    
+    parts.append("\n---\n\n")
+    
+    # Methodology
+    parts.append(METHODOLOGY_MARKDOWN)
+    
+    return "".join(parts)
+
+
+METHODOLOGY_MARKDOWN = (
+    "## 📈 Methodology\n\n"
+    "### Power Rankings\n"
+    "- **Modified Pythagorean Expectation:** 40% (exponent 2.37 for NFL)\n"
+    "- **Win Percentage:** 30%\n"
+    "- **Point Differential:** 30% (normalized)\n\n"
+    
+    "### Matchup Scores\n"
+    "- **Quality Score:** Average power rating of both teams (0-100)\n"
+    "  - Higher scores indicate stronger teams overall\n"
+    "  - Typical range: 30-70 based on current team strengths\n\n"
+    "- **Competitive Score:** How evenly matched teams are (0-100)\n"
+    "  - Calculated using exponential decay: 100 × e^(-difference/15)\n"
+    "  - Perfect matchup (0 point difference) = 100\n"
+    "  - 10 point difference ≈ 51 (close game)\n"
+    "  - 20 point difference ≈ 26 (moderate mismatch)\n"
+    "  - 30+ point difference ≈ <15 (blowout likely)\n\n"
+    "- **Overall Matchup Score:** 60% quality + 40% competitiveness\n"
+    "  - Balances team strength with game competitiveness\n"
+    "  - Best games: strong teams that are evenly matched\n\n"
+    
+    "### Watchability Tiers\n"
+    "- 🔥 **MUST WATCH** (70+): Elite matchups between top teams\n"
+    "- ⭐ **HIGHLY RECOMMENDED** (60-69): High-quality, competitive games\n"
+    "- 👍 **WORTH WATCHING** (50-59): Solid matchups\n"
+    "- 📺 **Optional** (<50): Lower-tier or lopsided games\n"
+)
+
+
+def write_markdown_report(games_df, rankings_df, output_file='NFL_Weekly_Report.md', formats=REPORT_FORMATS,
+                          days_ahead=7):
+    """
+    Write comprehensive markdown report
+    The report is rendered in memory and swapped into place atomically,
+    alongside JSON and CSV copies of the games and rankings
+    """
+    today = datetime.now()
+    markdown = render_markdown_report(games_df, rankings_df, today, days_ahead)
+    metadata = {
+        'league': 'NFL',
+        'season': today.year,
+        'generated': today.isoformat(timespec='seconds'),
+    }
+    
+    for path in write_report_files(output_file, markdown, games_df, rankings_df, metadata, formats):
+        print(f"\n✅ Report written to: {path}")
+
+
+def dry_run(full_rebuild=False, n_sims=0, days_ahead=7, output_dir='.',
+            formats=REPORT_FORMATS, blend=False):
+    """
+    Print what a run would download, recompute and write, then stop
+    Only reads local state files: no network, and pandas and nfl_data_py
+    are never imported
+    """
+    today = datetime.now()
+    season = today.year
     
-    print(f"\n✅ Report written to: {output_file}")
+    print(f"NFL dry run ({IMPORT_SECONDS:.2f}s startup)")
+    print(f"  Season:         {season}")
+    print(f"  Games:          {today:%Y-%m-%d} to {today + timedelta(days=days_ahead):%Y-%m-%d}")
+    
+    path = _schedule_file(season)
+    if os.path.exists(path):
+        age_hours = (time.time() - os.path.getmtime(path)) / 3600
+        fresh = age_hours < SCHEDULE_MAX_AGE_HOURS or _season_is_complete(season)
+        print(f"  Schedule cache: {path}, {age_hours:.1f}h old ({'reused' if fresh else 'refreshed'})")
+    else:
+        print("  Schedule cache: none, would download")
+    
+    if blend:
+        past = [past_season for past_season in range(season - BLEND_SEASONS + 1, season)
+                if not os.path.exists(_schedule_file(past_season))]
+        plan = f"seasons {season - BLEND_SEASONS + 1}-{season}, half-life {BLEND_HALF_LIFE_DAYS} days"
+        print(f"  Blend:          {plan}" + (f", would download {past}" if past else ""))
+    
+    for label, state_file in [('Rankings', RANKING_STATE_FILE), ('Elo', ELO_STATE_FILE), ('SRS', SRS_STATE_FILE)]:
+        watermark = None if full_rebuild else read_watermark(state_file, season)
+        plan = f"games after {watermark}" if watermark else "whole season"
+        print(f"  {label + ':':<15} {plan}")
+    
+    outputs = report_paths(os.path.join(output_dir, 'NFL_Weekly_Report.md'), formats)
+    outputs.append(os.path.join(output_dir, RUN_METRICS_FILE))
+    if n_sims:
+        outputs.append(f"{os.path.join(output_dir, 'NFL_Season_Odds.csv')} ({n_sims:,} simulations)")
+    print(f"  Outputs:        {', '.join(outputs)}")
 
 
-def main():
-    """Main execution function"""
+def main(full_rebuild=False, n_sims=0, rating_col='power_score',
+         days_ahead=7, output_dir='.', formats=REPORT_FORMATS, blend=False):
+    """
+    Main execution function
+    Each stage is timed and its downloads and errors are counted; the run
+    summary is written to NFL_run_metrics.json even when the run fails.
+    The report covers today plus `days_ahead` days and is written to
+    `output_dir` in each of `formats`. blend=True ranks on several seasons
+    weighted by recency (see calculate_power_rankings)
+    """
+    RUN_METRICS.reset()
+    report_file = os.path.join(output_dir, 'NFL_Weekly_Report.md')
+    
     print("\n" + "=" * 60)
     print("NFL MATCHUP ANALYSIS - OPTIMIZED VERSION")
     print("=" * 60 + "\n")
     
     try:
         # Step 1: Get games
-        games_df = get_games_by_date_range(days_ahead=7)
+        with RUN_METRICS.stage('fetch'):
+            games_df = get_games_by_date_range(days_ahead=days_ahead)
         
         if games_df.empty:
+            RUN_METRICS.status = 'no_games'
             print("\n" + "=" * 60)
             print("NO GAMES FOUND")
             print("=" * 60)
-            print("\nNo NFL games scheduled in the next 7 days.")
+            print(f"\nNo NFL games scheduled in the next {days_ahead} days.")
             print("This is likely due to:")
             print("  - NFL offseason (February - August)")
             print("  - Bye week for all teams")
@@ -371,33 +777,96 @@ def main():
             return
         
         # Step 2: Calculate power rankings
-        rankings_df = calculate_power_rankings()
+        with RUN_METRICS.stage('rank'):
+            rankings_df = calculate_power_rankings(full_rebuild=full_rebuild, blend=blend)
         
         if rankings_df.empty:
+            RUN_METRICS.status = 'no_rankings'
             print("Could not calculate rankings. Exiting.")
             return
         
         # Step 3: Analyze matchups
-        games_df = analyze_matchups(games_df, rankings_df)
+        with RUN_METRICS.stage('analyze'):
+            games_df = analyze_matchups(games_df, rankings_df, rating_col=rating_col)
         
         # Step 4: Write markdown report
-        write_markdown_report(games_df, rankings_df)
-        
+        with RUN_METRICS.stage('render'):
+            write_markdown_report(games_df, rankings_df, output_file=report_file, formats=formats,
+                                  days_ahead=days_ahead)
+        
+        # Keep this window's games in the local warehouse
+        with RUN_METRICS.stage('store'):
+            _store('games', lambda: WAREHOUSE.upsert_games('NFL', datetime.now().year, games_df,
+                                                           date_col='gameday'))
+        
+        # Step 5 (optional): Simulate the rest of the season
+        if n_sims:
+            with RUN_METRICS.stage('simulate'):
+                odds_df, _ = simulate_remaining_season(rankings_df, n_sims=n_sims)
+                odds_file = write_odds_file(odds_df, os.path.join(output_dir, 'NFL_Season_Odds.csv'))
+                print(f"\n✅ Season odds written to: {odds_file}")
+        
+        RUN_METRICS.status = 'ok'
         print("\n" + "=" * 60)
         print("ANALYSIS COMPLETE")
         print("=" * 60)
-        print("\n📄 Generated File: NFL_Weekly_Report.md")
+        print(f"\n📄 Generated File: {report_file}")
         print("   - Today's games with scores (if completed)")
         print("   - Upcoming games ranked by watchability")
         print("   - Top 5 matchups summary")
         print("   - Current power rankings")
+        print()
+        RUN_METRICS.print_summary()
         print("\n" + "=" * 60)
         
     except Exception as e:
+        RUN_METRICS.status = 'failed'
+        RUN_METRICS.record_error(e, 'main')
         print(f"\n❌ Error occurred: {str(e)}")
         import traceback
         traceback.print_exc()
+    
+    finally:
+        metrics_file = RUN_METRICS.write(os.path.join(output_dir, RUN_METRICS_FILE))
+        print(f"\n✅ Run metrics written to: {metrics_file}")
+
+
+# Time spent importing this module; the heavy libraries load later, inside
+# whichever stage first needs them
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+RUN_METRICS.import_seconds = IMPORT_SECONDS
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="NFL matchup analysis")
+    parser.add_argument('--full-rebuild', action='store_true',
+                        help="Recompute the power rankings from the whole season instead of "
+                             "folding new games into the saved state")
+    parser.add_argument('--backfill', nargs='+', type=int, metavar='SEASON',
+                        help="Write ranking and matchup history for past seasons "
+                             "(e.g. 2022 2023 2024) instead of the weekly report")
+    parser.add_argument('--rating', choices=list(RATING_COLUMNS), default='power',
+                        help="Score matchups from the power score, Elo or SRS ratings")
+    parser.add_argument('--blend', action='store_true',
+                        help=f"Rank on the last {BLEND_SEASONS} seasons, weighting games by recency")
+    parser.add_argument('--simulate', type=int, default=0, metavar='N',
+                        help="Also simulate the rest of the season N times (e.g. 50000) and "
+                             "write playoff and seeding odds to NFL_Season_Odds.csv")
+    parser.add_argument('--profile', nargs='?', const='NFL_profile.prof', metavar='PATH',
+                        help="Capture a cProfile dump of the run (default: NFL_profile.prof)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Print what would be downloaded and written, without network access")
+    args = parser.parse_args()
+    
+    if args.dry_run:
+        dry_run(full_rebuild=args.full_rebuild, n_sims=args.simulate, blend=args.blend)
+    elif args.backfill:
+        snapshots, matchups = backfill_rankings(args.backfill)
+        for path in write_backfill_files(snapshots, matchups, 'NFL'):
+            print(f"✅ History written to: {path}")
+    else:
+        with profiled(args.profile):
+            main(full_rebuild=args.full_rebuild, n_sims=args.simulate,
+                 rating_col=RATING_COLUMNS[args.rating], blend=args.blend)
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Persistent on-disk cache for raw API responses
+Entries are keyed by endpoint and parameters, can expire after a TTL (or
+never, for responses that can no longer change) and are evicted least
+recently used first once the cache grows past its size cap
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class CacheMiss(Exception):
+    """Raised in offline mode when a response is not in the cache"""
+
+
+class ResponseCache:
+    """
+    One JSON file per cached response under `cache_dir`
+    A file's mtime records its last use, which drives LRU eviction
+    """
+
+    def __init__(self, cache_dir, max_bytes=200 * 1024 * 1024, offline=False):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._total = None  # bytes on disk, counted on the first put
+
+    @staticmethod
+    def make_key(endpoint, params):
+        """Stable key for an endpoint call, independent of parameter order"""
+        return f"{endpoint}?{json.dumps(params, sort_keys=True, default=str)}"
+
+    def _path(self, key):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, key, allow_expired=False):
+        """
+        Return the cached payload for `key`, or None if missing or expired
+        allow_expired=True also returns expired entries, e.g. as a fallback
+        while the upstream is unavailable
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Offline runs serve whatever we have, expired or not
+        expires = entry.get('expires')
+        if expires is not None and expires < time.time() and not (self.offline or allow_expired):
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return entry['payload']
+
+    def put(self, key, payload, ttl=None):
+        """
+        Store `payload` under `key`
+        ttl=None means the response is immutable and never expires
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = {
+            'key': key,
+            'stored': time.time(),
+            'expires': None if ttl is None else time.time() + ttl,
+            'payload': payload,
+        }
+        path = self._path(key)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        self._evict(os.path.getsize(path) - replaced)
+
+    def _evict(self, added):
+        """
+        Drop least recently used entries until the cache fits in max_bytes
+        The directory is listed on the first put and then only once the
+        running total (grown by each put's `added` bytes) passes max_bytes
+        """
+        with self._lock:
+            if self._total is not None:
+                self._total += added
+                if self._total <= self.max_bytes:
+                    return
+
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+            self._total = total
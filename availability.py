@@ -0,0 +1,110 @@
+"""
+Player availability: how much of each team's rotation is expected to play
+Works on a season of PlayerGameLogs rows (one per player per game), which
+stats.nba.com returns for the whole league in a single request, so the
+factor costs one download and one set of groupbys however many players
+there are. A player's impact is box-score production per team game since
+joining the player's current team; a rotation player who has missed the
+team's last few games is assumed out, and the team's strength is the share
+of its rotation's impact still available. Only players still on the
+team's roster count, and a player missing for most of the season is no
+longer part of the rotation: the team's results already reflect the loss.
+"""
+
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+ROTATION_MINUTES = 15     # minutes per game played to count as a rotation player
+MISSED_GAMES_OUT = 2      # consecutive team games missed before a player is assumed out
+LONG_ABSENCE_GAMES = 15   # team games missed after which a player has left the rotation
+AVAILABILITY_POWER = 25   # power points lost by a team missing its whole rotation
+
+PRODUCTION_COLUMNS = {'PTS': 1, 'REB': 1, 'AST': 1, 'STL': 1, 'BLK': 1, 'TOV': -1}
+
+
+def player_impact(logs):
+    """
+    One row per (team, player) for each player's current team
+    Columns: team, player_id, player, minutes (per game played), impact
+    (production per team game since joining), last_game and games_missed
+    (team games played since the player's last one)
+    """
+    logs = logs.assign(production=sum(logs[col].astype(float) * sign for col, sign in PRODUCTION_COLUMNS.items()))
+
+    # Team games in date order; a team's n-th game has games_before = n - 1
+    team_games = logs.drop_duplicates(['TEAM_ABBREVIATION', 'GAME_ID'])[['TEAM_ABBREVIATION', 'GAME_DATE']]
+    team_games = team_games.sort_values('GAME_DATE')
+    team_games['games_before'] = team_games.groupby('TEAM_ABBREVIATION', observed=True).cumcount()
+    season_games = team_games.groupby('TEAM_ABBREVIATION', observed=True).size()
+
+    players = logs.groupby(['TEAM_ABBREVIATION', 'PLAYER_ID'], observed=True).agg(
+        player=('PLAYER_NAME', 'last'),
+        games=('GAME_ID', 'size'),
+        total_minutes=('MIN', 'sum'),
+        production=('production', 'sum'),
+        first_game=('GAME_DATE', 'min'),
+        last_game=('GAME_DATE', 'max'),
+    ).reset_index()
+
+    # Players traded during the season only count for the team they played for last
+    current = players['last_game'] == players.groupby('PLAYER_ID')['last_game'].transform('max')
+    players = players[current].merge(team_games, how='left', left_on=['TEAM_ABBREVIATION', 'first_game'],
+                                     right_on=['TEAM_ABBREVIATION', 'GAME_DATE'])
+    players = players.merge(team_games.rename(columns={'GAME_DATE': 'last_game', 'games_before': 'last_games_before'}),
+                            how='left', on=['TEAM_ABBREVIATION', 'last_game'])
+    team_season_games = players['TEAM_ABBREVIATION'].map(season_games).astype(float)
+    team_games_since = team_season_games - players['games_before']
+
+    return pd.DataFrame({
+        'team': players['TEAM_ABBREVIATION'].astype(str),
+        'player_id': players['PLAYER_ID'],
+        'player': players['player'],
+        'minutes': players['total_minutes'].astype(float) / players['games'],
+        'impact': players['production'] / team_games_since,
+        'last_game': players['last_game'],
+        'games_missed': team_season_games - 1 - players['last_games_before'],
+    })
+
+
+def team_availability(logs, roster=None, missed_games=MISSED_GAMES_OUT, rotation_minutes=ROTATION_MINUTES,
+                      long_absence=LONG_ABSENCE_GAMES):
+    """
+    Share of each team's rotation impact expected to play, indexed by team
+    Columns: strength (0-1, 1 = nobody out) and out (the missing rotation
+    players, biggest impact first, comma separated). `roster` (team,
+    player_id) lists the players currently signed; without it every player
+    counts for the last team the player appeared for.
+    """
+    if logs.empty:
+        return pd.DataFrame(columns=['strength', 'out'], index=pd.Index([], name='team'))
+
+    players = player_impact(logs)
+    rotation = players[(players['minutes'] >= rotation_minutes) & (players['impact'] > 0)]
+
+    # Waived, released or traded players are gone rather than out, and so
+    # are long absences (e.g. season-ending injuries)
+    if roster is not None:
+        signed = set(zip(roster['team'].astype(str), roster['player_id'].astype(int)))
+        rotation = rotation[[key in signed for key in zip(rotation['team'], rotation['player_id'].astype(int))]]
+    rotation = rotation[rotation['games_missed'] <= long_absence]
+
+    # A player is out after missing the team's last `missed_games` games
+    is_out = rotation['games_missed'] >= missed_games
+
+    total = rotation.groupby('team')['impact'].sum()
+    out_players = rotation[is_out].sort_values('impact', ascending=False)
+    availability = pd.DataFrame({
+        'strength': 1 - out_players.groupby('team')['impact'].sum().reindex(total.index, fill_value=0) / total,
+        'out': out_players.groupby('team')['player'].agg(', '.join).reindex(total.index, fill_value=''),
+    })
+    return availability.rename_axis('team')
+
+
+def adjust_power(power, strength):
+    """
+    Power scores lowered for missing players: a team at `strength` loses
+    (1 - strength) * AVAILABILITY_POWER points; NaN strength means no change
+    """
+    shortfall = 1 - strength.astype(float).fillna(1).clip(0, 1)
+    return (power - AVAILABILITY_POWER * shortfall).clip(lower=0)
@@ -0,0 +1,127 @@
+"""
+Point-in-time historical rankings and matchup scores
+Cumulative sums over the date-sorted team-game lines give every team's
+running totals after every game day in one vectorized pass, so a whole
+season of daily ranking snapshots costs about as much as one ranking
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from lazy_imports import lazy_import
+from matchup_matrix import DEFAULT_POWER, score_pairs, tier_codes, tier_labels
+from ranking_state import SUM_COLUMNS
+from report_writer import atomic_write
+
+pd = lazy_import('pandas')
+
+
+def ranking_snapshots(lines, score_totals):
+    """
+    Rankings as of the end of every game day
+    `lines` are team-game lines (team, game_date and SUM_COLUMNS) and
+    `score_totals` is the league's function from running sums to power score
+    columns. Returns one row per (as_of, team) for teams that have played.
+    """
+    daily = lines.groupby(['game_date', 'team'], observed=True)[SUM_COLUMNS].sum()
+
+    # dates x teams, carried forward across days a team did not play
+    cumulative = daily.unstack('team', fill_value=0).sort_index().cumsum()
+    totals = cumulative.stack('team', future_stack=True)
+    totals = totals[totals['games'] > 0]
+    totals.index = totals.index.set_names(['as_of', 'team'])
+
+    snapshots = score_totals(totals)
+    snapshots['rank'] = snapshots.groupby(level='as_of')['power_score'].rank(
+        ascending=False, method='first').astype(int)
+    snapshots = snapshots.reset_index()
+    snapshots['as_of'] = pd.to_datetime(snapshots['as_of'])
+    return snapshots
+
+
+def matchup_history(games, snapshots):
+    """
+    Matchup scores for past games using only what was known beforehand
+    Each game is scored with both teams' rankings as of the previous game day.
+    `games` needs game_id, game_date, away_team and home_team.
+    """
+    games = games.assign(
+        game_date=pd.to_datetime(games['game_date']),
+        away_team=games['away_team'].astype(str),
+        home_team=games['home_team'].astype(str),
+    )
+    games = games.sort_values('game_date').reset_index(drop=True)
+    known = snapshots[['as_of', 'team', 'power_score', 'rank']].sort_values('as_of')
+    known = known.assign(team=known['team'].astype(str))
+
+    for side in ['away', 'home']:
+        side_known = known.rename(columns={
+            'team': f'{side}_team', 'power_score': f'{side}_power', 'rank': f'{side}_rank',
+            'as_of': f'{side}_as_of',
+        })
+        games = pd.merge_asof(games, side_known, left_on='game_date', right_on=f'{side}_as_of',
+                              by=f'{side}_team', allow_exact_matches=False)
+        games = games.drop(columns=f'{side}_as_of')
+
+    # Teams without a game yet have no rating; score them like unranked teams
+    away_power = games['away_power'].fillna(DEFAULT_POWER).to_numpy()
+    home_power = games['home_power'].fillna(DEFAULT_POWER).to_numpy()
+    quality, competitive, matchup = score_pairs(away_power, home_power)
+
+    games['quality_score'] = quality
+    games['competitive_score'] = competitive
+    games['matchup_score'] = matchup
+    games['tier'] = tier_labels(tier_codes(matchup))
+    return games
+
+
+def _backfill_season(lines, games, score_totals):
+    snapshots = ranking_snapshots(lines, score_totals)
+    return snapshots, matchup_history(games, snapshots)
+
+
+def backfill(season_inputs, score_totals, max_workers=None):
+    """
+    Ranking snapshots and matchup history for several seasons
+    `season_inputs` maps each season to its (lines, games) frames. Seasons
+    are independent, so each one runs in its own worker process.
+    Returns (snapshots, matchups) with a season column added.
+    """
+    seasons = list(season_inputs)
+    results = {}
+
+    if max_workers == 1 or len(seasons) == 1:
+        for season in seasons:
+            results[season] = _backfill_season(*season_inputs[season], score_totals)
+    else:
+        # Spawned rather than forked, see simulate_season()
+        spawn = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=spawn) as executor:
+            futures = {
+                season: executor.submit(_backfill_season, *season_inputs[season], score_totals)
+                for season in seasons
+            }
+            results = {season: future.result() for season, future in futures.items()}
+
+    snapshots = pd.concat([results[season][0].assign(season=season) for season in seasons],
+                          ignore_index=True)
+    matchups = pd.concat([results[season][1].assign(season=season) for season in seasons],
+                         ignore_index=True)
+    return snapshots, matchups
+
+
+def rankings_as_of(snapshots, date):
+    """The rankings snapshot in effect on `date` (the last game day on or before it)"""
+    known = snapshots[snapshots['as_of'] <= pd.Timestamp(date)]
+    if known.empty:
+        return known
+    latest = known[known['as_of'] == known['as_of'].max()]
+    return latest.sort_values('rank').reset_index(drop=True)
+
+
+def write_backfill_files(snapshots, matchups, prefix):
+    """Write <prefix>_ranking_history.csv and <prefix>_matchup_history.csv"""
+    paths = [f"{prefix}_ranking_history.csv", f"{prefix}_matchup_history.csv"]
+    atomic_write(paths[0], snapshots.to_csv(index=False, date_format='%Y-%m-%d'))
+    atomic_write(paths[1], matchups.to_csv(index=False, date_format='%Y-%m-%d'))
+    return paths
@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the NBA and NFL pipelines
+Replays recorded (or synthetic) API fixtures with the clock frozen at the
+recording time and times each stage separately: fetch/parse, power rankings,
+matchup analysis and report writing. Script startup (module import and
+`--help`) is timed in fresh interpreters. Results are saved as JSON so runs
+can be compared between commits.
+
+    python benchmark.py --record                   # capture live fixtures
+    python benchmark.py --synthesize 1 10 100      # generate scaled seasons
+    python benchmark.py                            # time every fixture set
+    python benchmark.py --compare benchmarks/results/old.json
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+import matchup_matrix
+from api_cache import ResponseCache
+from warehouse import Warehouse
+
+BENCHMARK_DIR = 'benchmarks'
+FIXTURES_DIR = os.path.join(BENCHMARK_DIR, 'fixtures')
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+
+STAGES = ['fetch', 'rankings', 'matchups', 'report']
+LEAGUES = ['nba', 'nfl']
+SCRIPTS = {'nba': 'NBAMatchups', 'nfl': 'NFLMatchups'}
+
+# Synthetic fixtures: a mid-season "now" for each league
+SYNTHETIC_NBA_NOW = datetime(2026, 1, 15, 10, 0)
+SYNTHETIC_NBA_SEASON = '2025-26'
+SYNTHETIC_NFL_NOW = datetime(2026, 11, 5, 10, 0)
+NBA_GAMES_PER_SEASON = 1230
+NFL_GAMES_PER_WEEK = 16
+NFL_WEEKS = 18
+
+
+def _frozen_datetime(now):
+    """A datetime class whose now() always returns `now`"""
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now
+    return FrozenDatetime
+
+
+class _FixtureSchedules:
+    """Stands in for nfl_data_py, serving import_schedules from a fixture file"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def import_schedules(self, years):
+        schedules = pd.read_csv(self.path, dtype={'game_id': str, 'gameday': str, 'gametime': str})
+        return schedules[schedules['season'].isin(years)].reset_index(drop=True)
+
+
+@contextlib.contextmanager
+def replay(module, fixture_dir, league, work_dir):
+    """
+    Point a league module at a fixture set: frozen clock, state files under
+    `work_dir`, and API calls served from the fixtures only
+    """
+    with open(os.path.join(fixture_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+
+    patched = {
+        'datetime': _frozen_datetime(datetime.fromisoformat(meta[f'{league}_now'])),
+        'CACHE_DIR': work_dir,
+        'RANKING_STATE_FILE': os.path.join(work_dir, 'ranking_state.json'),
+        'ELO_STATE_FILE': os.path.join(work_dir, 'elo_state.json'),
+        'SRS_STATE_FILE': os.path.join(work_dir, 'srs_state.json'),
+        'WAREHOUSE': Warehouse(os.path.join(work_dir, 'warehouse.sqlite')),
+    }
+    if league == 'nba':
+        patched['RESPONSE_CACHE'] = ResponseCache(os.path.join(fixture_dir, 'nba_responses'),
+                                                  max_bytes=float('inf'), offline=True)
+    else:
+        patched['nfl'] = _FixtureSchedules(os.path.join(fixture_dir, 'nfl_schedules.csv.gz'))
+
+    saved = {name: getattr(module, name) for name in patched}
+    try:
+        for name, value in patched.items():
+            setattr(module, name, value)
+        yield meta
+    finally:
+        for name, value in saved.items():
+            setattr(module, name, value)
+
+
+def _load_league(league):
+    return importlib.import_module(SCRIPTS[league])
+
+
+def measure_startup(league, repeat=3):
+    """
+    Median seconds to import a league script and to print its --help, each
+    in a fresh interpreter so nothing is already imported
+    """
+    script = SCRIPTS[league]
+    import_code = (f"import time; start = time.perf_counter(); import {script}; "
+                   f"print(time.perf_counter() - start)")
+    imports, helps = [], []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', import_code], capture_output=True,
+                                text=True, check=True).stdout
+        imports.append(float(output.strip().splitlines()[-1]))
+
+        start = time.perf_counter()
+        subprocess.run([sys.executable, f"{script}.py", '--help'], capture_output=True, check=True)
+        helps.append(time.perf_counter() - start)
+    return {'import': statistics.median(imports), 'help': statistics.median(helps)}
+
+
+def _reset_caches(module, league, work_dir):
+    """Drop in-memory and on-disk copies so every repeat parses the fixtures again"""
+    if league == 'nba':
+        module._season_schedules.clear()
+    else:
+        module._schedules.clear()
+    shutil.rmtree(work_dir, ignore_errors=True)
+    os.makedirs(work_dir, exist_ok=True)
+    matchup_matrix._cached_matrix = None
+
+
+def _timed(module, stage, timings, output, run):
+    """
+    Run one stage with its output captured and record its seconds
+    Raises RuntimeError if the stage recorded an error: the pipeline
+    carries on past handled errors, so the timing would measure the
+    error path instead of the stage
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        result = run()
+    timings[stage] = time.perf_counter() - start
+
+    errors = module.RUN_METRICS.errors
+    if errors:
+        details = "; ".join(f"{error['context']}: {error['type']}: {error['message']}" for error in errors)
+        raise RuntimeError(f"{stage} stage recorded {len(errors)} error(s): {details}\n"
+                           f"--- output ---\n{output.getvalue()}")
+    return result
+
+
+def run_stages(module, league, work_dir):
+    """Run the pipeline once; returns ({stage: seconds}, {count: rows})"""
+    timings = {}
+    _reset_caches(module, league, work_dir)
+    module.RUN_METRICS.reset()
+    output = io.StringIO()
+
+    games_df = _timed(module, 'fetch', timings, output,
+                      lambda: module.get_games_by_date_range(days_ahead=7))
+    rankings_df = _timed(module, 'rankings', timings, output,
+                         lambda: module.calculate_power_rankings(full_rebuild=True))
+    games_df = _timed(module, 'matchups', timings, output,
+                      lambda: module.analyze_matchups(games_df, rankings_df))
+    _timed(module, 'report', timings, output,
+           lambda: module.write_markdown_report(games_df, rankings_df,
+                                                output_file=os.path.join(work_dir, 'report.md')))
+
+    return timings, {'games': len(games_df), 'teams': len(rankings_df)}
+
+
+def benchmark_fixture(fixture_dir, league, repeat=3):
+    """Time every stage `repeat` times against one fixture set"""
+    module = _load_league(league)
+    runs = {stage: [] for stage in STAGES}
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        with replay(module, fixture_dir, league, work_dir):
+            for _ in range(repeat):
+                timings, counts = run_stages(module, league, work_dir)
+                for stage in STAGES:
+                    runs[stage].append(timings[stage])
+
+    stages = {
+        stage: {'min': min(times), 'median': statistics.median(times), 'runs': times}
+        for stage, times in runs.items()
+    }
+    return {'stages': stages, 'counts': counts}
+
+
+def _fixture_sets():
+    if not os.path.isdir(FIXTURES_DIR):
+        return []
+    return sorted(name for name in os.listdir(FIXTURES_DIR)
+                  if os.path.exists(os.path.join(FIXTURES_DIR, name, 'meta.json')))
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def _write_meta(fixture_dir, **meta):
+    with open(os.path.join(fixture_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=1, default=str)
+
+
+def record_fixtures(name='recorded'):
+    """
+    Capture live fixtures: every NBA stats response the pipeline requests
+    and the NFL schedules it loads, stamped with the recording time
+    """
+    fixture_dir = os.path.join(FIXTURES_DIR, name)
+    shutil.rmtree(fixture_dir, ignore_errors=True)
+    os.makedirs(fixture_dir)
+    now = datetime.now()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        nba = _load_league('nba')
+        saved = (nba.RESPONSE_CACHE, nba.CACHE_DIR, nba.RANKING_STATE_FILE, nba.ELO_STATE_FILE,
+                 nba.SRS_STATE_FILE, nba.WAREHOUSE)
+        try:
+            nba.RESPONSE_CACHE = ResponseCache(os.path.join(fixture_dir, 'nba_responses'), max_bytes=float('inf'))
+            nba.CACHE_DIR = work_dir
+            nba.RANKING_STATE_FILE = os.path.join(work_dir, 'ranking_state.json')
+            nba.ELO_STATE_FILE = os.path.join(work_dir, 'elo_state.json')
+            nba.SRS_STATE_FILE = os.path.join(work_dir, 'srs_state.json')
+            nba.WAREHOUSE = Warehouse(os.path.join(work_dir, 'warehouse.sqlite'))
+            nba.get_games_by_date_range(days_ahead=7)
+            nba.calculate_power_rankings(full_rebuild=True)
+        finally:
+            (nba.RESPONSE_CACHE, nba.CACHE_DIR, nba.RANKING_STATE_FILE, nba.ELO_STATE_FILE,
+             nba.SRS_STATE_FILE, nba.WAREHOUSE) = saved
+
+    nfl = _load_league('nfl')
+    schedules = nfl.nfl.import_schedules([now.year - 1, now.year])
+    schedules.to_csv(os.path.join(fixture_dir, 'nfl_schedules.csv.gz'), index=False)
+
+    _write_meta(fixture_dir, name=name, scale=1, nba_now=now.isoformat(), nfl_now=now.isoformat())
+    print(f"✅ Recorded fixtures to: {fixture_dir}")
+    return fixture_dir
+
+
+def _synthetic_nba(fixture_dir, scale, rng):
+    """
+    A synthetic NBA season with `scale` times the usual number of games, as
+    the raw LeagueGameFinder, ScheduleLeagueV2 and ScoreboardV2 payloads
+    """
+    from nba_api.stats.endpoints import scoreboardv2
+    from nba_api.stats.static import teams
+
+    nba_teams = teams.get_teams()
+    team_ids = np.array([team['id'] for team in nba_teams])
+    abbrs = np.array([team['abbreviation'] for team in nba_teams])
+    names = np.array([team['full_name'] for team in nba_teams])
+
+    now = SYNTHETIC_NBA_NOW
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    season_start = datetime(now.year - 1, 10, 21)
+    n_days = (datetime(now.year, 4, 12) - season_start).days + 1
+    season = SYNTHETIC_NBA_SEASON
+
+    n_games = NBA_GAMES_PER_SEASON * scale
+    days = np.sort(rng.integers(0, n_days, n_games))
+    home = rng.integers(0, len(team_ids), n_games)
+    away = (home + rng.integers(1, len(team_ids), n_games)) % len(team_ids)
+    strength = rng.normal(0, 6, len(team_ids))
+    home_pts = np.round(113 + strength[home] + rng.normal(0, 12, n_games)).astype(int)
+    away_pts = np.round(111 + strength[away] + rng.normal(0, 12, n_games)).astype(int)
+    home_pts += home_pts == away_pts
+    dates = [season_start + timedelta(days=int(day)) for day in days]
+    game_ids = [f"002{n:07d}" for n in range(1, n_games + 1)]
+    played = [date < today for date in dates]
+
+    cache = ResponseCache(os.path.join(fixture_dir, 'nba_responses'), max_bytes=float('inf'))
+
+    # LeagueGameFinder: one row per team per played game, newest first
+    headers = ['SEASON_ID', 'TEAM_ID', 'TEAM_ABBREVIATION', 'TEAM_NAME', 'GAME_ID', 'GAME_DATE',
+               'MATCHUP', 'WL', 'MIN', 'PTS', 'PLUS_MINUS']
+    rows = []
+    for i in range(n_games):
+        if not played[i]:
+            continue
+        date = dates[i].strftime('%Y-%m-%d')
+        h, a, hp, ap = home[i], away[i], int(home_pts[i]), int(away_pts[i])
+        rows.append([f"2{season[:4]}", int(team_ids[h]), abbrs[h], names[h], game_ids[i], date,
+                     f"{abbrs[h]} vs. {abbrs[a]}", 'W' if hp > ap else 'L', 240, hp, float(hp - ap)])
+        rows.append([f"2{season[:4]}", int(team_ids[a]), abbrs[a], names[a], game_ids[i], date,
+                     f"{abbrs[a]} @ {abbrs[h]}", 'W' if ap > hp else 'L', 240, ap, float(ap - hp)])
+    rows.reverse()
+    cache.put(ResponseCache.make_key('leaguegamefinder', {
+        'season_nullable': season, 'season_type_nullable': 'Regular Season', 'league_id_nullable': '00',
+    }), json.dumps({'resultSets': [{'name': 'LeagueGameFinderResults', 'headers': headers, 'rowSet': rows}]}))
+
+    # ScheduleLeagueV2: games grouped by date
+    def schedule_team(t, score):
+        return {'teamId': int(team_ids[t]), 'teamName': names[t], 'teamCity': '', 'teamTricode': abbrs[t],
+                'teamSlug': '', 'wins': 0, 'losses': 0, 'score': score, 'seed': None}
+
+    game_dates = {}
+    for i in range(n_games):
+        final = played[i]
+        game_dates.setdefault(dates[i], []).append({
+            'gameId': game_ids[i], 'gameCode': '', 'gameStatus': 3 if final else 1,
+            'gameStatusText': 'Final' if final else '7:30 pm ET', 'gameSequence': 1,
+            'gameDateEst': dates[i].strftime('%Y-%m-%dT00:00:00Z'), 'gameTimeEst': '1900-01-01T19:30:00Z',
+            'broadcasters': {'nationalBroadcasters': []},
+            'homeTeam': schedule_team(home[i], int(home_pts[i]) if final else 0),
+            'awayTeam': schedule_team(away[i], int(away_pts[i]) if final else 0),
+            'pointsLeaders': [],
+        })
+    cache.put(ResponseCache.make_key('scheduleleaguev2', {'season': season}), json.dumps({
+        'meta': {},
+        'leagueSchedule': {'leagueId': '00', 'seasonYear': season, 'weeks': [], 'gameDates': [
+            {'gameDate': date.strftime('%m/%d/%Y 00:00:00'), 'games': games} for date, games in game_dates.items()
+        ]},
+    }))
+
+    # ScoreboardV2 for today, whose games are not final in the schedule
+    header_cols = ['GAME_DATE_EST', 'GAME_SEQUENCE', 'GAME_ID', 'GAME_STATUS_ID', 'GAME_STATUS_TEXT',
+                   'GAMECODE', 'HOME_TEAM_ID', 'VISITOR_TEAM_ID']
+    line_cols = ['GAME_DATE_EST', 'GAME_SEQUENCE', 'GAME_ID', 'TEAM_ID', 'TEAM_ABBREVIATION', 'PTS']
+    header_rows, line_rows = [], []
+    for i in (i for i in range(n_games) if dates[i] == today):
+        date = dates[i].strftime('%Y-%m-%d')
+        header_rows.append([date, len(header_rows), game_ids[i], 1, '7:30 pm ET', '',
+                            int(team_ids[home[i]]), int(team_ids[away[i]])])
+        line_rows.append([date, len(line_rows), game_ids[i], int(team_ids[away[i]]), abbrs[away[i]], None])
+        line_rows.append([date, len(line_rows), game_ids[i], int(team_ids[home[i]]), abbrs[home[i]], None])
+    # nba_api reads every ScoreboardV2 dataset, so the ones the script does
+    # not use are written empty
+    data_sets = {name: {'name': name, 'headers': headers, 'rowSet': []}
+                 for name, headers in scoreboardv2.ScoreboardV2.expected_data.items()}
+    data_sets['GameHeader'] = {'name': 'GameHeader', 'headers': header_cols, 'rowSet': header_rows}
+    data_sets['LineScore'] = {'name': 'LineScore', 'headers': line_cols, 'rowSet': line_rows}
+    cache.put(ResponseCache.make_key('scoreboardv2', {'game_date': today.strftime('%Y-%m-%d'), 'day_offset': 0}),
+              json.dumps({'resultSets': list(data_sets.values())}))
+
+
+def _synthetic_nfl(fixture_dir, scale, rng):
+    """Two synthetic NFL seasons (last and current) with `scale` times the games per week"""
+    nfl_teams = np.array(['ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET',
+                          'GB', 'HOU', 'IND', 'JAX', 'KC', 'LA', 'LAC', 'LV', 'MIA', 'MIN', 'NE', 'NO',
+                          'NYG', 'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS'])
+    now = SYNTHETIC_NFL_NOW
+    seasons = []
+
+    for season in [now.year - 1, now.year]:
+        kickoff = datetime(season, 9, 7)
+        weeks = np.repeat(np.arange(1, NFL_WEEKS + 1), NFL_GAMES_PER_WEEK * scale)
+        n_games = len(weeks)
+        home = rng.integers(0, len(nfl_teams), n_games)
+        away = (home + rng.integers(1, len(nfl_teams), n_games)) % len(nfl_teams)
+        gameday = pd.to_datetime(kickoff) + pd.to_timedelta((weeks - 1) * 7 + rng.choice([0, 3, 4], n_games), unit='D')
+        strength = rng.normal(0, 5, len(nfl_teams))
+        played = gameday < pd.Timestamp(now.date())
+        home_score = np.maximum(0, np.round(23 + strength[home] + rng.normal(0, 9, n_games)))
+        away_score = np.maximum(0, np.round(21 + strength[away] + rng.normal(0, 9, n_games)))
+
+        seasons.append(pd.DataFrame({
+            'game_id': [f"{season}_{week:02d}_{n:05d}" for n, week in enumerate(weeks)],
+            'season': season,
+            'game_type': 'REG',
+            'week': weeks,
+            'gameday': gameday.strftime('%Y-%m-%d'),
+            'weekday': gameday.day_name(),
+            'gametime': '13:00',
+            'away_team': nfl_teams[away],
+            'away_score': np.where(played, away_score, np.nan),
+            'home_team': nfl_teams[home],
+            'home_score': np.where(played, home_score, np.nan),
+        }))
+
+    pd.concat(seasons, ignore_index=True).to_csv(os.path.join(fixture_dir, 'nfl_schedules.csv.gz'), index=False)
+
+
+def synthesize_fixtures(scale, seed=0, fixtures_dir=FIXTURES_DIR):
+    """Generate a fixture set with `scale` times a normal season's games under `fixtures_dir`"""
+    name = f"synthetic_{scale}x"
+    fixture_dir = os.path.join(fixtures_dir, name)
+    shutil.rmtree(fixture_dir, ignore_errors=True)
+    os.makedirs(fixture_dir)
+    _write_meta(fixture_dir, name=name, scale=scale, seed=seed,
+                nba_now=SYNTHETIC_NBA_NOW.isoformat(), nfl_now=SYNTHETIC_NFL_NOW.isoformat())
+
+    rng = np.random.default_rng(seed)
+    _synthetic_nba(fixture_dir, scale, rng)
+    _synthetic_nfl(fixture_dir, scale, rng)
+    print(f"✅ Synthesized {scale}x fixtures to: {fixture_dir}")
+    return fixture_dir
+
+
+def _compare_line(fixture, league, stage, before, after):
+    ratio = after / before if before else float('nan')
+    flag = '  ⚠️' if ratio > 1.2 else ''
+    print(f"{fixture:<16}{league:<8}{stage:<10}{before:>9.3f}s{after:>9.3f}s{ratio:>7.2f}x{flag}")
+
+
+def compare(baseline, current):
+    """Print each stage's median time against a baseline results file"""
+    print(f"\n{'fixture':<16}{'league':<8}{'stage':<10}{'baseline':>10}{'current':>10}{'ratio':>8}")
+    for league, startup in current.get('startup', {}).items():
+        base = baseline.get('startup', {}).get(league)
+        if base is None:
+            continue
+        for stage in ['import', 'help']:
+            _compare_line('(startup)', league, stage, base[stage], startup[stage])
+    for fixture, leagues in current['results'].items():
+        for league, result in leagues.items():
+            base = baseline['results'].get(fixture, {}).get(league)
+            if base is None:
+                continue
+            for stage in STAGES:
+                _compare_line(fixture, league, stage, base['stages'][stage]['median'],
+                              result['stages'][stage]['median'])
+
+
+def main(fixtures=None, leagues=LEAGUES, repeat=3, output=None, baseline=None):
+    """Benchmark every fixture set and league, then save the results"""
+    fixtures = fixtures or _fixture_sets()
+    if not fixtures:
+        print("No fixtures found. Record some with --record or generate them with --synthesize.")
+        return
+
+    results = {
+        'commit': _git_commit(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'repeat': repeat,
+        'startup': {},
+        'results': {},
+    }
+
+    for league in leagues:
+        try:
+            startup = measure_startup(league, repeat)
+        except Exception as e:
+            print(f"Startup timing for {league.upper()} skipped: {str(e)}")
+            continue
+        results['startup'][league] = startup
+        print(f"{league.upper()} startup: import {startup['import']:.3f}s  --help {startup['help']:.3f}s")
+
+    for fixture in fixtures:
+        for league in leagues:
+            print(f"Benchmarking {league.upper()} on {fixture}...")
+            try:
+                result = benchmark_fixture(os.path.join(FIXTURES_DIR, fixture), league, repeat)
+            except Exception as e:
+                print(f"  Skipped: {str(e)}")
+                continue
+            results['results'].setdefault(fixture, {})[league] = result
+            stages = '  '.join(f"{stage} {result['stages'][stage]['median']:.3f}s" for stage in STAGES)
+            print(f"  {stages}  ({result['counts']['games']} games)")
+
+    output = output or os.path.join(RESULTS_DIR, f"{results['commit'] or 'results'}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=1)
+    print(f"\n✅ Results written to: {output}")
+
+    if baseline:
+        with open(baseline, 'r', encoding='utf-8') as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the matchup pipelines")
+    parser.add_argument('--record', action='store_true',
+                        help="Record live fixtures to benchmarks/fixtures/recorded, then exit")
+    parser.add_argument('--synthesize', nargs='+', type=int, metavar='SCALE',
+                        help="Generate synthetic fixtures at these scales (e.g. 1 10 100), then exit")
+    parser.add_argument('--fixtures', nargs='+', metavar='NAME',
+                        help="Fixture sets to benchmark (default: all under benchmarks/fixtures)")
+    parser.add_argument('--league', nargs='+', choices=LEAGUES, default=LEAGUES)
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per stage; the median is reported")
+    parser.add_argument('--output', help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', metavar='BASELINE', help="Compare against an earlier results file")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures()
+    elif args.synthesize:
+        for scale in args.synthesize:
+            synthesize_fixtures(scale)
+    else:
+        main(fixtures=args.fixtures, leagues=args.league, repeat=args.repeat,
+             output=args.output, baseline=args.compare)
@@ -0,0 +1,157 @@
+"""
+Incremental Elo ratings shared by the NBA and NFL scripts
+One rating per team in a flat array, updated in O(1) per completed game with
+home advantage and a margin-of-victory multiplier. The state carries a
+watermark like RankingState, so each run only applies new results, and
+ratings regress toward the mean when a new season starts
+"""
+
+import json
+import math
+import os
+
+from lazy_imports import lazy_import
+from matchup_matrix import DEFAULT_POWER
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+ELO_MEAN = 1500
+ELO_PER_POWER_POINT = 10  # Elo points per power-score point when scoring matchups
+
+
+def elo_to_power(elo):
+    """Map Elo ratings onto the 0-100 power-score scale used for matchups"""
+    return DEFAULT_POWER + (np.asarray(elo, dtype=float) - ELO_MEAN) / ELO_PER_POWER_POINT
+
+
+class EloRatings:
+    """
+    Elo ratings plus a watermark of the last processed game
+    k              -- update size for an even game won by one point
+    home_advantage -- Elo points added to the home team's rating
+    regression     -- share of the distance to the mean removed between seasons
+    """
+
+    def __init__(self, season, k=20, home_advantage=100, regression=0.25):
+        self.season = str(season)
+        self.k = k
+        self.home_advantage = home_advantage
+        self.regression = regression
+        self.teams = []
+        self.index = {}
+        self.ratings = np.zeros(0)
+        self.last_date = None
+        self.last_date_game_ids = set()
+
+    @classmethod
+    def load(cls, path, season, **params):
+        """
+        Load the saved ratings, or start everyone at the mean if there are none
+        Ratings saved for an earlier season are carried over and regressed
+        """
+        elo = cls(season, **params)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return elo
+
+        elo.teams = list(saved.get('ratings', {}))
+        elo.index = {team: i for i, team in enumerate(elo.teams)}
+        elo.ratings = np.array(list(saved.get('ratings', {}).values()), dtype=float)
+
+        if saved.get('season') == elo.season:
+            elo.last_date = saved.get('last_date')
+            elo.last_date_game_ids = set(saved.get('last_date_game_ids', []))
+        else:
+            elo.ratings += (ELO_MEAN - elo.ratings) * elo.regression
+        return elo
+
+    def save(self, path):
+        """Write the ratings to `path` atomically"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        saved = {
+            'season': self.season,
+            'last_date': self.last_date,
+            'last_date_game_ids': sorted(self.last_date_game_ids),
+            'ratings': dict(zip(self.teams, self.ratings.tolist())),
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(saved, f, indent=1)
+        os.replace(tmp_path, path)
+
+    def _slot(self, team):
+        """Array position for `team`, adding it at the mean if it is new"""
+        i = self.index.get(team)
+        if i is None:
+            i = len(self.teams)
+            self.teams.append(team)
+            self.index[team] = i
+            self.ratings = np.append(self.ratings, ELO_MEAN)
+        return i
+
+    def expected_home(self, home_team, away_team):
+        """Probability that the home team wins"""
+        diff = (self.ratings[self._slot(home_team)] + self.home_advantage -
+                self.ratings[self._slot(away_team)])
+        return 1 / (1 + 10 ** (-diff / 400))
+
+    def update(self, games):
+        """
+        Apply completed games that are past the watermark, in date order
+        `games` needs game_id, game_date (YYYY-MM-DD), home_team, away_team,
+        home_score and away_score. Returns the number of games applied.
+        """
+        if self.last_date is not None:
+            games = games[
+                (games['game_date'] > self.last_date) |
+                ((games['game_date'] == self.last_date) &
+                 ~games['game_id'].isin(self.last_date_game_ids))
+            ]
+        if games.empty:
+            return 0
+        games = games.sort_values(['game_date', 'game_id'])
+
+        # Give every team a slot up front so the array is not reallocated
+        for team in pd.unique(pd.concat([games['home_team'], games['away_team']])):
+            self._slot(team)
+        home_idx = games['home_team'].map(self.index).to_numpy(dtype=np.int64)
+        away_idx = games['away_team'].map(self.index).to_numpy(dtype=np.int64)
+
+        # Each game depends on the ratings left by the previous one, so this
+        # is a plain loop over arrays; every step is constant time
+        ratings = self.ratings
+        for h, a, home_score, away_score in zip(
+                home_idx, away_idx, games['home_score'].to_numpy(), games['away_score'].to_numpy()):
+            diff = ratings[h] + self.home_advantage - ratings[a]
+            expected = 1 / (1 + 10 ** (-diff / 400))
+            margin = abs(home_score - away_score)
+            if home_score > away_score:
+                actual, winner_diff = 1.0, diff
+            elif home_score < away_score:
+                actual, winner_diff = 0.0, -diff
+            else:
+                actual, winner_diff = 0.5, 0.0
+
+            # Margin-of-victory multiplier, damped when the favourite wins
+            # so strong teams do not inflate their ratings
+            multiplier = math.log(margin + 1) * 2.2 / (winner_diff * 0.001 + 2.2) if margin else 1.0
+
+            shift = self.k * multiplier * (actual - expected)
+            ratings[h] += shift
+            ratings[a] -= shift
+
+        last_date = games['game_date'].max()
+        last_ids = set(games.loc[games['game_date'] == last_date, 'game_id'])
+        if last_date == self.last_date:
+            last_ids |= self.last_date_game_ids
+        self.last_date = last_date
+        self.last_date_game_ids = last_ids
+
+        return len(games)
+
+    def to_series(self):
+        """Ratings indexed by team"""
+        return pd.Series(self.ratings, index=pd.Index(self.teams, name='team'), name='elo')
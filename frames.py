@@ -0,0 +1,74 @@
+"""
+Compact DataFrames for the raw game tables
+The upstream tables (LeagueGameFinder results, nfl_data_py schedules) carry
+dozens of columns the rankings never read, team abbreviations as Python
+strings and scores as float64. Frames are cut down to the columns in use as
+they are read, team columns share one categorical and scores become small
+integers, so a multi-season history takes a fraction of the memory and
+groupbys on team work on integer codes.
+"""
+
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+
+def _team_dtype(frame, teams):
+    values = pd.concat([frame[col] for col in teams]).dropna().unique()
+    return pd.CategoricalDtype(sorted(values))
+
+
+def compact(frame, dtypes, teams=()):
+    """
+    Keep only the columns named in `dtypes`, converted to their dtype
+    `dtypes` maps column -> dtype, 'datetime', or None to leave it as is.
+    The `teams` columns share one categorical, so home and away teams can
+    be compared and concatenated without falling back to strings.
+    Columns missing from `frame` are skipped.
+    """
+    teams = [col for col in teams if col in frame.columns]
+    team_dtype = _team_dtype(frame, teams) if teams else None
+
+    columns = {}
+    for col, dtype in dtypes.items():
+        if col not in frame.columns:
+            continue
+        if col in teams:
+            columns[col] = frame[col].astype(team_dtype)
+        elif dtype == 'datetime':
+            columns[col] = pd.to_datetime(frame[col])
+        elif dtype is not None:
+            columns[col] = frame[col].astype(dtype)
+        else:
+            columns[col] = frame[col]
+    return pd.DataFrame(columns, index=frame.index)
+
+
+def from_result_set(result_set, dtypes, teams=()):
+    """
+    Compact frame from a raw stats.nba.com result set ({'headers', 'rowSet'})
+    Only the wanted columns are ever built, rather than a frame of every
+    column that is then cut down
+    """
+    position = {name: i for i, name in enumerate(result_set['headers'])}
+    rows = result_set['rowSet']
+    frame = pd.DataFrame({col: [row[position[col]] for row in rows]
+                          for col in dtypes if col in position})
+    return compact(frame, dtypes, teams)
+
+
+def concat(frames, teams=()):
+    """
+    pd.concat for compact frames, e.g. several seasons
+    Each frame's team categorical may hold different teams (relocations,
+    expansion); they are recoded onto the union first so the result keeps
+    a categorical instead of reverting to strings
+    """
+    frames = list(frames)
+    teams = [col for col in teams if all(col in frame.columns for frame in frames)]
+    team_dtypes = {frame[col].dtype for frame in frames for col in teams}
+    if len(team_dtypes) > 1:
+        team_dtype = pd.CategoricalDtype(sorted(set().union(*(dtype.categories for dtype in team_dtypes))))
+        frames = [frame.assign(**{col: frame[col].astype(team_dtype) for col in teams}) for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
@@ -0,0 +1,32 @@
+"""
+Deferred imports for heavy dependencies
+pandas, numpy, nba_api and nfl_data_py together take most of a second to
+import. Binding them through lazy_import() keeps `--help`, `--dry-run` and
+any code path that never touches them from paying for it.
+"""
+
+import importlib
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Stand-in that imports the real module on first attribute access"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = name
+
+    def __getattr__(self, attr):
+        # Only called for attributes not yet copied over from the real module
+        module = importlib.import_module(self.__dict__['_lazy_target'])
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    """
+    Return a module object for `name` that is only imported when first used
+    Submodules work too (e.g. 'nba_api.stats.endpoints.scoreboardv2'); their
+    parent packages are not imported until then either.
+    """
+    return _LazyModule(name)
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+matchrank - one entry point for every league
+
+    matchrank nba --simulate 50000
+    matchrank nfl --days 3 --output-dir reports --formats md json
+    matchrank all --output-dir reports
+    matchrank serve nba --port 8765
+    matchrank query nba h2h BOS NYK
+
+`all` runs the leagues side by side in one process: the NBA fetch spends
+most of its time waiting on the rate-limited stats API while the NFL
+rankings keep the CPU busy, so the two overlap well. Each line of output is
+tagged with the league that printed it. `serve` keeps one league's rankings
+and matchups in memory behind a small HTTP API (see service.py); `query`
+reads past runs back from the local warehouse (see warehouse.py).
+"""
+
+import argparse
+import asyncio
+import importlib
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from matchup_matrix import RATING_COLUMNS
+from report_writer import REPORT_FORMATS
+from run_metrics import profiled
+from service import REFRESH_SECONDS, MatchupService, league_loader
+
+LEAGUE_MODULES = {'nba': 'NBAMatchups', 'nfl': 'NFLMatchups'}
+
+# Warehouse query name -> (method, number of teams it takes)
+QUERIES = {
+    'rankings': ('latest_rankings', 0),
+    'trend': ('ranking_history', 1),
+    'history': ('team_history', 1),
+    'h2h': ('head_to_head', 2),
+}
+
+
+class _LeagueOutput:
+    """
+    sys.stdout stand-in that prefixes each line with the league of the
+    thread that printed it, so concurrent runs stay readable
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def set_prefix(self, prefix):
+        self.local.prefix = prefix
+        self.local.buffer = ''
+
+    def thread_initializer(self):
+        """
+        Initializer for a worker pool started by the current thread, so the
+        workers' lines get the same prefix (see get_games_by_date_range())
+        """
+        prefix = getattr(self.local, 'prefix', None)
+        return lambda: self.set_prefix(prefix)
+
+    def write(self, text):
+        prefix = getattr(self.local, 'prefix', None)
+        if prefix is None:
+            return self.stream.write(text)
+        *lines, self.local.buffer = (self.local.buffer + text).split('\n')
+        if lines:
+            with self.lock:
+                self.stream.write(''.join(f"{prefix}{line}\n" for line in lines))
+        return len(text)
+
+    def close_thread(self):
+        """Write out any unterminated line left by the current thread"""
+        if getattr(self.local, 'buffer', ''):
+            self.write('\n')
+        self.local.prefix = None
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def _league_kwargs(league, args):
+    """Keyword arguments for a league's main()/dry_run() from parsed arguments"""
+    kwargs = {
+        'full_rebuild': args.full_rebuild,
+        'n_sims': args.simulate,
+        'days_ahead': args.days,
+        'output_dir': args.output_dir,
+        'formats': tuple(args.formats),
+    }
+    if league == 'nba':
+        kwargs.update(fetch_mode=args.fetch_mode, offline=args.offline, availability=args.availability)
+    if league == 'nfl':
+        kwargs['blend'] = args.blend
+    if not args.dry_run:
+        kwargs['rating_col'] = RATING_COLUMNS[args.rating]
+        if getattr(args, 'live', False):
+            kwargs['live'] = True
+    return kwargs
+
+
+def run_league(league, args):
+    """Run one league's pipeline (or dry run); returns its run status"""
+    module = importlib.import_module(LEAGUE_MODULES[league])
+    if args.dry_run:
+        module.dry_run(**_league_kwargs(league, args))
+        return 'dry_run'
+    module.main(**_league_kwargs(league, args))
+    return module.RUN_METRICS.status
+
+
+def run_leagues(leagues, args):
+    """
+    Run several leagues concurrently in worker threads
+    Returns {league: status}
+    """
+    if args.dry_run:
+        return {league: run_league(league, args) for league in leagues}
+
+    # Import the heavy libraries once up front: importing pandas from two
+    # threads at the same time can trip over its circular imports
+    importlib.import_module('pandas')
+
+    output = _LeagueOutput(sys.stdout)
+
+    def run(league):
+        output.set_prefix(f"[{league.upper()}] ")
+        try:
+            return run_league(league, args)
+        except Exception as e:
+            print(f"❌ {league.upper()} run failed: {str(e)}")
+            return 'failed'
+        finally:
+            output.close_thread()
+
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=len(leagues)) as executor:
+            statuses = dict(zip(leagues, executor.map(run, leagues)))
+    finally:
+        sys.stdout = output.stream
+
+    for league, status in statuses.items():
+        print(f"{'✅' if status != 'failed' else '❌'} {league.upper()}: {status}")
+    return statuses
+
+
+def _add_run_options(parser, league=None):
+    parser.add_argument('--days', type=int, default=7, metavar='N',
+                        help="Report on today plus the next N days (default: 7)")
+    parser.add_argument('--output-dir', default='.', metavar='DIR',
+                        help="Directory for the reports, odds and run metrics (default: .)")
+    parser.add_argument('--formats', nargs='+', choices=REPORT_FORMATS, default=list(REPORT_FORMATS),
+                        help="Report formats to write (default: all)")
+    parser.add_argument('--full-rebuild', action='store_true',
+                        help="Recompute the power rankings from the whole season instead of "
+                             "folding new games into the saved state")
+    parser.add_argument('--rating', choices=list(RATING_COLUMNS), default='power',
+                        help="Score matchups from the power score, Elo or SRS ratings")
+    parser.add_argument('--simulate', type=int, default=0, metavar='N',
+                        help="Also simulate the rest of the season N times and write playoff "
+                             "and seeding odds")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Print what would be fetched and written, without network access")
+    if league in (None, 'nba'):
+        parser.add_argument('--fetch-mode', choices=['schedule', 'concurrent', 'serial'], default='schedule',
+                            help="NBA: where to get the games from")
+        parser.add_argument('--offline', action='store_true',
+                            help="NBA: serve every stats request from the local response cache")
+        parser.add_argument('--availability', action='store_true',
+                            help="NBA: lower the ratings of teams missing rotation players")
+    if league in (None, 'nfl'):
+        parser.add_argument('--blend', action='store_true',
+                            help="NFL: rank on the last few seasons, weighting games by recency")
+    if league == 'nba':
+        parser.add_argument('--live', action='store_true',
+                            help="After the report, keep today's scores current until the games are final")
+    if league is not None:
+        parser.add_argument('--backfill', nargs='+', metavar='SEASON',
+                            help="Write ranking and matchup history for past seasons instead "
+                                 "of the report")
+        parser.add_argument('--profile', nargs='?', const=f"{league.upper()}_profile.prof", metavar='PATH',
+                            help="Capture a cProfile dump of the run")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='matchrank', description="Matchup rankings for the NBA and NFL")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for league in LEAGUE_MODULES:
+        _add_run_options(subparsers.add_parser(league, help=f"Run the {league.upper()} pipeline"), league)
+    _add_run_options(subparsers.add_parser('all', help="Run every league concurrently"))
+
+    serve = subparsers.add_parser('serve', help="Serve rankings and matchups over HTTP from memory")
+    serve.add_argument('league', choices=list(LEAGUE_MODULES))
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--refresh-minutes', type=float, default=REFRESH_SECONDS / 60,
+                       help="Minutes between background refreshes (default: %(default)s)")
+    serve.add_argument('--days', type=int, default=7, metavar='N',
+                       help="Keep games for today plus the next N days (default: 7)")
+    serve.add_argument('--rating', choices=list(RATING_COLUMNS), default='power',
+                       help="Score matchups from the power score, Elo or SRS ratings")
+    serve.add_argument('--offline', action='store_true',
+                       help="NBA: serve every stats request from the local response cache")
+
+    query = subparsers.add_parser('query', help="Query games and rankings stored by earlier runs (no network)")
+    query.add_argument('league', choices=list(LEAGUE_MODULES))
+    query.add_argument('what', choices=list(QUERIES),
+                       help="rankings | trend TEAM | history TEAM | h2h TEAM OPPONENT")
+    query.add_argument('teams', nargs='*', metavar='TEAM')
+    query.add_argument('--season', help="Limit to one season (e.g. 2025-26 or 2025)")
+    return parser
+
+
+def query(args, parser):
+    """Print one warehouse query"""
+    method, n_teams = QUERIES[args.what]
+    if len(args.teams) != n_teams:
+        parser.error(f"{args.what} takes {n_teams} team(s)")
+    warehouse = importlib.import_module(LEAGUE_MODULES[args.league]).WAREHOUSE
+    importlib.import_module('pandas')  # so the timing below is the query alone
+    start = time.perf_counter()
+    result = getattr(warehouse, method)(args.league.upper(), *[team.upper() for team in args.teams],
+                                        season=args.season)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(result.to_string(index=False) if not result.empty else "No rows.")
+    print(f"\n⏱️  {len(result)} row(s) in {elapsed:.1f} ms")
+    return 0
+
+
+def serve(args):
+    """Run a league's MatchupService until interrupted"""
+    module = importlib.import_module(LEAGUE_MODULES[args.league])
+    if args.league == 'nba':
+        module.RESPONSE_CACHE.offline = args.offline
+    rating_col = RATING_COLUMNS[args.rating]
+    service = MatchupService(
+        args.league.upper(),
+        league_loader(module, days_ahead=args.days, rating_col=rating_col),
+        refresh_seconds=args.refresh_minutes * 60,
+        rating_col=rating_col,
+        metrics=module.RUN_METRICS,
+    )
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    return 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == 'query':
+        return query(args, parser)
+    if args.command == 'serve':
+        return serve(args)
+    if args.command == 'all':
+        statuses = run_leagues(list(LEAGUE_MODULES), args)
+        return 1 if 'failed' in statuses.values() else 0
+
+    league = args.command
+    module = importlib.import_module(LEAGUE_MODULES[league])
+    if args.backfill:
+        if league == 'nba':
+            module.RESPONSE_CACHE.offline = args.offline
+            seasons = args.backfill
+        else:
+            seasons = [int(season) for season in args.backfill]
+        snapshots, matchups = module.backfill_rankings(seasons)
+        prefix = os.path.join(args.output_dir, league.upper())
+        for path in module.write_backfill_files(snapshots, matchups, prefix):
+            print(f"✅ History written to: {path}")
+        return 0
+
+    with profiled(args.profile):
+        status = run_league(league, args)
+    return 1 if status == 'failed' else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
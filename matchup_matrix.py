@@ -0,0 +1,117 @@
+"""
+All-pairs matchup scores shared by the NBA and NFL scripts
+The quality, competitive and matchup scores depend only on the two teams'
+power scores, so they are computed once per ranking update for every pairing
+and any game (scheduled or hypothetical) becomes an array lookup
+"""
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+DEFAULT_POWER = 50  # power assumed for teams missing from the rankings
+
+# --rating choice -> rankings column the matchups are scored from; each is
+# on the 0-100 power-score scale
+RATING_COLUMNS = {'power': 'power_score', 'elo': 'elo_power', 'srs': 'srs_power'}
+
+TIERS = (
+    "🔥 MUST WATCH",
+    "⭐ HIGHLY RECOMMENDED",
+    "👍 WORTH WATCHING",
+    "📺 Optional",
+)
+TIER_THRESHOLDS = (70, 60, 50)
+
+
+def tier_labels(codes):
+    """TIERS labels for an array of tier codes"""
+    return np.array(TIERS)[codes]
+
+
+def tier_codes(scores):
+    """Index into TIERS for each matchup score"""
+    scores = np.asarray(scores)
+    return np.select([scores >= threshold for threshold in TIER_THRESHOLDS],
+                     range(len(TIER_THRESHOLDS)), default=len(TIER_THRESHOLDS)).astype(np.int8)
+
+
+def score_pairs(away_power, home_power):
+    """
+    Quality, competitive and matchup scores for aligned (or broadcastable)
+    arrays of away and home power scores
+    """
+    # Average power of both teams
+    quality = (away_power + home_power) / 2
+    # Exponential decay: perfect match = 100, large differences approach 0
+    competitive = 100 * np.exp(-np.abs(away_power - home_power) / 15)
+    # 60% quality, 40% competitiveness
+    matchup = 0.60 * quality + 0.40 * competitive
+    return quality, competitive, matchup
+
+
+class MatchupMatrix:
+    """
+    Quality, competitive and matchup scores for every pair of teams
+    Row and column n (one past the last team) stand for any unranked team,
+    which plays at DEFAULT_POWER
+    """
+
+    def __init__(self, teams, power):
+        self.teams = list(teams)
+        self.index = {team: i for i, team in enumerate(self.teams)}
+        self.power = np.append(np.asarray(power, dtype=float), DEFAULT_POWER)
+
+        self.quality, self.competitive, self.matchup = score_pairs(self.power[:, None], self.power[None, :])
+        self.tiers = tier_codes(self.matchup)
+
+    def positions(self, teams):
+        """Matrix positions for a sequence of teams (unranked teams -> last slot)"""
+        return pd.Series(teams).map(self.index).fillna(len(self.teams)).astype(int).to_numpy()
+
+    def lookup(self, away_teams, home_teams):
+        """Scores for many games at once, as a DataFrame aligned with the inputs"""
+        a = self.positions(away_teams)
+        h = self.positions(home_teams)
+        return pd.DataFrame({
+            'away_power': self.power[a],
+            'home_power': self.power[h],
+            'quality_score': self.quality[a, h],
+            'competitive_score': self.competitive[a, h],
+            'matchup_score': self.matchup[a, h],
+            'tier': tier_labels(self.tiers[a, h]),
+        })
+
+    def score(self, away_team, home_team):
+        """Scores for a single pairing, e.g. a hypothetical matchup"""
+        a = self.index.get(away_team, len(self.teams))
+        h = self.index.get(home_team, len(self.teams))
+        return {
+            'away_team': away_team,
+            'home_team': home_team,
+            'quality_score': float(self.quality[a, h]),
+            'competitive_score': float(self.competitive[a, h]),
+            'matchup_score': float(self.matchup[a, h]),
+            'tier': TIERS[self.tiers[a, h]],
+        }
+
+
+_cached_matrix = None
+
+
+def get_matchup_matrix(rankings_df, rating_col='power_score'):
+    """
+    Matrix for the current rankings, rebuilt only when the ratings change
+    """
+    global _cached_matrix
+
+    teams = tuple(rankings_df['team'])
+    power = tuple(rankings_df[rating_col].astype(float))
+    # Work on a local reference: leagues running in parallel threads each
+    # replace the cache, and must not return each other's matrix
+    cached = _cached_matrix
+    if cached is None or cached[0] != (teams, power):
+        cached = ((teams, power), MatchupMatrix(teams, power))
+        _cached_matrix = cached
+    return cached[1]
@@ -0,0 +1,126 @@
+"""
+Incremental power-ranking state shared by the NBA and NFL scripts
+Keeps per-team running sums and a watermark of the last processed game, so
+each run only folds in games completed since the previous one
+"""
+
+import json
+import os
+
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# Per-team running sums; team-game lines passed to fold() carry one value
+# of each for every team in every game
+SUM_COLUMNS = ['games', 'wins', 'losses', 'points_for', 'points_against', 'plus_minus']
+
+
+def read_watermark(path, season):
+    """
+    The saved watermark date in a state file, without loading the sums
+    None if the file is missing, unreadable or from another season; works
+    for the Elo state files too
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return saved.get('last_date') if saved.get('season') == str(season) else None
+
+
+class RankingState:
+    """
+    Running per-team sums for one season plus a watermark
+    The watermark is the date of the last processed game and the IDs of the
+    games already processed on that date, since a date can be folded in
+    before all of its games have finished
+    """
+
+    def __init__(self, season):
+        self.season = str(season)
+        self.last_date = None
+        self.last_date_game_ids = set()
+        self.sums = pd.DataFrame(columns=SUM_COLUMNS, dtype=float)
+        self.sums.index.name = 'team'
+
+    @classmethod
+    def load(cls, path, season):
+        """Load the saved state for `season`, or start empty if there is none"""
+        state = cls(season)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return state
+
+        # A new season starts from scratch
+        if saved.get('season') != state.season:
+            return state
+
+        state.last_date = saved.get('last_date')
+        state.last_date_game_ids = set(saved.get('last_date_game_ids', []))
+        state.sums = pd.DataFrame.from_dict(saved.get('teams', {}), orient='index',
+                                            columns=SUM_COLUMNS, dtype=float)
+        state.sums.index.name = 'team'
+        return state
+
+    def save(self, path):
+        """Write the state to `path` atomically"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        saved = {
+            'season': self.season,
+            'last_date': self.last_date,
+            'last_date_game_ids': sorted(self.last_date_game_ids),
+            'teams': self.sums.to_dict(orient='index'),
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(saved, f, indent=1)
+        os.replace(tmp_path, path)
+
+    def folded(self, games):
+        """
+        Mask of the rows of `games` (game_id, game_date as YYYY-MM-DD) that
+        are at or before the watermark, i.e. already in the running sums
+        """
+        if self.last_date is None:
+            return pd.Series(False, index=games.index)
+        return ((games['game_date'] < self.last_date) |
+                ((games['game_date'] == self.last_date) &
+                 games['game_id'].isin(self.last_date_game_ids)))
+
+    def fold(self, lines):
+        """
+        Add team-game lines that are past the watermark to the running sums
+        `lines` needs team, game_id, game_date (YYYY-MM-DD) and SUM_COLUMNS.
+        Returns the number of new games folded in.
+        """
+        lines = lines[~self.folded(lines)]
+        if lines.empty:
+            return 0
+
+        # Team columns may be categorical (see frames.py); the sums are keyed
+        # by plain team names
+        new_sums = lines.groupby('team', sort=False, observed=True)[SUM_COLUMNS].sum()
+        new_sums.index = new_sums.index.astype(str)
+
+        # Align both frames on the same team order (first seen first) so the
+        # sum keeps it rather than sorting the union
+        teams = list(self.sums.index) + [team for team in new_sums.index if team not in self.sums.index]
+        self.sums = self.sums.reindex(teams, fill_value=0) + new_sums.reindex(teams, fill_value=0)
+        self.sums.index.name = 'team'
+
+        last_date = lines['game_date'].max()
+        last_ids = set(lines.loc[lines['game_date'] == last_date, 'game_id'])
+        if last_date == self.last_date:
+            last_ids |= self.last_date_game_ids
+        self.last_date = last_date
+        self.last_date_game_ids = last_ids
+
+        return lines['game_id'].nunique()
+
+    def totals(self):
+        """Per-team running sums, indexed by team"""
+        return self.sums.copy()
@@ -0,0 +1,43 @@
+"""
+Rate limiting helpers shared by the API fetchers
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+    Refills at `rate` tokens per second and holds at most `capacity` tokens,
+    so a pool of workers can burst briefly but never exceeds the average rate
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def set_rate(self, rate):
+        """Change the refill rate, e.g. to back off while the upstream throttles"""
+        with self._lock:
+            self._refill()
+            self.rate = float(rate)
@@ -0,0 +1,79 @@
+"""
+Report output shared by the NBA and NFL scripts
+Each report is rendered in memory and every file is swapped into place
+atomically, so a crash mid-run never leaves a truncated report behind
+"""
+
+import json
+import os
+import tempfile
+
+REPORT_FORMATS = ('md', 'json', 'csv')
+
+# mkstemp creates files readable by the owner only; reports get the mode a
+# plain open() would give them. The umask can only be read by setting it,
+# so that happens once, at import, before any writer threads start.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write(path, text):
+    """Write `text` to a temp file next to `path`, then rename it over `path`"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _json_document(metadata, games_df, rankings_df):
+    """One JSON object holding the report metadata, games and rankings"""
+    header = json.dumps(metadata, default=str)[1:-1]
+    games = games_df.to_json(orient='records', date_format='iso')
+    rankings = rankings_df.to_json(orient='records')
+    return f'{{{header}, "games": {games}, "rankings": {rankings}}}\n'
+
+
+def report_paths(output_file, formats=REPORT_FORMATS):
+    """The files write_report_files() writes for `output_file` and `formats`"""
+    stem = os.path.splitext(output_file)[0]
+    paths = []
+    if 'md' in formats:
+        paths.append(output_file)
+    if 'json' in formats:
+        paths.append(f"{stem}.json")
+    if 'csv' in formats:
+        paths += [f"{stem}_games.csv", f"{stem}_rankings.csv"]
+    return paths
+
+
+def write_report_files(output_file, markdown, games_df, rankings_df, metadata, formats=REPORT_FORMATS):
+    """
+    Write the rendered Markdown report plus JSON and CSV copies of its data
+    `output_file` is the Markdown path; the other formats share its stem:
+    <stem>.json, <stem>_games.csv and <stem>_rankings.csv.
+    Returns the paths written.
+    """
+    stem = os.path.splitext(output_file)[0]
+    outputs = {}
+
+    if 'md' in formats:
+        outputs[output_file] = markdown
+    if 'json' in formats:
+        outputs[f"{stem}.json"] = _json_document(metadata, games_df, rankings_df)
+    if 'csv' in formats:
+        outputs[f"{stem}_games.csv"] = games_df.to_csv(index=False, date_format='%Y-%m-%d')
+        outputs[f"{stem}_rankings.csv"] = rankings_df.to_csv(index=False)
+
+    for path, text in outputs.items():
+        atomic_write(path, text)
+    return list(outputs)
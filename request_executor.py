@@ -0,0 +1,124 @@
+"""
+Request execution with retries, adaptive throttling and a circuit breaker
+Every live API call goes through one executor, which
+- retries timeouts, connection errors and 429/5xx responses with
+  exponential backoff and full jitter,
+- halves its request rate whenever the upstream throttles or times out and
+  creeps back up after successes,
+- stops calling the upstream for a while once failures pile up, so a run
+  against a dead API fails fast instead of waiting out every timeout
+"""
+
+import random
+import threading
+import time
+
+from lazy_imports import lazy_import
+from rate_limit import TokenBucket
+
+requests = lazy_import('requests')
+
+
+class UpstreamError(Exception):
+    """A response with an unexpected HTTP status or an unreadable body"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class CircuitOpen(Exception):
+    """Raised without calling the upstream while the circuit breaker is open"""
+
+
+def is_throttled(error):
+    """Timeouts and 429s mean we are going too fast for the upstream"""
+    return (isinstance(error, requests.exceptions.Timeout) or
+            (isinstance(error, UpstreamError) and error.status == 429))
+
+
+def is_retryable(error):
+    """Transient failures worth another attempt"""
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    if isinstance(error, UpstreamError):
+        return error.status is None or error.status == 429 or error.status >= 500
+    return False
+
+
+class RequestExecutor:
+    """
+    Runs request callables under a shared adaptive rate limit
+    max_attempts      -- tries per call, including the first
+    base_delay        -- backoff before the second attempt, doubled after each
+    failure_threshold -- consecutive failed attempts that open the circuit
+    reset_after       -- seconds the circuit stays open before one trial call
+    """
+
+    def __init__(self, rate, burst=1, min_rate=0.2, max_attempts=4, base_delay=1.0, max_delay=30.0,
+                 failure_threshold=5, reset_after=60.0, metrics=None):
+        self.max_rate = float(rate)
+        self.min_rate = float(min_rate)
+        self.limiter = TokenBucket(rate, capacity=burst)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+
+    @property
+    def circuit_open(self):
+        return self._opened_at is not None
+
+    def _check_circuit(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_after:
+                raise CircuitOpen(f"upstream unavailable after {self._failures} consecutive failures")
+            # Half-open: let this call through as a trial; a failure reopens
+            self._opened_at = None
+            self._failures = self.failure_threshold - 1
+
+    def _on_success(self):
+        with self._lock:
+            self._failures = 0
+            # Additive increase back toward the configured rate
+            self.limiter.set_rate(min(self.max_rate, self.limiter.rate + 0.1 * self.max_rate))
+
+    def _on_failure(self, error):
+        with self._lock:
+            self._failures += 1
+            if is_throttled(error):
+                # Multiplicative decrease while the upstream pushes back
+                self.limiter.set_rate(max(self.min_rate, self.limiter.rate / 2))
+            if self._failures >= self.failure_threshold and self._opened_at is None:
+                self._opened_at = time.monotonic()
+                print(f"  ⚠️  Circuit breaker open: pausing requests for {self.reset_after:.0f}s")
+            return self._opened_at is not None
+
+    def call(self, request, description=''):
+        """Run `request()` with retries; raises the last error or CircuitOpen"""
+        for attempt in range(1, self.max_attempts + 1):
+            self._check_circuit()
+            self.limiter.acquire()
+            try:
+                result = request()
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                tripped = self._on_failure(e)
+                if tripped or attempt == self.max_attempts:
+                    raise
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+                print(f"  Retrying {description} in {delay:.1f}s ({type(e).__name__}: {str(e)[:80]})")
+                if self.metrics is not None:
+                    self.metrics.record_retry()
+                time.sleep(delay)
+                continue
+            self._on_success()
+            return result
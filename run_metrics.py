@@ -0,0 +1,164 @@
+"""
+Run instrumentation shared by the NBA and NFL scripts
+Records per-stage wall time, HTTP calls and bytes, retries, errors, peak
+memory and the size of the main data frames, and writes them as a JSON run
+summary. An optional cProfile capture covers the whole run.
+"""
+
+import cProfile
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from report_writer import atomic_write
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, in MB (None if unknown)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class RunMetrics:
+    """
+    Counters for one run, grouped by stage
+    HTTP and retry counts recorded outside any stage (e.g. from worker
+    threads) go to the stage that is currently open.
+    """
+
+    def __init__(self, league):
+        self.league = league
+        self.import_seconds = None  # set by the script once its imports are done
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start a new run"""
+        self.started = datetime.now()
+        self._start = time.perf_counter()
+        self.stages = {}
+        self.current = None
+        self.errors = []
+        self.frames = {}
+        self.status = 'running'
+
+    def _counters(self, name):
+        return self.stages.setdefault(name, {
+            'seconds': 0.0, 'http_calls': 0, 'http_bytes': 0, 'cache_hits': 0,
+            'retries': 0, 'errors': 0, 'peak_rss_mb': None,
+        })
+
+    @contextmanager
+    def stage(self, name):
+        """Time a stage and attribute the counters recorded inside it"""
+        previous = self.current
+        self.current = name
+        counters = self._counters(name)
+        start = time.perf_counter()
+        try:
+            yield counters
+        finally:
+            counters['seconds'] += time.perf_counter() - start
+            counters['peak_rss_mb'] = peak_rss_mb()
+            self.current = previous
+
+    def record_request(self, nbytes=0, cached=False):
+        """Count one HTTP call (or a response served from the cache)"""
+        with self._lock:
+            counters = self._counters(self.current or 'other')
+            if cached:
+                counters['cache_hits'] += 1
+            else:
+                counters['http_calls'] += 1
+                counters['http_bytes'] += nbytes
+
+    def record_retry(self):
+        with self._lock:
+            self._counters(self.current or 'other')['retries'] += 1
+
+    def record_error(self, error, context=None):
+        """Keep an exception that was handled and skipped over"""
+        with self._lock:
+            self._counters(self.current or 'other')['errors'] += 1
+            self.errors.append({
+                'stage': self.current,
+                'context': context,
+                'type': type(error).__name__,
+                'message': str(error),
+            })
+
+    def record_frame(self, name, frame):
+        """Note the shape and memory of a DataFrame the run holds on to"""
+        with self._lock:
+            self.frames[name] = {
+                'rows': len(frame),
+                'columns': len(frame.columns),
+                'mb': round(float(frame.memory_usage(deep=True).sum()) / (1024 * 1024), 3),
+            }
+
+    def summary(self):
+        """The run summary as a JSON-ready dict"""
+        totals = {key: sum(stage[key] for stage in self.stages.values())
+                  for key in ['http_calls', 'http_bytes', 'cache_hits', 'retries', 'errors']}
+        return {
+            'league': self.league,
+            'started': self.started.isoformat(timespec='seconds'),
+            'status': self.status,
+            'wall_seconds': round(time.perf_counter() - self._start, 3),
+            'import_seconds': None if self.import_seconds is None else round(self.import_seconds, 3),
+            'peak_rss_mb': peak_rss_mb(),
+            **totals,
+            'stages': self.stages,
+            'frames': self.frames,
+            'errors': self.errors,
+        }
+
+    def write(self, path):
+        """Write the run summary to `path` as JSON"""
+        atomic_write(path, json.dumps(self.summary(), indent=1) + '\n')
+        return path
+
+    def print_summary(self):
+        """One line per stage, for the job log"""
+        summary = self.summary()
+        if summary['import_seconds'] is not None:
+            print(f"⏱️  {'import':<10} {summary['import_seconds']:6.1f}s")
+        for name, stage in summary['stages'].items():
+            line = f"⏱️  {name:<10} {stage['seconds']:6.1f}s"
+            if stage['http_calls'] or stage['cache_hits']:
+                line += (f"  {stage['http_calls']} HTTP calls ({stage['http_bytes'] / 1024:.0f} KB),"
+                         f" {stage['cache_hits']} cached")
+            if stage['retries'] or stage['errors']:
+                line += f"  {stage['retries']} retries, {stage['errors']} errors"
+            print(line)
+        for name, frame in summary['frames'].items():
+            print(f"⏱️  {name:<10} {frame['rows']:,} rows x {frame['columns']} columns, {frame['mb']:.2f} MB in memory")
+        peak = f", peak memory {summary['peak_rss_mb']:.0f} MB" if summary['peak_rss_mb'] else ""
+        print(f"⏱️  Total wall-clock time: {summary['wall_seconds']:.1f}s{peak}")
+
+
+@contextmanager
+def profiled(path=None):
+    """Capture a cProfile dump of the enclosed block to `path` (no-op if None)"""
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"\n✅ Profile written to: {path}")
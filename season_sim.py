@@ -0,0 +1,145 @@
+"""
+Vectorized Monte Carlo season simulator
+Turns the remaining schedule and current power scores into per-game win
+probabilities, then plays out many seasons at once as array operations:
+one uniform draw per (simulation, game) and one matrix product per chunk
+to tally wins. Produces final-record distributions, playoff odds and
+seeding odds for every team
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from lazy_imports import lazy_import
+from matchup_matrix import DEFAULT_POWER
+from report_writer import atomic_write
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+POWER_SCALE = 10.0  # power-score gap that turns even odds into ~73/27
+HOME_EDGE = 2.0     # home advantage, in power-score points
+CHUNK_SIZE = 5000   # simulations per array operation; bounds peak memory
+
+
+def win_probabilities(home_power, away_power, home_edge=HOME_EDGE, scale=POWER_SCALE):
+    """Logistic home-win probability from the power-score gap"""
+    gap = np.asarray(home_power, dtype=float) - np.asarray(away_power, dtype=float) + home_edge
+    return 1 / (1 + np.exp(-gap / scale))
+
+
+def _simulate_chunk(n_sims, seed, current_wins, home_idx, away_idx, home_prob, conferences):
+    """
+    Play `n_sims` seasons and tally final wins and conference seeds
+    Returns (win_hist, seed_counts): per-team histograms of final wins and
+    of finishing seed within the team's conference
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(current_wins)
+    n_games = len(home_idx)
+    max_wins = int(current_wins.max()) + n_games
+
+    # (games x teams) one-hot home and away indicators
+    home_onehot = np.zeros((n_games, n_teams), dtype=np.float32)
+    away_onehot = np.zeros((n_games, n_teams), dtype=np.float32)
+    home_onehot[np.arange(n_games), home_idx] = 1
+    away_onehot[np.arange(n_games), away_idx] = 1
+
+    win_hist = np.zeros((n_teams, max_wins + 1), dtype=np.int64)
+    seed_counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+
+    for start in range(0, n_sims, CHUNK_SIZE):
+        size = min(CHUNK_SIZE, n_sims - start)
+        home_wins = (rng.random((size, n_games)) < home_prob).astype(np.float32)
+        wins = current_wins + home_wins @ home_onehot + (1 - home_wins) @ away_onehot
+        wins = wins.round().astype(np.int64)
+
+        # Final-record distribution: one bincount over (team, wins) cells
+        cells = wins + np.arange(n_teams) * (max_wins + 1)
+        win_hist += np.bincount(cells.ravel(), minlength=n_teams * (max_wins + 1)).reshape(n_teams, -1)
+
+        # Seeds within each conference, ties broken at random
+        sort_key = wins + rng.random(wins.shape) * 0.5
+        for members in conferences:
+            order = np.argsort(-sort_key[:, members], axis=1)
+            seeds = np.argsort(order, axis=1)  # 0 = top seed
+            onehot = seeds[:, :, None] == np.arange(len(members))
+            seed_counts[np.ix_(members, np.arange(len(members)))] += onehot.sum(axis=0)
+
+    return win_hist, seed_counts
+
+
+def simulate_season(teams, current_wins, remaining_games, power, conferences,
+                    cutoffs, n_sims=50000, max_workers=1, seed=None):
+    """
+    Simulate the rest of a season `n_sims` times
+    teams           -- team abbreviations
+    current_wins    -- wins so far, aligned with `teams`
+    remaining_games -- DataFrame with home_team and away_team columns
+    power           -- {team: power score}; missing teams use DEFAULT_POWER
+    conferences     -- {conference name: [teams]} used for seeding
+    cutoffs         -- {column name: seed}, e.g. {'playoff_odds': 6}
+    max_workers > 1 splits the simulations across processes.
+    Returns (odds_df, win_distribution_df).
+    """
+    teams = list(teams)
+    index = {team: i for i, team in enumerate(teams)}
+    current_wins = np.asarray(current_wins, dtype=np.float32)
+
+    remaining_games = remaining_games[remaining_games['home_team'].isin(index) &
+                                      remaining_games['away_team'].isin(index)]
+    home_idx = remaining_games['home_team'].map(index).to_numpy(dtype=np.int64)
+    away_idx = remaining_games['away_team'].map(index).to_numpy(dtype=np.int64)
+    power_array = np.array([power.get(team, DEFAULT_POWER) for team in teams], dtype=float)
+    home_prob = win_probabilities(power_array[home_idx], power_array[away_idx])
+
+    conference_of = {team: name for name, members in conferences.items() for team in members}
+    conference_members = [np.array([index[team] for team in members if team in index])
+                          for members in conferences.values()]
+
+    # Independent random streams per worker
+    workers = max(1, max_workers or 1)
+    sims_per_worker = [n_sims // workers + (1 if i < n_sims % workers else 0) for i in range(workers)]
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    args = (current_wins, home_idx, away_idx, home_prob, conference_members)
+
+    if workers == 1:
+        results = [_simulate_chunk(n_sims, seeds[0], *args)]
+    else:
+        # Spawned rather than forked: this can run in a worker thread (matchrank
+        # all), and forking a multi-threaded process can deadlock on a lock
+        # another thread holds
+        spawn = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=spawn) as executor:
+            results = list(executor.map(_simulate_chunk, sims_per_worker, seeds, *[[arg] * workers for arg in args]))
+
+    win_hist = sum(result[0] for result in results)
+    seed_counts = sum(result[1] for result in results)
+
+    win_distribution = pd.DataFrame(win_hist / n_sims, index=pd.Index(teams, name='team'))
+    win_distribution.columns.name = 'wins'
+
+    cumulative = win_hist.cumsum(axis=1) / n_sims
+    odds_df = pd.DataFrame({
+        'team': teams,
+        'conference': [conference_of.get(team) for team in teams],
+        'current_wins': current_wins.astype(int),
+        'mean_wins': (win_hist * np.arange(win_hist.shape[1])).sum(axis=1) / n_sims,
+        'wins_p10': (cumulative >= 0.10).argmax(axis=1),
+        'wins_p90': (cumulative >= 0.90).argmax(axis=1),
+    })
+    seed_odds = seed_counts / n_sims
+    for column, cutoff in cutoffs.items():
+        odds_df[column] = seed_odds[:, :cutoff].sum(axis=1)
+    max_seeds = max(len(members) for members in conference_members)
+    for seed_number in range(max_seeds):
+        odds_df[f'seed_{seed_number + 1}'] = seed_odds[:, seed_number]
+
+    odds_df = odds_df.sort_values(['conference', 'mean_wins'], ascending=[True, False]).reset_index(drop=True)
+    return odds_df, win_distribution
+
+
+def write_odds_file(odds_df, path):
+    """Write the simulated season odds as CSV, atomically"""
+    atomic_write(path, odds_df.to_csv(index=False, float_format='%.4f'))
+    return path
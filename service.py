@@ -0,0 +1,259 @@
+"""
+Long-running service mode: rankings and matchups served from memory
+A loader (by default one pass of a league's fetch, ranking and matchup
+stages) runs on a background asyncio schedule. Each result is turned into a
+Snapshot holding everything the queries need, already indexed, and swapped
+in whole, so requests never recompute anything and never see a half-built
+refresh. Endpoints (all GET, JSON):
+
+    /health                        refresh and request counters, last run metrics
+    /rankings                      current power rankings
+    /matchups?date=YYYY-MM-DD&limit=N  games on a date, best matchup first
+    /score?away=TEAM&home=TEAM     scores for any pairing, scheduled or not
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+from lazy_imports import lazy_import
+from matchup_matrix import MatchupMatrix
+
+pd = lazy_import('pandas')
+
+REFRESH_SECONDS = 15 * 60
+MAX_REQUEST_BYTES = 8192
+
+
+def league_loader(module, days_ahead=7, rating_col='power_score', full_rebuild=False):
+    """
+    Loader running one league module's fetch, ranking and matchup stages
+    Rankings are folded in incrementally from the saved state, as in a
+    normal run (full_rebuild=True recomputes them every time), and the
+    stages are recorded in the module's RUN_METRICS. A refresh that ends
+    without rankings raises, so the service keeps its previous snapshot.
+    """
+    def load():
+        metrics = module.RUN_METRICS
+        metrics.reset()
+        try:
+            with metrics.stage('fetch'):
+                games_df = module.get_games_by_date_range(days_ahead=days_ahead)
+            with metrics.stage('rank'):
+                rankings_df = module.calculate_power_rankings(full_rebuild=full_rebuild)
+            if rankings_df.empty:
+                raise RuntimeError("no rankings could be calculated")
+            if not games_df.empty:
+                with metrics.stage('analyze'):
+                    games_df = module.analyze_matchups(games_df, rankings_df, rating_col=rating_col)
+        except Exception as e:
+            metrics.status = 'failed'
+            metrics.record_error(e, 'refresh')
+            raise
+        metrics.status = 'ok'
+        return games_df, rankings_df
+    return load
+
+
+def _records(df):
+    """DataFrame rows as JSON-ready dicts"""
+    return json.loads(df.to_json(orient='records', date_format='iso'))
+
+
+class Snapshot:
+    """Rankings, games and the all-pairs matchup matrix from one refresh"""
+
+    def __init__(self, games_df, rankings_df, rating_col='power_score'):
+        self.loaded_at = datetime.now()
+        self.rankings = _records(rankings_df)
+        self.ranks = dict(zip(rankings_df['team'], rankings_df['rank'].astype(int).tolist())) \
+            if not rankings_df.empty else {}
+        self.matrix = MatchupMatrix(rankings_df['team'], rankings_df[rating_col]) \
+            if not rankings_df.empty else None
+
+        # Games grouped by date, each day already sorted best matchup first
+        self.games_by_date = {}
+        self.game_count = len(games_df)
+        if not games_df.empty:
+            # NBA games carry game_date, NFL games gameday
+            date_col = 'game_date' if 'game_date' in games_df else 'gameday'
+            games_df = games_df.assign(game_date=pd.to_datetime(games_df[date_col]).dt.strftime('%Y-%m-%d'))
+            if 'matchup_score' in games_df:
+                games_df = games_df.sort_values(['game_date', 'matchup_score'], ascending=[True, False])
+            for game in _records(games_df):
+                self.games_by_date.setdefault(game['game_date'], []).append(game)
+
+
+class MatchupService:
+    """
+    In-memory rankings and matchups for one league, refreshed in the background
+    `loader` is any callable returning (games_df, rankings_df) with the
+    columns analyze_matchups() produces, so tests can serve fixture data
+    without touching the league scripts or the network. `metrics` is an
+    optional RunMetrics filled in by the loader; its summary is copied at
+    the end of each refresh and reported under /health.
+    """
+
+    def __init__(self, league, loader, refresh_seconds=REFRESH_SECONDS, rating_col='power_score',
+                 metrics=None):
+        self.league = league
+        self.loader = loader
+        self.refresh_seconds = refresh_seconds
+        self.rating_col = rating_col
+        self.metrics = metrics
+        self.snapshot = None
+        self.started = datetime.now()
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.last_error = None
+        self.last_refresh_seconds = None
+        self.last_run = None
+        self.address = None
+        self.requests = 0
+        self.request_seconds = 0.0
+
+    def _load_snapshot(self):
+        games_df, rankings_df = self.loader()
+        return Snapshot(games_df, rankings_df, self.rating_col)
+
+    async def refresh(self):
+        """Run the loader in a worker thread and swap in the new snapshot"""
+        start = time.perf_counter()
+        try:
+            snapshot = await asyncio.to_thread(self._load_snapshot)
+        except Exception as e:
+            # Keep serving the previous snapshot
+            self.refresh_errors += 1
+            self.last_error = f"{type(e).__name__}: {str(e)}"
+            print(f"❌ {self.league} refresh failed: {str(e)}")
+            return False
+        finally:
+            # Copied once the loader is done: it fills in the metrics from a
+            # worker thread, so /health must not read them while it runs
+            if self.metrics is not None:
+                self.last_run = self.metrics.summary()
+        self.snapshot = snapshot
+        self.refreshes += 1
+        self.last_refresh_seconds = time.perf_counter() - start
+        print(f"✅ {self.league} refreshed: {len(snapshot.rankings)} teams, {snapshot.game_count} games "
+              f"in {self.last_refresh_seconds:.1f}s")
+        return True
+
+    async def refresh_forever(self):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            await self.refresh()
+
+    # Queries: plain functions of the current snapshot, no I/O
+
+    def health(self, query):
+        snapshot = self.snapshot
+        return 200, {
+            'league': self.league,
+            'status': 'ok' if snapshot is not None else 'starting',
+            'started': self.started.isoformat(timespec='seconds'),
+            'loaded_at': snapshot.loaded_at.isoformat(timespec='seconds') if snapshot else None,
+            'age_seconds': round((datetime.now() - snapshot.loaded_at).total_seconds(), 1) if snapshot else None,
+            'teams': len(snapshot.rankings) if snapshot else 0,
+            'games': snapshot.game_count if snapshot else 0,
+            'refreshes': self.refreshes,
+            'refresh_errors': self.refresh_errors,
+            'last_error': self.last_error,
+            'last_refresh_seconds': self.last_refresh_seconds,
+            'requests': self.requests,
+            'mean_request_ms': round(1000 * self.request_seconds / self.requests, 4) if self.requests else None,
+            'last_run': self.last_run,
+        }
+
+    def rankings(self, query):
+        return 200, {'league': self.league, 'rankings': self.snapshot.rankings}
+
+    def matchups(self, query):
+        date = query.get('date', datetime.now().strftime('%Y-%m-%d'))
+        games = self.snapshot.games_by_date.get(date, [])
+        try:
+            limit = int(query['limit']) if 'limit' in query else None
+        except ValueError:
+            return 400, {'error': "limit must be an integer"}
+        return 200, {'league': self.league, 'date': date, 'games': games[:limit]}
+
+    def score(self, query):
+        away, home = query.get('away'), query.get('home')
+        if not away or not home:
+            return 400, {'error': "away and home are required"}
+        snapshot = self.snapshot
+        unknown = [team for team in (away, home) if team not in snapshot.ranks]
+        if unknown:
+            return 404, {'error': f"unranked team(s): {', '.join(unknown)}"}
+        result = snapshot.matrix.score(away, home)
+        result['away_rank'] = snapshot.ranks[away]
+        result['home_rank'] = snapshot.ranks[home]
+        return 200, result
+
+    ROUTES = {'/health': health, '/metrics': health, '/rankings': rankings,
+              '/matchups': matchups, '/score': score}
+
+    def handle(self, target):
+        """Answer one request target (path plus query string); returns (status, payload)"""
+        start = time.perf_counter()
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        route = self.ROUTES.get(url.path.rstrip('/') or '/')
+        if route is None:
+            status, payload = 404, {'error': f"unknown path {url.path}"}
+        elif self.snapshot is None and route is not MatchupService.health:
+            status, payload = 503, {'error': "first refresh has not finished"}
+        else:
+            status, payload = route(self, query)
+        self.requests += 1
+        self.request_seconds += time.perf_counter() - start
+        return status, payload
+
+    # HTTP: just enough HTTP/1.1 for GET requests, one per connection
+
+    async def _serve_client(self, reader, writer):
+        try:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+                method, target, _ = head.split(b'\r\n', 1)[0].decode('latin-1').split(' ', 2)
+                if method != 'GET':
+                    status, payload = 405, {'error': "only GET is supported"}
+                else:
+                    status, payload = self.handle(target)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+                status, payload = 400, {'error': "malformed request"}
+            except ConnectionError:
+                raise
+            except Exception as e:
+                print(f"❌ {self.league} request failed: {str(e)}")
+                status, payload = 500, {'error': f"internal error ({type(e).__name__})"}
+
+            body = json.dumps(payload).encode('utf-8')
+            writer.write(
+                f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode('latin-1') + body
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass  # the client hung up; there is no one left to answer
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        """Load once, then serve and refresh until cancelled"""
+        server = await asyncio.start_server(self._serve_client, host, port, limit=MAX_REQUEST_BYTES)
+        # The bound address, e.g. the actual port when port=0 picks a free one
+        self.address = server.sockets[0].getsockname()[:2]
+        print(f"✅ Serving {self.league} on http://{self.address[0]}:{self.address[1]} "
+              f"(refresh every {self.refresh_seconds:.0f}s)")
+        await self.refresh()
+        refresher = asyncio.create_task(self.refresh_forever())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            refresher.cancel()
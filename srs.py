@@ -0,0 +1,167 @@
+"""
+Strength-of-schedule adjusted ratings (Simple Rating System / Massey)
+Every completed game says that the home team's rating minus the away
+team's, plus home advantage, should equal the home margin. The season's
+games form a sparse least-squares system, one row per game and one column
+per team, solved with scipy's LSQR starting from the previous solution, so
+a daily re-solve after a few new games takes a handful of iterations. A
+rating is points per game better than an average team, after accounting
+for who the team played.
+"""
+
+import json
+import os
+
+from lazy_imports import lazy_import
+from matchup_matrix import DEFAULT_POWER
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+sparse = lazy_import('scipy.sparse')
+sparse_linalg = lazy_import('scipy.sparse.linalg')
+
+SRS_PER_POWER_POINT = 0.4  # rating points per power-score point when scoring matchups
+SOLVE_TOLERANCE = 1e-8
+
+GAME_COLUMNS = ['game_id', 'game_date', 'home_team', 'away_team', 'margin']
+
+
+def srs_to_power(srs):
+    """Map SRS ratings onto the 0-100 power-score scale used for matchups"""
+    return DEFAULT_POWER + np.asarray(srs, dtype=float) / SRS_PER_POWER_POINT
+
+
+def design_matrix(home_idx, away_idx, n_teams):
+    """
+    Sparse system matrix: one row per game with +1 for the home team, -1 for
+    the away team and +1 in the last (home advantage) column, then one row
+    of ones over the teams that pins the average rating to zero
+    """
+    n_games = len(home_idx)
+    game_rows = np.arange(n_games)
+    rows = np.concatenate([game_rows, game_rows, game_rows, np.full(n_teams, n_games)])
+    cols = np.concatenate([home_idx, away_idx, np.full(n_games, n_teams), np.arange(n_teams)])
+    values = np.concatenate([np.ones(n_games), -np.ones(n_games), np.ones(n_games), np.ones(n_teams)])
+    return sparse.csr_matrix((values, (rows, cols)), shape=(n_games + 1, n_teams + 1))
+
+
+class SRSRatings:
+    """
+    SRS ratings plus the season's games they are solved from
+    margin_cap -- home margins are clipped to +/- this many points, so one
+                  blowout does not outweigh several close wins (None: no cap)
+    """
+
+    def __init__(self, season, margin_cap=None):
+        self.season = str(season)
+        self.margin_cap = margin_cap
+        self.teams = []
+        self.index = {}
+        self.ratings = np.zeros(0)
+        self.home_advantage = 0.0
+        self.games = pd.DataFrame(columns=GAME_COLUMNS)
+        self.iterations = 0
+
+    @property
+    def last_date(self):
+        """Date of the latest game folded in (YYYY-MM-DD), None if there are none"""
+        return self.games['game_date'].max() if not self.games.empty else None
+
+    @classmethod
+    def load(cls, path, season, **params):
+        """
+        Load the saved ratings and games, or start empty if there are none
+        Ratings saved for an earlier season are kept only as the starting
+        point of the first solve; their games are dropped
+        """
+        srs = cls(season, **params)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return srs
+
+        srs.teams = list(saved.get('ratings', {}))
+        srs.index = {team: i for i, team in enumerate(srs.teams)}
+        srs.ratings = np.array(list(saved.get('ratings', {}).values()), dtype=float)
+        srs.home_advantage = saved.get('home_advantage', 0.0)
+
+        if saved.get('season') == srs.season:
+            srs.games = pd.DataFrame(saved.get('games', {}), columns=GAME_COLUMNS)
+        return srs
+
+    def save(self, path):
+        """Write the ratings and games to `path` atomically"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        saved = {
+            'season': self.season,
+            'last_date': self.last_date,
+            'home_advantage': self.home_advantage,
+            'ratings': dict(zip(self.teams, self.ratings.tolist())),
+            'games': {col: self.games[col].tolist() for col in GAME_COLUMNS},
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(saved, f)
+        os.replace(tmp_path, path)
+
+    def _slot(self, team):
+        """Column for `team`, adding it at an average rating if it is new"""
+        i = self.index.get(team)
+        if i is None:
+            i = len(self.teams)
+            self.teams.append(team)
+            self.index[team] = i
+            self.ratings = np.append(self.ratings, 0.0)
+        return i
+
+    def update(self, games):
+        """
+        Add completed games not seen before
+        `games` needs game_id, game_date (YYYY-MM-DD), home_team, away_team,
+        home_score and away_score. Returns the number of games added.
+        """
+        new = games[~games['game_id'].astype(str).isin(self.games['game_id'])]
+        if new.empty:
+            return 0
+        margin = new['home_score'].to_numpy(dtype=float) - new['away_score'].to_numpy(dtype=float)
+        if self.margin_cap is not None:
+            margin = np.clip(margin, -self.margin_cap, self.margin_cap)
+
+        new = pd.DataFrame({
+            'game_id': new['game_id'].astype(str).to_numpy(),
+            'game_date': new['game_date'].to_numpy(),
+            'home_team': new['home_team'].astype(str).to_numpy(),
+            'away_team': new['away_team'].astype(str).to_numpy(),
+            'margin': margin,
+        })
+        self.games = pd.concat([self.games, new], ignore_index=True) if not self.games.empty else new
+        return len(new)
+
+    def solve(self):
+        """
+        Solve for the ratings and home advantage, warm-started from the
+        current ones; returns the number of LSQR iterations
+        While the games do not yet connect every team, the directions they
+        leave open keep their previous values
+        """
+        if self.games.empty:
+            return 0
+        for team in pd.unique(pd.concat([self.games['home_team'], self.games['away_team']])):
+            self._slot(team)
+        home_idx = self.games['home_team'].map(self.index).to_numpy(dtype=np.int64)
+        away_idx = self.games['away_team'].map(self.index).to_numpy(dtype=np.int64)
+
+        system = design_matrix(home_idx, away_idx, len(self.teams))
+        margins = np.append(self.games['margin'].to_numpy(dtype=float), 0.0)
+        start = np.append(self.ratings, self.home_advantage)
+        solution, _, self.iterations = sparse_linalg.lsqr(
+            system, margins, x0=start, atol=SOLVE_TOLERANCE, btol=SOLVE_TOLERANCE)[:3]
+
+        self.ratings = solution[:-1]
+        self.home_advantage = float(solution[-1])
+        return self.iterations
+
+    def to_series(self):
+        """Ratings indexed by team"""
+        return pd.Series(self.ratings, index=pd.Index(self.teams, name='team'), name='srs')
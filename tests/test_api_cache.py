@@ -0,0 +1,59 @@
+import os
+import time
+
+import pytest
+
+import NBAMatchups
+from api_cache import CacheMiss, ResponseCache
+
+
+def test_entries_expire_after_their_ttl(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path))
+    cache.put('today', 'scores', ttl=60)
+    cache.put('final', 'box score')
+    assert cache.get('today') == 'scores'
+
+    later = time.time() + 120
+    monkeypatch.setattr(time, 'time', lambda: later)
+    assert cache.get('today') is None
+    assert cache.get('today', allow_expired=True) == 'scores'
+    assert cache.get('final') == 'box score'
+
+    # Offline runs serve whatever is cached, expired or not
+    assert ResponseCache(str(tmp_path), offline=True).get('today') == 'scores'
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    payload = 'x' * 1000
+    cache = ResponseCache(str(tmp_path), max_bytes=3500)
+    for i, key in enumerate(['a', 'b', 'c']):
+        cache.put(key, payload)
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    cache.get('a')  # now the most recently used
+
+    listed = []
+    listdir = os.listdir
+    monkeypatch.setattr(os, 'listdir', lambda path: listed.append(path) or listdir(path))
+    cache.put('d', payload)
+
+    assert listed == [str(tmp_path)]
+    assert cache.get('b') is None
+    assert [cache.get(key) for key in ['a', 'c', 'd']] == [payload] * 3
+
+    # Replacing an entry does not grow the cache, and puts below the cap
+    # do not list the directory
+    cache.put('d', payload)
+    assert listed == [str(tmp_path)]
+
+
+def test_offline_miss_never_calls_upstream(tmp_path, monkeypatch):
+    class Endpoint:
+        endpoint = 'scoreboardv2'
+
+    def call(*args, **kwargs):
+        raise AssertionError('offline mode sent a request')
+
+    monkeypatch.setattr(NBAMatchups, 'RESPONSE_CACHE', ResponseCache(str(tmp_path), offline=True))
+    monkeypatch.setattr(NBAMatchups.REQUEST_EXECUTOR, 'call', call)
+    with pytest.raises(CacheMiss):
+        NBAMatchups.call_endpoint(Endpoint, GameDate='2026-01-10')
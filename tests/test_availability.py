@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from availability import adjust_power, team_availability
+
+GAME_DATES = pd.date_range('2026-01-01', periods=20, freq='2D')
+
+
+def _logs(players):
+    """BOS box scores: `players` maps name -> the team games (0-19) played, 30 minutes each"""
+    return pd.DataFrame([
+        {'PLAYER_ID': player_id, 'PLAYER_NAME': name, 'TEAM_ABBREVIATION': 'BOS',
+         'GAME_ID': f'g{game}', 'GAME_DATE': GAME_DATES[game], 'MIN': 30.0,
+         'PTS': 20, 'REB': 5, 'AST': 5, 'STL': 1, 'BLK': 1, 'TOV': 2}
+        for player_id, (name, games) in enumerate(players.items(), start=1)
+        for game in games
+    ])
+
+
+def _roster(logs, except_names=()):
+    signed = logs[~logs['PLAYER_NAME'].isin(except_names)].drop_duplicates('PLAYER_ID')
+    return pd.DataFrame({'team': signed['TEAM_ABBREVIATION'], 'player_id': signed['PLAYER_ID']})
+
+
+def test_recently_missing_rotation_players_are_out():
+    logs = _logs({
+        'Ever Present': range(20),
+        'Missed Two': range(18),
+        'Missed One': range(19),
+        'Out For Season': range(3),
+        'Waived': range(17),
+    })
+
+    availability = team_availability(logs, roster=_roster(logs, except_names=['Waived']))
+
+    # Only the recent absentee still on the roster is out; the long absence
+    # and the waived player are no longer counted in the rotation. Impact is
+    # production per team game, so Missed Two's share is 18 of 20 + 18 + 19.
+    assert availability.loc['BOS', 'out'] == 'Missed Two'
+    assert availability.loc['BOS', 'strength'] == pytest.approx(1 - 18 / 57)
+
+
+def test_without_a_roster_every_recent_absentee_is_out():
+    logs = _logs({'Ever Present': range(20), 'Missed Two': range(18), 'Waived': range(17)})
+
+    availability = team_availability(logs)
+
+    assert set(availability.loc['BOS', 'out'].split(', ')) == {'Missed Two', 'Waived'}
+
+
+def test_adjust_power_scales_with_the_missing_share():
+    power = pd.Series([60.0, 60.0, 10.0])
+    strength = pd.Series([1.0, 0.6, float('nan')])
+    assert adjust_power(power, strength).tolist() == [60.0, 50.0, 10.0]
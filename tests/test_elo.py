@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from elo import ELO_MEAN, EloRatings
+from frames import compact
+
+GAMES = pd.DataFrame({
+    'game_id': ['g1', 'g2', 'g3', 'g4'],
+    'game_date': ['2025-09-07', '2025-09-07', '2025-09-14', '2025-09-14'],
+    'home_team': ['KC', 'BUF', 'KC', 'DET'],
+    'away_team': ['BAL', 'DET', 'BUF', 'BAL'],
+    'home_score': [27, 20, 31, 17],
+    'away_score': [20, 24, 28, 17],
+})
+
+# How the NFL schedule frame stores these columns (see frames.py)
+COMPACT_DTYPES = {'game_id': None, 'game_date': None, 'home_team': None, 'away_team': None,
+                  'home_score': 'Int16', 'away_score': 'Int16'}
+
+
+def test_update_with_compact_frame():
+    games = compact(GAMES, COMPACT_DTYPES, teams=['home_team', 'away_team'])
+    assert isinstance(games['home_team'].dtype, pd.CategoricalDtype)
+
+    compact_elo = EloRatings('2025')
+    assert compact_elo.update(games) == 4
+    plain_elo = EloRatings('2025')
+    plain_elo.update(GAMES)
+
+    assert compact_elo.to_series().to_dict() == plain_elo.to_series().to_dict()
+    assert compact_elo.last_date == '2025-09-14'
+    # Ratings are zero-sum around the mean
+    assert np.isclose(compact_elo.ratings.mean(), ELO_MEAN)
+
+
+def test_update_skips_games_already_applied():
+    games = compact(GAMES, COMPACT_DTYPES, teams=['home_team', 'away_team'])
+    elo = EloRatings('2025')
+    elo.update(games.iloc[:3])
+    assert elo.update(games) == 1
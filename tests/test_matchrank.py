@@ -0,0 +1,32 @@
+import io
+import sys
+import threading
+
+import NBAMatchups
+import matchrank
+
+
+def test_fetch_pool_output_keeps_the_league_prefix(monkeypatch):
+    def fetch_day(check_date, today, team_map):
+        raise RuntimeError('scoreboard unavailable')
+
+    monkeypatch.setattr(NBAMatchups, 'get_team_index', lambda: (set(), {}))
+    monkeypatch.setattr(NBAMatchups, '_fetch_scoreboard_day', fetch_day)
+    monkeypatch.setattr(NBAMatchups.RUN_METRICS, 'errors', [])
+
+    stream = io.StringIO()
+    output = matchrank._LeagueOutput(stream)
+    monkeypatch.setattr(sys, 'stdout', output)
+
+    def run():
+        output.set_prefix('[NBA] ')
+        NBAMatchups.get_games_by_date_range(days_ahead=2, fetch_mode='concurrent', max_workers=2)
+        output.close_thread()
+
+    league = threading.Thread(target=run)
+    league.start()
+    league.join()
+
+    lines = stream.getvalue().splitlines()
+    assert sum('Error for' in line for line in lines) == 3
+    assert all(line.startswith('[NBA] ') for line in lines)
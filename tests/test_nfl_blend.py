@@ -0,0 +1,47 @@
+from datetime import datetime
+
+import pandas as pd
+
+import NFLMatchups
+from warehouse import Warehouse
+
+
+def _season(year, played):
+    """KC beat BUF home and away in `year`; scores are missing when not played"""
+    return pd.DataFrame({
+        'game_id': [f'{year}_01_BUF_KC', f'{year}_02_KC_BUF'],
+        'season': [year, year],
+        'week': [1, 2],
+        'gameday': pd.to_datetime([f'{year}-09-08', f'{year}-09-15']),
+        'away_team': ['BUF', 'KC'],
+        'home_team': ['KC', 'BUF'],
+        'away_score': pd.array([17, 31] if played else [None, None], dtype='Int16'),
+        'home_score': pd.array([27, 20] if played else [None, None], dtype='Int16'),
+    })
+
+
+def test_blend_before_week_one_keeps_current_season_records(tmp_path, monkeypatch):
+    current_year = datetime.now().year
+    schedules = {year: _season(year, played=year < current_year)
+                 for year in range(current_year - NFLMatchups.BLEND_SEASONS + 1, current_year + 1)}
+    loaded = []
+
+    def load_schedules(seasons, refresh=False):
+        loaded.append(list(seasons))
+        return pd.concat([schedules[season] for season in seasons], ignore_index=True)
+
+    monkeypatch.setattr(NFLMatchups, 'load_schedules', load_schedules)
+    monkeypatch.setattr(NFLMatchups, 'RANKING_STATE_FILE', str(tmp_path / 'state.json'))
+    monkeypatch.setattr(NFLMatchups, 'ELO_STATE_FILE', str(tmp_path / 'elo.json'))
+    monkeypatch.setattr(NFLMatchups, 'SRS_STATE_FILE', str(tmp_path / 'srs.json'))
+    monkeypatch.setattr(NFLMatchups, 'WAREHOUSE', Warehouse(str(tmp_path / 'warehouse.sqlite')))
+
+    rankings = NFLMatchups.calculate_power_rankings(full_rebuild=True, blend=True)
+
+    # No fallback to last season's schedule alone
+    assert loaded == [list(schedules)]
+    rankings = rankings.set_index('team')
+    assert sorted(rankings.index) == ['BUF', 'KC']
+    assert (rankings[['games_played', 'wins', 'losses']] == 0).all().all()
+    # Power comes from the earlier seasons
+    assert rankings.loc['KC', 'power_score'] > rankings.loc['BUF', 'power_score']
@@ -0,0 +1,101 @@
+import pandas as pd
+
+import NBAMatchups
+from ranking_state import RankingState
+
+
+def _lines(rows):
+    return pd.DataFrame([
+        {'team': team, 'game_id': game_id, 'game_date': date, 'games': 1, 'wins': int(won),
+         'losses': int(not won), 'points_for': 100, 'points_against': 95 if won else 105,
+         'plus_minus': 5 if won else -5}
+        for game_id, date, team, won in rows
+    ])
+
+
+def test_folded_matches_what_fold_skips():
+    state = RankingState('2025-26')
+    state.fold(_lines([('g1', '2026-01-10', 'BOS', True), ('g1', '2026-01-10', 'NYK', False),
+                       ('g2', '2026-01-11', 'BOS', False), ('g2', '2026-01-11', 'MIA', True)]))
+
+    games = pd.DataFrame({'game_id': ['g1', 'g2', 'g3', 'g4'],
+                          'game_date': ['2026-01-10', '2026-01-11', '2026-01-11', '2026-01-12']})
+    assert state.folded(games).tolist() == [True, True, False, False]
+    assert not RankingState('2025-26').folded(games).any()
+
+    # Re-folding the same lines adds nothing
+    assert state.fold(_lines([('g2', '2026-01-11', 'BOS', False), ('g2', '2026-01-11', 'MIA', True)])) == 0
+
+
+def test_simulation_skips_games_the_stale_schedule_lists_as_unplayed(tmp_path, monkeypatch):
+    season = NBAMatchups.get_current_season()
+    state = RankingState(season)
+    state.fold(_lines([('0022500001', '2026-01-10', 'BOS', True), ('0022500001', '2026-01-10', 'NYK', False)]))
+    state_file = str(tmp_path / 'state.json')
+    state.save(state_file)
+
+    # Cached before game 1 finished: both games still scheduled
+    schedule = pd.DataFrame({
+        'game_id': ['0022500001', '0022500002'],
+        'game_date': pd.to_datetime(['2026-01-10', '2026-01-12']),
+        'away_team': ['NYK', 'MIA'],
+        'home_team': ['BOS', 'BOS'],
+        'status_code': [NBAMatchups.GAME_STATUS_SCHEDULED] * 2,
+    })
+    simulated = {}
+
+    def simulate_season(teams, current_wins, remaining, *args, **kwargs):
+        simulated['game_ids'] = remaining['game_id'].tolist()
+        return pd.DataFrame(), pd.DataFrame()
+
+    monkeypatch.setattr(NBAMatchups, 'RANKING_STATE_FILE', state_file)
+    monkeypatch.setattr(NBAMatchups, 'get_season_schedule', lambda season=None: schedule)
+    monkeypatch.setattr(NBAMatchups, 'simulate_season', simulate_season)
+
+    rankings = pd.DataFrame({'team': ['BOS', 'NYK'], 'wins': [1, 0], 'power_score': [60.0, 50.0]})
+    NBAMatchups.simulate_remaining_season(rankings, n_sims=10, max_workers=1)
+    assert simulated['game_ids'] == ['0022500002']
+
+
+SEASON_ROWS = [
+    ('g1', '2026-01-10', 'BOS', True), ('g1', '2026-01-10', 'NYK', False),
+    ('g2', '2026-01-10', 'MIA', True), ('g2', '2026-01-10', 'ATL', False),
+    ('g3', '2026-01-11', 'BOS', False), ('g3', '2026-01-11', 'MIA', True),
+    ('g4', '2026-01-12', 'NYK', True), ('g4', '2026-01-12', 'ATL', False),
+    ('g5', '2026-01-12', 'BOS', True), ('g5', '2026-01-12', 'MIA', False),
+]
+
+
+def test_folding_day_by_day_matches_folding_at_once(tmp_path):
+    at_once = RankingState('2025-26')
+    assert at_once.fold(_lines(SEASON_ROWS)) == 5
+
+    # One run per day, each starting from the state the previous run saved;
+    # every run sees the whole season so far, as the scripts do
+    state_file = str(tmp_path / 'state.json')
+    new_games = 0
+    for date in ['2026-01-10', '2026-01-11', '2026-01-12']:
+        state = RankingState.load(state_file, '2025-26')
+        new_games += state.fold(_lines([row for row in SEASON_ROWS if row[1] <= date]))
+        state.save(state_file)
+
+    state = RankingState.load(state_file, '2025-26')
+    assert new_games == 5
+    assert (state.last_date, state.last_date_game_ids) == (at_once.last_date, at_once.last_date_game_ids)
+    pd.testing.assert_frame_equal(state.totals().sort_index(), at_once.totals().sort_index())
+
+
+def test_watermark_date_folds_late_games_once():
+    state = RankingState('2025-26')
+    # g4 finished before the run, g5 only after it
+    assert state.fold(_lines(SEASON_ROWS[:8])) == 4
+    assert (state.last_date, state.last_date_game_ids) == ('2026-01-12', {'g4'})
+
+    # The next run sees the whole date: only g5 is new
+    assert state.fold(_lines(SEASON_ROWS)) == 1
+    assert state.last_date_game_ids == {'g4', 'g5'}
+    assert state.fold(_lines(SEASON_ROWS)) == 0
+
+    expected = RankingState('2025-26')
+    expected.fold(_lines(SEASON_ROWS))
+    pd.testing.assert_frame_equal(state.totals().sort_index(), expected.totals().sort_index())
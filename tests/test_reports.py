@@ -0,0 +1,40 @@
+import os
+import stat
+
+import pandas as pd
+import pytest
+
+import NBAMatchups
+import NFLMatchups
+from report_writer import atomic_write
+
+
+def _no_games():
+    return pd.DataFrame({
+        'is_today': pd.Series(dtype=bool),
+        'game_date': pd.Series(dtype='datetime64[ns]'),
+        'away_team': pd.Series(dtype=str),
+        'home_team': pd.Series(dtype=str),
+        'matchup_score': pd.Series(dtype=float),
+    })
+
+
+@pytest.mark.parametrize('module', [NBAMatchups, NFLMatchups])
+def test_report_describes_the_requested_window(module):
+    rankings = pd.DataFrame(columns=['rank', 'team', 'power_score', 'wins', 'losses', 'net_rating'])
+    markdown = module.render_markdown_report(_no_games(), rankings, days_ahead=3)
+
+    assert "**Coverage:** Next 3 days" in markdown
+    assert "UPCOMING GAMES (Next 3 Days)" in markdown
+    assert "No upcoming games found in the next 3 days." in markdown
+    assert "7 days" not in markdown.lower()
+
+
+def test_atomic_write_gives_reports_the_usual_file_mode(tmp_path):
+    path = tmp_path / 'NBA_Weekly_Report.md'
+    atomic_write(str(path), '# Report\n')
+
+    umask = os.umask(0)
+    os.umask(umask)
+    assert path.read_text() == '# Report\n'
+    assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~umask
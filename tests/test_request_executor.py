@@ -0,0 +1,111 @@
+import random
+
+import pytest
+
+import rate_limit
+import request_executor
+from rate_limit import TokenBucket
+from request_executor import CircuitOpen, RequestExecutor, UpstreamError
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping just moves the clock on"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, 'time', clock)
+    monkeypatch.setattr(request_executor, 'time', clock)
+    # Full jitter always picks the longest delay
+    monkeypatch.setattr(random, 'uniform', lambda low, high: high)
+    return clock
+
+
+def responses(*outcomes):
+    """A request callable returning or raising each outcome in turn"""
+    outcomes = list(outcomes)
+    calls = []
+
+    def request():
+        calls.append(len(calls))
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    request.calls = calls
+    return request
+
+
+def test_token_bucket_paces_calls(clock):
+    bucket = TokenBucket(rate=2)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_throttled_call_backs_off_and_slows_down(clock):
+    executor = RequestExecutor(rate=10, burst=10, base_delay=1.0)
+    request = responses(UpstreamError('throttled', status=429), 'ok')
+
+    assert executor.call(request) == 'ok'
+    assert len(request.calls) == 2
+    assert clock.sleeps == [1.0]
+    # Halved to 5 on the 429, then one additive step of 10% of the maximum
+    assert executor.limiter.rate == pytest.approx(6.0)
+
+
+def test_successes_creep_back_to_the_configured_rate(clock):
+    executor = RequestExecutor(rate=10, burst=10)
+    executor.limiter.set_rate(8)
+    for expected in [9, 10, 10]:
+        executor.call(responses('ok'))
+        assert executor.limiter.rate == pytest.approx(expected)
+
+
+def test_circuit_opens_after_repeated_failures_and_fails_fast(clock):
+    executor = RequestExecutor(rate=10, burst=10, max_attempts=5, failure_threshold=3, reset_after=60)
+    request = responses(*[UpstreamError('unavailable', status=503)] * 3)
+
+    with pytest.raises(UpstreamError):
+        executor.call(request)
+    assert len(request.calls) == 3
+    assert executor.circuit_open
+
+    untouched = responses('ok')
+    with pytest.raises(CircuitOpen):
+        executor.call(untouched)
+    assert untouched.calls == []
+
+
+def test_half_open_trial_closes_or_reopens_the_circuit(clock):
+    executor = RequestExecutor(rate=10, burst=10, max_attempts=1, failure_threshold=2, reset_after=60)
+    for _ in range(2):
+        with pytest.raises(UpstreamError):
+            executor.call(responses(UpstreamError('unavailable', status=503)))
+    assert executor.circuit_open
+
+    # A failed trial call reopens the circuit straight away
+    clock.now += 60
+    with pytest.raises(UpstreamError):
+        executor.call(responses(UpstreamError('unavailable', status=503)))
+    assert executor.circuit_open
+    with pytest.raises(CircuitOpen):
+        executor.call(responses('ok'))
+
+    # A successful one closes it
+    clock.now += 60
+    assert executor.call(responses('ok')) == 'ok'
+    assert not executor.circuit_open
+    assert executor.call(responses('ok')) == 'ok'
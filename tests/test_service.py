@@ -0,0 +1,103 @@
+import asyncio
+import importlib
+import json
+
+import pytest
+
+import benchmark
+from service import MatchupService, league_loader
+
+TIMEOUT = 30
+
+
+@pytest.fixture(scope='module')
+def fixture_dir(tmp_path_factory):
+    return benchmark.synthesize_fixtures(1, fixtures_dir=str(tmp_path_factory.mktemp('fixtures')))
+
+
+async def _get(address, path):
+    reader, writer = await asyncio.open_connection(*address)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: test\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, body = response.split(b'\r\n\r\n', 1)
+    return int(head.split()[1]), json.loads(body)
+
+
+async def _wait_for(condition):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), TIMEOUT)
+
+
+async def _exercise(service):
+    server = asyncio.create_task(service.serve('127.0.0.1', 0))
+    try:
+        await _wait_for(lambda: service.snapshot is not None)
+
+        status, health = await _get(service.address, '/health')
+        assert status == 200
+        assert health['status'] == 'ok'
+        assert health['last_run']['status'] == 'ok'
+        assert health['teams'] == len(service.snapshot.rankings) > 0
+
+        status, rankings = await _get(service.address, '/rankings')
+        assert status == 200
+        assert [team['rank'] for team in rankings['rankings']] == list(range(1, health['teams'] + 1))
+
+        # Background refreshes keep swapping in new snapshots
+        first = service.snapshot
+        await _wait_for(lambda: service.refreshes >= 2)
+        assert service.snapshot is not first
+
+        # A failed refresh keeps serving the previous snapshot
+        def fail():
+            raise RuntimeError("upstream down")
+        service.loader = fail
+        await _wait_for(lambda: service.refresh_errors >= 1)
+        status, health = await _get(service.address, '/health')
+        assert health['last_error'] == "RuntimeError: upstream down"
+        status, rankings = await _get(service.address, '/rankings')
+        assert status == 200 and rankings['rankings']
+    finally:
+        server.cancel()
+        await asyncio.gather(server, return_exceptions=True)
+
+
+@pytest.mark.parametrize('league', ['nba', 'nfl'])
+def test_service_serves_fixture_data(league, fixture_dir, tmp_path):
+    # The fixtures hold whole-season responses only, so every refresh rebuilds
+    module = importlib.import_module(benchmark.SCRIPTS[league])
+    with benchmark.replay(module, fixture_dir, league, str(tmp_path)):
+        service = MatchupService(league.upper(), league_loader(module, full_rebuild=True), refresh_seconds=0.05,
+                                 metrics=module.RUN_METRICS)
+        asyncio.run(_exercise(service))
+
+
+class _HungUpWriter:
+    """Writer whose client reset the connection before the response went out"""
+
+    def __init__(self):
+        self.closed = False
+
+    def write(self, data):
+        pass
+
+    async def drain(self):
+        raise ConnectionResetError("connection reset by peer")
+
+    def close(self):
+        self.closed = True
+
+
+def test_client_hanging_up_is_not_an_error():
+    async def request():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"GET /health HTTP/1.1\r\nHost: test\r\n\r\n")
+        writer = _HungUpWriter()
+        await MatchupService('NBA', loader=None)._serve_client(reader, writer)
+        return writer
+
+    assert asyncio.run(request()).closed
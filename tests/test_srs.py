@@ -0,0 +1,56 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from srs import SRSRatings
+
+TRUE_RATINGS = {'BOS': 6.0, 'NYK': 2.0, 'MIA': -3.0, 'ATL': -5.0}
+TRUE_HOME_ADVANTAGE = 3.0
+
+
+def _games(noise=0.0, seed=0):
+    """Every team hosts every other team twice; margins follow the true ratings"""
+    rng = np.random.default_rng(seed)
+    pairs = list(itertools.permutations(TRUE_RATINGS, 2)) * 2
+    margins = np.array([TRUE_RATINGS[home] - TRUE_RATINGS[away] + TRUE_HOME_ADVANTAGE for home, away in pairs])
+    margins = margins + rng.normal(0, noise, len(pairs))
+    return pd.DataFrame({
+        'game_id': [f'g{i}' for i in range(len(pairs))],
+        'game_date': [f'2026-01-{i // 4 + 1:02d}' for i in range(len(pairs))],
+        'home_team': [home for home, _ in pairs],
+        'away_team': [away for _, away in pairs],
+        'home_score': 100 + margins,
+        'away_score': 100.0,
+    })
+
+
+def test_solve_recovers_ratings_and_home_advantage():
+    srs = SRSRatings('2025-26')
+    assert srs.update(_games()) == 24
+    srs.solve()
+
+    ratings = srs.to_series()
+    for team, rating in TRUE_RATINGS.items():
+        assert abs(ratings[team] - rating) < 1e-4
+    assert abs(srs.home_advantage - TRUE_HOME_ADVANTAGE) < 1e-4
+
+
+def test_warm_start_matches_cold_solve(tmp_path):
+    games = _games(noise=4.0)
+
+    cold = SRSRatings('2025-26')
+    cold.update(games)
+    cold.solve()
+
+    # Solve the first half, save, then re-solve from there with the rest
+    warm = SRSRatings('2025-26')
+    warm.update(games.iloc[:12])
+    warm.solve()
+    warm.save(str(tmp_path / 'srs.json'))
+    warm = SRSRatings.load(str(tmp_path / 'srs.json'), '2025-26')
+    assert warm.update(games) == 12
+    warm.solve()
+
+    pd.testing.assert_series_equal(warm.to_series().sort_index(), cold.to_series().sort_index(), atol=1e-5)
+    assert abs(warm.home_advantage - cold.home_advantage) < 1e-5
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from warehouse import Warehouse
+
+
+def _run(home_score, power):
+    """What one run stores: a game, its team-game lines and a ranking snapshot"""
+    games = pd.DataFrame({
+        'game_id': ['0022500001'], 'game_date': pd.to_datetime(['2026-01-10']),
+        'away_team': ['NYK'], 'home_team': ['BOS'], 'game_status': ['Final'],
+        'away_score': [100.0], 'home_score': [home_score], 'matchup_score': [70.0], 'tier': ['Good'],
+    })
+    lines = pd.DataFrame({
+        'game_id': ['0022500001'] * 2, 'team': ['BOS', 'NYK'], 'game_date': ['2026-01-10'] * 2,
+        'wins': [1, 0], 'losses': [0, 1], 'points_for': [home_score, 100.0],
+        'points_against': [100.0, home_score], 'plus_minus': [home_score - 100, 100 - home_score],
+    })
+    rankings = pd.DataFrame({'team': ['BOS', 'NYK'], 'rank': [1, 2], 'wins': [1, 0], 'losses': [0, 1],
+                             'power_score': [power, 40.0], 'elo': [1510.0, 1490.0]})
+    return games, lines, rankings
+
+
+def _store(warehouse, run):
+    games, lines, rankings = run
+    warehouse.upsert_games('NBA', '2025-26', games)
+    warehouse.upsert_team_games('NBA', '2025-26', lines)
+    warehouse.upsert_rankings('NBA', '2025-26', '2026-01-10', rankings)
+
+
+def _counts(warehouse):
+    return {table: warehouse.query(f"SELECT COUNT(*) AS n FROM {table}")['n'][0]
+            for table in ['games', 'team_games', 'rankings']}
+
+
+def test_rerunning_the_same_games_updates_rows_in_place(tmp_path):
+    warehouse = Warehouse(str(tmp_path / 'warehouse.sqlite'))
+    _store(warehouse, _run(home_score=110.0, power=60.0))
+    assert _counts(warehouse) == {'games': 1, 'team_games': 2, 'rankings': 2}
+
+    # A stat correction: same game and snapshot, new values
+    _store(warehouse, _run(home_score=112.0, power=62.0))
+    assert _counts(warehouse) == {'games': 1, 'team_games': 2, 'rankings': 2}
+
+    assert warehouse.query("SELECT home_score FROM games")['home_score'].tolist() == [112.0]
+    assert warehouse.team_history('NBA', 'BOS')['plus_minus'].tolist() == [12.0]
+    assert warehouse.latest_rankings('NBA', '2025-26')['power_score'].tolist() == [62.0, 40.0]
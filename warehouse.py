@@ -0,0 +1,193 @@
+"""
+Local SQLite warehouse of everything the NBA and NFL runs fetch
+Games, team-game lines and ranking snapshots are upserted in bulk after
+each run, so ranking, head-to-head and history queries can be answered
+from disk in milliseconds without calling the upstream APIs again. Rows
+are keyed by league plus game ID (and team / snapshot date), so re-running
+over the same games updates them in place.
+"""
+
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+from datetime import datetime
+
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    league TEXT NOT NULL,
+    game_id TEXT NOT NULL,
+    season TEXT NOT NULL,
+    game_date TEXT NOT NULL,
+    away_team TEXT NOT NULL,
+    home_team TEXT NOT NULL,
+    game_status TEXT,
+    away_score REAL,
+    home_score REAL,
+    matchup_score REAL,
+    tier TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (league, game_id)
+);
+CREATE INDEX IF NOT EXISTS games_season_date ON games (league, season, game_date);
+CREATE INDEX IF NOT EXISTS games_home_date ON games (league, home_team, game_date);
+CREATE INDEX IF NOT EXISTS games_away_date ON games (league, away_team, game_date);
+
+CREATE TABLE IF NOT EXISTS team_games (
+    league TEXT NOT NULL,
+    game_id TEXT NOT NULL,
+    team TEXT NOT NULL,
+    season TEXT NOT NULL,
+    game_date TEXT NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    points_for REAL NOT NULL,
+    points_against REAL NOT NULL,
+    plus_minus REAL NOT NULL,
+    PRIMARY KEY (league, game_id, team)
+);
+CREATE INDEX IF NOT EXISTS team_games_team_date ON team_games (league, team, game_date);
+CREATE INDEX IF NOT EXISTS team_games_season_date ON team_games (league, season, game_date);
+
+CREATE TABLE IF NOT EXISTS rankings (
+    league TEXT NOT NULL,
+    season TEXT NOT NULL,
+    as_of TEXT NOT NULL,
+    team TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    wins INTEGER,
+    losses INTEGER,
+    power_score REAL,
+    elo REAL,
+    PRIMARY KEY (league, season, as_of, team)
+);
+CREATE INDEX IF NOT EXISTS rankings_team_date ON rankings (league, team, as_of);
+"""
+
+GAME_COLUMNS = ['game_id', 'season', 'game_date', 'away_team', 'home_team', 'game_status',
+                'away_score', 'home_score', 'matchup_score', 'tier']
+LINE_COLUMNS = ['game_id', 'team', 'season', 'game_date', 'wins', 'losses',
+                'points_for', 'points_against', 'plus_minus']
+RANKING_COLUMNS = ['season', 'as_of', 'team', 'rank', 'wins', 'losses', 'power_score', 'elo']
+
+
+def _dates(values):
+    return pd.to_datetime(values).dt.strftime('%Y-%m-%d')
+
+
+def _rows(df, columns):
+    """DataFrame columns as tuples for executemany, NaN -> NULL"""
+    df = df.reindex(columns=columns).astype(object)
+    return list(df.where(df.notna(), None).itertuples(index=False, name=None))
+
+
+class Warehouse:
+    """
+    One SQLite file shared by both leagues
+    A connection is opened per call, so leagues running in parallel
+    threads can write to the same file; SQLite serialises the writes
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._ready = False
+
+    @contextmanager
+    def connect(self):
+        """Connection with the schema in place; commits on success"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        ready = self._ready and os.path.exists(self.path)
+        with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+            if not ready:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.executescript(SCHEMA)
+                self._ready = True
+            with conn:
+                yield conn
+
+    def _upsert(self, table, key, league, rows, columns):
+        if not rows:
+            return 0
+        names = ['league'] + columns
+        updates = ', '.join(f"{name} = excluded.{name}" for name in names if name not in key)
+        sql = (f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+               f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET {updates}")
+        with self.connect() as conn:
+            conn.executemany(sql, [(league, *row) for row in rows])
+        return len(rows)
+
+    def upsert_games(self, league, season, games_df, date_col='game_date'):
+        """Store scheduled or played games (analyzed or not); returns rows written"""
+        if games_df.empty:
+            return 0
+        games = games_df.assign(season=str(season), game_date=_dates(games_df[date_col]),
+                                game_id=games_df['game_id'].astype(str))
+        games = games.drop_duplicates('game_id', keep='last')
+        now = datetime.now().isoformat(timespec='seconds')
+        rows = [(*row, now) for row in _rows(games, GAME_COLUMNS)]
+        return self._upsert('games', ['league', 'game_id'], league, rows, GAME_COLUMNS + ['updated_at'])
+
+    def upsert_team_games(self, league, season, lines):
+        """Store team-game lines as folded into RankingState"""
+        if lines.empty:
+            return 0
+        lines = lines.assign(season=str(season), game_date=_dates(lines['game_date']),
+                             game_id=lines['game_id'].astype(str))
+        return self._upsert('team_games', ['league', 'game_id', 'team'], league,
+                            _rows(lines, LINE_COLUMNS), LINE_COLUMNS)
+
+    def upsert_rankings(self, league, season, as_of, rankings_df):
+        """Store a ranking snapshot as of the last game folded in"""
+        if rankings_df.empty or as_of is None:
+            return 0
+        rankings = rankings_df.assign(season=str(season), as_of=str(as_of))
+        return self._upsert('rankings', ['league', 'season', 'as_of', 'team'], league,
+                            _rows(rankings, RANKING_COLUMNS), RANKING_COLUMNS)
+
+    def query(self, sql, params=()):
+        """Run a read query and return a DataFrame"""
+        with self.connect() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def latest_rankings(self, league, season=None):
+        """The most recent ranking snapshot (of `season`, if given)"""
+        return self.query(
+            "WITH latest AS ("
+            "  SELECT season, MAX(as_of) AS as_of FROM rankings "
+            "  WHERE league = ? AND (? IS NULL OR season = ?) "
+            "  GROUP BY season ORDER BY as_of DESC LIMIT 1) "
+            "SELECT r.* FROM rankings r JOIN latest USING (season, as_of) "
+            "WHERE r.league = ? ORDER BY r.rank",
+            (league, season and str(season), season and str(season), league),
+        )
+
+    def ranking_history(self, league, team, season=None):
+        """One row per snapshot for `team`, oldest first"""
+        return self.query(
+            "SELECT * FROM rankings WHERE league = ? AND team = ? AND (? IS NULL OR season = ?) "
+            "ORDER BY as_of",
+            (league, team, season and str(season), season and str(season)),
+        )
+
+    def team_history(self, league, team, season=None):
+        """`team`'s game lines, oldest first"""
+        return self.query(
+            "SELECT * FROM team_games WHERE league = ? AND team = ? AND (? IS NULL OR season = ?) "
+            "ORDER BY game_date, game_id",
+            (league, team, season and str(season), season and str(season)),
+        )
+
+    def head_to_head(self, league, team_a, team_b, season=None):
+        """Every played game between two teams, from team_a's side"""
+        return self.query(
+            "SELECT a.season, a.game_date, a.game_id, a.team, a.points_for, "
+            "       b.team AS opponent, b.points_for AS opponent_points, a.wins "
+            "FROM team_games a JOIN team_games b "
+            "  ON b.league = a.league AND b.game_id = a.game_id AND b.team = ? "
+            "WHERE a.league = ? AND a.team = ? AND (? IS NULL OR a.season = ?) "
+            "ORDER BY a.game_date",
+            (team_b, league, team_a, season and str(season), season and str(season)),
+        )